@@ -1,8 +1,13 @@
+from typing import Optional
 from decimal import Decimal
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.expression import func
-from app.core.database import get_db
+from app.core.database import get_db, pool_stats
+from app.core.async_database import async_pool_stats
+from app.core.cache import response_cache
+from app.core.logging_config import get_logger
+from app.core.tracing import recent_runs, span, trace_run
 from app.models.models import (
     Spot,
     Deporte,
@@ -13,10 +18,13 @@ from app.models.models import (
 )
 import random
 from app.services.WeatherLogic import insert_forecast_for_spot
-from app.services.SportsWeighting import ponderar_todos_los_deportes
+from app.services.SportsWeighting import ponderar_pares, ponderar_deporte, ponderar_todos_los_deportes
+from app.services.WeatherSummary import refrescar_resumen
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+log = get_logger(__name__)
+
 # ------------------------------------------------------------
 # 🔹 Alta y baja de Spots
 # ------------------------------------------------------------
@@ -27,17 +35,21 @@ def _run_spot_ingestion(spot_id: int):
     try:
         spot = session.query(Spot).filter(Spot.id == spot_id).one_or_none()
         if not spot:
-            print(f"[SPOT INGESTION] Spot {spot_id} no encontrado")
+            log.warning("[SPOT INGESTION] Spot no encontrado", extra={"spot_id": spot_id})
             return
 
-        count = insert_forecast_for_spot(session, spot)
-        session.commit()
-        print(f"[SPOT INGESTION] Spot {spot_id} → {count} registros meteorológicos.")
+        with trace_run("ingesta_spot", spot_id=spot_id):
+            dirty = set()
+            count = insert_forecast_for_spot(session, spot, dirty, allow_stale=True)
+            with span("commit", spot_id=spot_id, rows=count):
+                session.commit()
+            log.info("[SPOT INGESTION] Spot ingestado", extra={"spot_id": spot_id, "registros": count})
 
-        ponderar_todos_los_deportes(session)
-    except Exception as exc:
+            ponderar_pares(session, dirty)
+            refrescar_resumen(session, dirty)
+    except Exception:
         session.rollback()
-        print(f"[SPOT INGESTION] Error procesando spot {spot_id}: {exc}")
+        log.exception("[SPOT INGESTION] Error procesando spot", extra={"spot_id": spot_id})
     finally:
         session.close()
 
@@ -89,12 +101,23 @@ def cambiar_estado_spot(spot_id: int, db: Session = Depends(get_db)):
 # ------------------------------------------------------------
 # 🔹 Alta y baja de Deportes
 # ------------------------------------------------------------
+def _run_sport_weighting(deporte_id: int):
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        ponderar_deporte(session, deporte_id)
+    finally:
+        session.close()
+
+
 def generar_codigo(prefix, id_num):
     return f"{prefix}{str(id_num).zfill(4)}"
 
 @router.post("/deportes")
 def crear_deporte(
     nombre: str,
+    background_tasks: BackgroundTasks,
     descripcion: str = None,
     variables: list[dict] = None,
     db: Session = Depends(get_db)
@@ -159,6 +182,9 @@ def crear_deporte(
 
     db.commit()
 
+    # Sólo se pondera el deporte nuevo; el resto de las ponderaciones no cambia
+    background_tasks.add_task(_run_sport_weighting, nuevo_deporte.id)
+
     return {"mensaje": "Deporte creado correctamente", "deporte": nuevo_deporte}
 
 @router.get("/deportes")
@@ -175,6 +201,24 @@ def cambiar_estado_deporte(deporte_id: int, db: Session = Depends(get_db)):
     db.commit()
     return {"mensaje": f"Deporte {'activado' if deporte.activo else 'desactivado'} correctamente"}
 
+# ------------------------------------------------------------
+# 🔹 Recalculo completo de ponderaciones
+# ------------------------------------------------------------
+def _run_full_weighting():
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        ponderar_todos_los_deportes(session)
+    finally:
+        session.close()
+
+
+@router.post("/ponderaciones/recalcular")
+def recalcular_ponderaciones(background_tasks: BackgroundTasks):
+    background_tasks.add_task(_run_full_weighting)
+    return {"mensaje": "Recalculo completo de ponderaciones iniciado"}
+
 # ------------------------------------------------------------
 # 🔹 Negocios pendientes / aprobación
 # ------------------------------------------------------------
@@ -248,6 +292,31 @@ def estadisticas(db: Session = Depends(get_db)):
         "usuarios_registrados": usuarios
     }
 
+# ------------------------------------------------------------
+# 🔹 Caché de respuestas (hits/misses)
+# ------------------------------------------------------------
+@router.get("/cache")
+def estado_cache():
+    return response_cache.stats()
+
+# ------------------------------------------------------------
+# 🔹 Pool de conexiones a la base (en uso, overflow, esperas, timeouts)
+# ------------------------------------------------------------
+@router.get("/db/pool")
+def estado_pool():
+    return {"sync": pool_stats(), "async": async_pool_stats()}
+
+# ------------------------------------------------------------
+# 🔹 Trazas de ingesta / ponderación (tiempo por etapa de las últimas corridas)
+# ------------------------------------------------------------
+@router.get("/ingestion/traces")
+def trazas_ingesta(
+    limit: int = Query(10, ge=1, le=100),
+    name: Optional[str] = Query(None, description="ingesta, ingesta_spot, ponderacion, ponderacion_global..."),
+    spans: bool = Query(False, description="Incluir el detalle de cada span"),
+):
+    return recent_runs(limit=limit, name=name, include_spans=spans)
+
 # ------------------------------------------------------------
 # 🔹 Spots activos (lista completa)
 # ------------------------------------------------------------
@@ -1,6 +1,6 @@
 from decimal import Decimal
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.core.database import get_db
 from app.models.models import Usuario, Negocio, EstadoNegocio, Deporte, NegocioDeporte
 from datetime import datetime
@@ -222,7 +222,12 @@ def deactivate_business(user: Usuario = Depends(get_current_user), db: Session =
 # ------------------------------------------------------
 @router.get("/all_business_with_sports")
 def get_all_business_with_sports(db: Session = Depends(get_db)):
-    negocios = db.query(Negocio).all()
+    # Deportes precargados (2 consultas extra en total, no 2 por negocio)
+    negocios = (
+        db.query(Negocio)
+        .options(selectinload(Negocio.deportes_rel).selectinload(NegocioDeporte.deporte))
+        .all()
+    )
     result = []
 
     for n in negocios:
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.cache import cached_route
 from app.models.models import Deporte
 
 router = APIRouter(prefix="/deporte", tags=["Deporte"])
 
 @router.get("/list")
+@cached_route("deporte/list")
 def get_deportes(db: Session = Depends(get_db)):
     deportes = db.query(Deporte).filter(Deporte.activo == True).all()
     return [
@@ -0,0 +1,70 @@
+# app/api/health_routes.py
+# ------------------------------------------------------------
+# Salud del servicio y métricas
+# - /health: liveness (el proceso responde; no toca la BD)
+# - /ready:  readiness (la BD primaria responde y hay datos para servir;
+#            incluye el estado de la ingesta inicial, ver StartupWarmup)
+# - /metrics: métricas en formato Prometheus
+# ------------------------------------------------------------
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+
+from app.core.cache import response_cache
+from app.core.config import READY_REQUIRES_WARMUP
+from app.core.database import SessionLocal, pool_stats
+from app.core.logging_config import get_logger, log_stats
+from app.core.metrics import http_metrics
+from app.services.StartupWarmup import has_forecast_data, warmup_state
+
+router = APIRouter(tags=["Health"])
+log = get_logger(__name__)
+
+_hay_datos = False  # una vez que hay ponderaciones no vuelve a consultarse
+
+
+@router.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    global _hay_datos
+    warmup = warmup_state()
+    try:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+            _hay_datos = _hay_datos or has_forecast_data(db)
+    except Exception:
+        # Endpoint público: el detalle (host, usuario, driver) sólo va al log
+        log.exception("❌ /ready: la base no responde")
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": "unavailable", "warmup": warmup})
+
+    # Por defecto se sirve lo que ya hay en la BD mientras la ingesta inicial corre;
+    # con READY_REQUIRES_WARMUP=1 se espera a que termine (o a que haya datos si la hace otra instancia)
+    if READY_REQUIRES_WARMUP:
+        listo = warmup["status"] == "done" or (warmup["status"] in ("other_instance", "disabled") and _hay_datos)
+    else:
+        listo = _hay_datos or warmup["status"] in ("done", "disabled")
+
+    contenido = {"status": "ready" if listo else "warming_up", "database": "ok", "data": _hay_datos, "warmup": warmup}
+    return contenido if listo else JSONResponse(status_code=503, content=contenido)
+
+
+@router.get("/metrics")
+def metrics():
+    pools = pool_stats()
+    cache = response_cache.stats()
+    logs = log_stats()
+    extra = [
+        ("nautic_db_pool_checked_out", "Conexiones del pool en uso.",
+         [({"engine": nombre}, s["checked_out"]) for nombre, s in pools.items()]),
+        ("nautic_db_pool_timeouts", "Esperas por conexión que vencieron (acumulado).",
+         [({"engine": nombre}, s["timeouts"]) for nombre, s in pools.items()]),
+        ("nautic_response_cache_hits", "Hits de la caché de respuestas (acumulado).", [({}, cache["hits"])]),
+        ("nautic_response_cache_misses", "Misses de la caché de respuestas (acumulado).", [({}, cache["misses"])]),
+        ("nautic_log_queue_size", "Eventos de log pendientes de escribir.", [({}, logs["queued"])]),
+        ("nautic_log_dropped", "Eventos de log descartados por cola llena (acumulado).", [({}, logs["dropped"])]),
+    ]
+    return PlainTextResponse(http_metrics.render(extra), media_type="text/plain; version=0.0.4")
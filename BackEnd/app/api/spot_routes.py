@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Query
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
 from random import choice, randint
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.dependencies import get_db
+from app.core.database import get_db
+from app.core.async_database import get_async_db
+from app.core.cache import cached_route
+from app.core.logging_config import get_logger
+from app.services.SpatialIndex import spot_index
+from app.services.MapLayers import MapLayer, get_layer
+from app.services.ForecastBatch import build_forecast_matrix
+from app.services.WeatherSummary import VARIABLES as SUMMARY_VARIABLES
+from app.core.config import FORECAST_BATCH_MAX_SPOTS, FORECAST_BATCH_MAX_DAYS
 from datetime import datetime, timedelta
 from app.models.models import (
-    VariableMeteorologica, 
-    TipoVariableMeteorologica, 
+    ResumenMeteorologicoDiario,
     Spot, 
     Deporte, 
     DeporteSpot, 
@@ -14,86 +24,166 @@ from app.models.models import (
     NegocioDeporte,
     EstadoNegocio
 )
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select
+
+try:
+    import msgpack  # codificación binaria opcional para /forecast_batch
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
 
 # Creamos el router específico para este grupo de endpoints
 router = APIRouter(prefix="/spot", tags=["Spots"])
 
-@router.get("/list")
-async def get_spots(day: int = Query(...), db: Session = Depends(get_db)):
-    """Devuelve todos los spots disponibles desde la base de datos"""
-    spots_db = db.query(Spot).filter(Spot.activo == True).all()
-    target_date = (datetime.utcnow() + timedelta(days=day)).date()  # corregido
-
-    spots = []
-    for spot in spots_db:
-        rows = (
-            db.query(Deporte.nombre, DeporteSpot.ponderacion)
-            .join(Deporte, Deporte.id == DeporteSpot.id_deporte)
-            .filter(
-                and_(
-                    DeporteSpot.id_spot == spot.id,
-                    DeporteSpot.fecha == target_date,
-                    Deporte.activo == True,
-                )
-            )
-            .order_by(Deporte.nombre.asc())
-            .all()
+log = get_logger(__name__)
+
+def _viewport(min_lat, min_lon, max_lat, max_lon):
+    """bbox (min_lat, min_lon, max_lat, max_lon) o None si no se pidió ninguno."""
+    bbox = (min_lat, min_lon, max_lat, max_lon)
+    if all(v is None for v in bbox):
+        return None
+    if any(v is None for v in bbox):
+        raise HTTPException(status_code=400, detail="El bbox requiere min_lat, min_lon, max_lat y max_lon")
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat no puede ser mayor que max_lat")
+    return bbox
+
+
+async def _spot_features(db: AsyncSession, target_date, sport: Optional[str], min_score: Optional[float]):
+    # Mejor deporte por spot: ROW_NUMBER() por spot ordenando por puntaje (empate → nombre)
+    score = func.coalesce(DeporteSpot.ponderacion, 0)
+    ranked = (
+        select(
+            DeporteSpot.id_spot.label("id_spot"),
+            Deporte.nombre.label("sport"),
+            score.label("score"),
+            func.row_number()
+            .over(partition_by=DeporteSpot.id_spot, order_by=(score.desc(), Deporte.nombre.asc()))
+            .label("rn"),
         )
+        .join(Deporte, Deporte.id == DeporteSpot.id_deporte)
+        .where(DeporteSpot.fecha == target_date, Deporte.activo == True)
+        .subquery()
+    )
 
-        scores = [{"sport": n, "score": float(p or 0)} for (n, p) in rows]
-        best = None
-        if scores:
-            best_item = max(scores, key=lambda x: x["score"])
-            best = best_item["sport"]
-
-        spots.append({
-            "name": spot.nombre,
-            "lat": float(spot.lat),
-            "lon": float(spot.lon),
+    q = (
+        select(Spot.id, Spot.nombre, Spot.lat, Spot.lon, ranked.c.sport, ranked.c.score)
+        .outerjoin(ranked, and_(ranked.c.id_spot == Spot.id, ranked.c.rn == 1))
+        .where(Spot.activo == True)
+    )
+    if sport:
+        q = q.where(func.lower(ranked.c.sport) == sport.lower())
+    if min_score is not None:
+        q = q.where(ranked.c.score >= min_score)
+    rows = (await db.execute(q.order_by(Spot.id))).all()
+
+    return [
+        {
+            "id": id_spot,
+            "name": nombre,
+            "lat": float(lat),
+            "lon": float(lon),
             "type": "spot",
-            "best_sport": best
-        })
+            "best_sport": best,
+            "best_score": float(best_score) if best_score is not None else None,
+        }
+        for id_spot, nombre, lat, lon, best, best_score in rows
+    ]
 
-    return spots
 
-@router.get("/business_list")
-async def get_business_spots(db: Session = Depends(get_db)):
-    """Devuelve todos los negocios activos con sus coordenadas y deportes asociados"""
-    negocios = (
-        db.query(Negocio)
-        .filter(Negocio.estado == EstadoNegocio.activo)
-        .all()
+@router.get("/list")
+@cached_route("spot/list")
+async def get_spots(
+    day: int = Query(...),
+    sport: Optional[str] = Query(None),
+    min_score: Optional[float] = Query(None),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Devuelve todos los spots activos con su mejor deporte para 'hoy + day', en una sola consulta.
+    Filtros opcionales: sport (sólo spots cuyo mejor deporte es ese) y min_score (puntaje mínimo del mejor deporte).
+    Con bbox (min_lat, min_lon, max_lat, max_lon) sólo devuelve los spots visibles; con zoom
+    menor a CLUSTER_MAX_ZOOM los agrupa en clusters {type: "cluster", count, best_score, ...}.
+    """
+    target_date = (datetime.utcnow() + timedelta(days=day)).date()  # corregido
+    bbox = _viewport(min_lat, min_lon, max_lat, max_lon)
+    if bbox is None and zoom is None:
+        return await _spot_features(db, target_date, sport, min_score)
+
+    async def build():
+        return MapLayer(await _spot_features(db, target_date, sport, min_score), score_key="best_score")
+
+    layer = await get_layer(
+        "spot/list",
+        {"day": day, "sport": sport.lower() if sport else None, "min_score": min_score},
+        build,
+        session=db,
     )
+    return layer.view(bbox, zoom)
+
+
+async def _business_features(db: AsyncSession):
+    negocios = (await db.execute(
+        select(Negocio)
+        .where(Negocio.estado == EstadoNegocio.activo)
+        .order_by(Negocio.id_negocio)
+    )).scalars().all()
+
+    # Deportes de todos los negocios activos en una sola consulta
+    deportes_por_negocio = {}
+    rows = (await db.execute(
+        select(NegocioDeporte.id_negocio, Deporte.nombre)
+        .join(Deporte, NegocioDeporte.id_deporte == Deporte.id)
+        .join(Negocio, Negocio.id_negocio == NegocioDeporte.id_negocio)
+        .where(Negocio.estado == EstadoNegocio.activo)
+        .order_by(Deporte.nombre.asc())
+    )).all()
+    for id_negocio, nombre in rows:
+        deportes_por_negocio.setdefault(id_negocio, []).append(nombre)
+
+    return [
+        {
+            "id_negocio": negocio.id_negocio,
+            "name": negocio.nombre_fantasia,
+            "lat": float(negocio.lat) if negocio.lat is not None else None,
+            "lon": float(negocio.lon) if negocio.lon is not None else None,
+            "type": "business",
+            "nombre_fantasia": negocio.nombre_fantasia,
+            "deportes": deportes_por_negocio.get(negocio.id_negocio, []),
+        }
+        for negocio in negocios
+    ]
 
-    business_list = []
-    for negocio in negocios:
-        lat = float(negocio.lat) if negocio.lat is not None else None
-        lon = float(negocio.lon) if negocio.lon is not None else None
-
-        deportes_records = (
-            db.query(Deporte)
-            .join(NegocioDeporte, NegocioDeporte.id_deporte == Deporte.id)
-            .filter(NegocioDeporte.id_negocio == negocio.id_negocio)
-            .order_by(Deporte.nombre.asc())
-            .all()
-        )
-        deportes = [deporte.nombre for deporte in deportes_records]
-        print("Deportes para negocio", negocio.nombre_fantasia, ":", deportes)
-
-        business_list.append(
-            {
-                "id_negocio": negocio.id_negocio,
-                "name": negocio.nombre_fantasia,
-                "lat": lat,
-                "lon": lon,
-                "type": "business",
-                "nombre_fantasia": negocio.nombre_fantasia,
-                "deportes": deportes,
-            }
-        )
 
-    return business_list
+@router.get("/business_list")
+@cached_route("spot/business_list")
+async def get_business_spots(
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Devuelve todos los negocios activos con sus coordenadas y deportes asociados.
+    Acepta el mismo viewport (bbox + zoom) que /spot/list.
+    """
+    bbox = _viewport(min_lat, min_lon, max_lat, max_lon)
+    if bbox is None and zoom is None:
+        return await _business_features(db)
+
+    async def build():
+        return MapLayer(await _business_features(db))
+
+    layer = await get_layer("spot/business_list", {}, build, session=db)
+    return layer.view(bbox, zoom)
 
 
 # ------------------------------------------------------------
@@ -122,63 +212,31 @@ def get_businesses_info(db: Session = Depends(get_db)):
     return business_list
 
 @router.get("/weather_average")
+@cached_route("spot/weather_average")
 async def get_weather_average(
     lat: float = Query(...),
     lon: float = Query(...),
     day: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Devuelve condiciones meteorológicas promedio en el popup (desde la BD)."""
 
     # 1) Fecha objetivo (día 0 = hoy, en UTC)
     target_date = (datetime.utcnow() + timedelta(days=day)).date()
 
-    # 2) Resolver el spot por coincidencia EXACTA de coordenadas ("lon,lat")
-    spot = (
-        db.query(Spot)
-        .filter(Spot.activo == True, Spot.lat == lat, Spot.lon == lon)
-        .one_or_none()
-    )
+    # 2) Resolver el spot más cercano dentro de la tolerancia (índice en memoria)
+    spot = await spot_index.nearest_async(lat, lon)
     if not spot:
         return {}
 
-    # 3) Variables necesarias para este endpoint
-    needed = [
-        "minTemperature",
-        "maxTemperature",
-        "wind_speed",
-        "precipitation_qpfCuantity",
-        "waveHeight",
-    ]
-
-    # 4) Traer valores del día para esas variables (tomamos el último por variable)
-    q = (
-        db.query(VariableMeteorologica.valor, TipoVariableMeteorologica.nombre)
-        .join(
-            TipoVariableMeteorologica,
-            VariableMeteorologica.id_tipo_variable == TipoVariableMeteorologica.id,
-        )
-        .filter(
-            VariableMeteorologica.id_spot == spot.id,
-            VariableMeteorologica.fecha == target_date,
-            TipoVariableMeteorologica.nombre.in_(needed),
-        )
-        .order_by(
-            VariableMeteorologica.ultima_actualizacion.desc(),
-            VariableMeteorologica.id.desc(),
-        )
-    )
-    rows = q.all()
-
-    latest = {}
-    for valor, nombre in rows:
-        if nombre in latest:
-            continue  # ya tomamos la más reciente por el ORDER BY
-        latest[nombre] = valor
+    # 3) Una sola lectura por clave primaria del resumen diario (ver WeatherSummary)
+    resumen = await db.get(ResumenMeteorologicoDiario, (spot["id"], target_date))
+    if not resumen:
+        return {}
 
-    # 5) Calcular promedios y formatear la respuesta
-    tmin = float(latest.get("minTemperature"))
-    tmax = float(latest.get("maxTemperature"))
+    # 4) Calcular promedios y formatear la respuesta
+    tmin = resumen.minTemperature or 0.0
+    tmax = resumen.maxTemperature or 0.0
     # si falta uno de los dos, usamos el que esté
     if tmin == 0.0 and tmax == 0.0:
         temperature = 0
@@ -189,9 +247,9 @@ async def get_weather_average(
     else:
         temperature = round((tmin + tmax) / 2)
 
-    wind_speed = round(float(latest.get("wind_speed")))
-    precipitation = round(float(latest.get("precipitation_qpfCuantity")))
-    wave_height = round(float(latest.get("waveHeight")))
+    wind_speed = round(resumen.wind_speed or 0.0)
+    precipitation = round(resumen.precipitation_qpfCuantity or 0.0)
+    wave_height = round(resumen.waveHeight or 0.0)
 
     return {
         "temperature_2m": temperature,
@@ -201,15 +259,16 @@ async def get_weather_average(
     }
 
 @router.get("/sportspoints")
+@cached_route("spot/sportspoints")
 async def get_sportspoints(
     lat: float = Query(...),
     lon: float = Query(...),
     day: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Devuelve la ponderación de TODOS los deportes para el spot cuyas coordenadas
-    coinciden exactamente con (lon,lat) en la fecha 'hoy + day'.
+    Devuelve la ponderación de TODOS los deportes para el spot más cercano a
+    (lat, lon) dentro de SPOT_LOOKUP_TOLERANCE_M, en la fecha 'hoy + day'.
 
     Respuesta:
     [
@@ -221,37 +280,27 @@ async def get_sportspoints(
     # 1) Calcular fecha objetivo
     target_date = (datetime.utcnow() + timedelta(days=day)).date()
 
-    print("Fecha objetivo:", target_date)
+    log.debug("Fecha objetivo", extra={"fecha": str(target_date)})
 
-    # 2) Buscar spot exacto por coordenadas (ahora usando Numeric → convertir a Decimal)
-    from decimal import Decimal
-    spot = (
-        db.query(Spot)
-        .filter(
-            Spot.activo == True,
-            Spot.lat == Decimal(str(lat)),
-            Spot.lon == Decimal(str(lon)),
-        )
-        .one_or_none()
-    )
+    # 2) Buscar el spot por coordenadas (índice en memoria, tolerante al redondeo)
+    spot = await spot_index.nearest_async(lat, lon)
 
     if not spot:
         return []  # si no existe el spot, devolver lista vacía
 
     # 3) Obtener las ponderaciones de ese spot en esa fecha
-    rows = (
-        db.query(Deporte.nombre, DeporteSpot.ponderacion)
+    rows = (await db.execute(
+        select(Deporte.nombre, DeporteSpot.ponderacion)
         .join(Deporte, Deporte.id == DeporteSpot.id_deporte)
-        .filter(
+        .where(
             and_(
-                DeporteSpot.id_spot == spot.id,
+                DeporteSpot.id_spot == spot["id"],
                 DeporteSpot.fecha == target_date,
                 Deporte.activo == True,
             )
         )
         .order_by(Deporte.nombre.asc())
-        .all()
-    )
+    )).all()
 
     # 4) Formatear lista de scores
     scores = [{"sport": n, "score": float(p or 0)} for (n, p) in rows]
@@ -260,53 +309,73 @@ async def get_sportspoints(
 
 
 @router.get("/general_weather")
+@cached_route("spot/general_weather")
 async def get_general_weather(
     lat: float = Query(...),
     lon: float = Query(...),
     day: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Devuelve {nombreVariable: valor} para el spot cuyas coordenadas coinciden exactamente
-    con las recibidas (formato 'lon,lat') en la fecha 'hoy + day'.
+    Devuelve {nombreVariable: valor} para el spot más cercano a las coordenadas
+    recibidas (dentro de SPOT_LOOKUP_TOLERANCE_M) en la fecha 'hoy + day'.
     """
     # 1) Fecha objetivo (día 0 = hoy, en UTC)
     target_date = (datetime.utcnow() + timedelta(days=day)).date()
 
-    # 2) Resolver el spot por coincidencia exacta de coordenadas
-    best_spot = (
-        db.query(Spot)
-        .filter(Spot.activo == True, Spot.lat == lat, Spot.lon == lon)
-        .one_or_none()
-    )
+    # 2) Resolver el spot por coordenadas (índice en memoria, tolerante al redondeo)
+    best_spot = await spot_index.nearest_async(lat, lon)
 
     if not best_spot:
-        # No hay spot con esas coordenadas exactas
+        # No hay spot dentro de la tolerancia
         return {}
 
-    # 3) Traer variables del día para ese spot, uniendo el nombre de la variable
-    q = (
-        db.query(VariableMeteorologica, TipoVariableMeteorologica)
-        .join(TipoVariableMeteorologica, VariableMeteorologica.id_tipo_variable == TipoVariableMeteorologica.id)
-        .filter(
-            VariableMeteorologica.id_spot == best_spot.id,
-            VariableMeteorologica.fecha == target_date,
-        )
-        .order_by(
-            # Tomamos la más reciente por variable (si hay varias filas por día/proveedor)
-            VariableMeteorologica.ultima_actualizacion.desc(),
-            VariableMeteorologica.id.desc(),
-        )
-    )
-
-    rows = q.all()
+    # 3) Una sola lectura por clave primaria del resumen diario (ver WeatherSummary)
+    resumen = await db.get(ResumenMeteorologicoDiario, (best_spot["id"], target_date))
+    if not resumen:
+        return {}
 
-    # 4) Armar {nombreVariable: valor} tomando el último por variable
+    # 4) Armar {nombreVariable: valor} con las variables que tienen dato
     result = {}
-    for vm, tv in rows:
-        if tv.nombre in result:
-            continue
-        result[tv.nombre] = vm.valor  # 'valor' es TEXT en tu modelo
+    for nombre in SUMMARY_VARIABLES:
+        valor = getattr(resumen, nombre)
+        if valor is not None:
+            result[nombre] = valor
 
     return result
 
+
+@router.get("/forecast_batch")
+@cached_route("spot/forecast_batch")
+async def get_forecast_batch(
+    ids: List[int] = Query(...),
+    day_from: int = Query(0),
+    day_to: int = Query(4),
+    format: Optional[str] = Query(None, pattern="^(json|msgpack)$"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Puntajes por deporte y variables meteorológicas de varios spots (por id) para
+    los días 'hoy + day_from' .. 'hoy + day_to', en una sola matriz (ver ForecastBatch).
+    Formato: JSON por defecto; msgpack con ?format=msgpack o Accept: application/msgpack.
+    """
+    if day_to < day_from:
+        raise HTTPException(status_code=400, detail="day_to debe ser mayor o igual a day_from")
+    if day_to - day_from + 1 > FORECAST_BATCH_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Se permiten hasta {FORECAST_BATCH_MAX_DAYS} días por consulta")
+    if len(ids) > FORECAST_BATCH_MAX_SPOTS:
+        raise HTTPException(status_code=400, detail=f"Se permiten hasta {FORECAST_BATCH_MAX_SPOTS} spots por consulta")
+
+    hoy = datetime.utcnow().date()
+    fechas = [hoy + timedelta(days=d) for d in range(day_from, day_to + 1)]
+    # El armado de la matriz es código sync (Session.query): corre vía run_sync
+    matriz = await db.run_sync(build_forecast_matrix, ids, fechas)
+
+    usar_msgpack = format == "msgpack" or (format is None and accept and MSGPACK_MEDIA_TYPE in accept)
+    if not usar_msgpack:
+        return JSONResponse(matriz, headers={"Vary": "Accept"})
+    if msgpack is None:
+        raise HTTPException(status_code=406, detail="msgpack no está instalado en el servidor")
+    # float32 alcanza para puntajes y variables meteorológicas y achica el payload
+    return Response(content=msgpack.packb(matriz, use_bin_type=True, use_single_float=True), media_type=MSGPACK_MEDIA_TYPE, headers={"Vary": "Accept"})
@@ -2,13 +2,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.dependencies import get_db
+from app.core.database import get_db
 from app.core.database import Base
+from app.models.migrations.runner import drop_ledger
 from app.models.models import (
     Spot,
     Deporte,
     DeporteVariable,
     VariableMeteorologica,
+    ResumenMeteorologicoDiario,
     TipoVariableMeteorologica,
     DeporteSpot,
     ProveedorDatos,
@@ -165,10 +167,13 @@ def eliminar_spot(spot_id: int, db: Session = Depends(get_db)):
     if not spot:
         raise HTTPException(status_code=404, detail="Spot no encontrado")
 
-    # Eliminar variables meteorológicas asociadas al spot
+    # Eliminar variables meteorológicas asociadas al spot (y su resumen)
     db.query(VariableMeteorologica).filter(
         VariableMeteorologica.id_spot == spot_id
     ).delete(synchronize_session=False)
+    db.query(ResumenMeteorologicoDiario).filter(
+        ResumenMeteorologicoDiario.id_spot == spot_id
+    ).delete(synchronize_session=False)
 
     # Eliminar asociaciones de deportes con el spot
     db.query(DeporteSpot).filter(
@@ -200,6 +205,7 @@ def eliminar_negocio(negocio_id: int, db: Session = Depends(get_db)):
 @router.delete("/variables_meteorologicas")
 def eliminar_todas_variables_meteorologicas(db: Session = Depends(get_db)):
     eliminadas = db.query(VariableMeteorologica).delete(synchronize_session=False)
+    db.query(ResumenMeteorologicoDiario).delete(synchronize_session=False)
     db.commit()
     return {
         "mensaje": "Registros de 'variable_meteorologica' eliminados correctamente",
@@ -213,6 +219,7 @@ def eliminar_todas_variables_meteorologicas(db: Session = Depends(get_db)):
 @router.delete("/spots")
 def eliminar_todos_los_spots(db: Session = Depends(get_db)):
     db.query(VariableMeteorologica).delete(synchronize_session=False)
+    db.query(ResumenMeteorologicoDiario).delete(synchronize_session=False)
     db.query(DeporteSpot).delete(synchronize_session=False)
     eliminados = db.query(Spot).delete(synchronize_session=False)
     db.commit()
@@ -229,6 +236,8 @@ def eliminar_todos_los_spots(db: Session = Depends(get_db)):
 def drop_all_tables(db: Session = Depends(get_db)):
     try:
         Base.metadata.drop_all(bind=db.get_bind())
+        # Sin las tablas, el registro de migraciones ya no es cierto
+        drop_ledger(db.connection())
         db.commit()
     except SQLAlchemyError as exc:
         db.rollback()
@@ -0,0 +1,69 @@
+# app/core/async_database.py
+# ----------------------------------------------------------
+# Engine y sesiones async (SQLAlchemy asyncio + asyncpg) para los
+# handlers `async def`: las consultas no bloquean el event loop.
+# Convive con core/database.py (sync), que sigue usándose en ingesta,
+# ponderación, admin y handlers sync.
+# ----------------------------------------------------------
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import ASYNC_DATABASE_URL, ASYNC_DATABASE_REPLICA_URL, DATABASE_URL, DATABASE_REPLICA_URL
+from app.core.database import InstrumentedAsyncQueuePool, bind_request, engine_options, use_replica
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str):
+    """postgresql[+psycopg2]://... → postgresql+asyncpg://... (sslmode → ssl para asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return parsed
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    if backend in ("postgresql", "postgres") and "sslmode" in parsed.query:
+        query = dict(parsed.query)
+        query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(query=query)
+    return parsed
+
+
+_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(_url, **engine_options(_url, InstrumentedAsyncQueuePool))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Réplica de sólo lectura (opcional), mismo criterio de ruteo que get_db
+_replica_url = ASYNC_DATABASE_REPLICA_URL or (to_async_url(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None)
+async_replica_engine = (
+    create_async_engine(_replica_url, **engine_options(_replica_url, InstrumentedAsyncQueuePool, read_only=True))
+    if _replica_url else None
+)
+AsyncReplicaSessionLocal = (
+    async_sessionmaker(async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_replica_engine is not None else None
+)
+
+
+async def get_async_db(request: Request = None):
+    factory = (
+        AsyncReplicaSessionLocal
+        if AsyncReplicaSessionLocal is not None and use_replica(request)
+        else AsyncSessionLocal
+    )
+    async with factory() as db:
+        bind_request(db, request)
+        yield db
+
+
+def async_pool_stats() -> dict:
+    """Estado en vivo del pool del engine async (y de la réplica, si hay)."""
+    stats = {"primary": async_engine.pool.stats()}
+    if async_replica_engine is not None:
+        stats["replica"] = async_replica_engine.pool.stats()
+    return stats
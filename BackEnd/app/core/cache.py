@@ -0,0 +1,151 @@
+# app/core/cache.py
+# ----------------------------------------------------------
+# Caché en memoria de respuestas de endpoints de lectura
+# - Clave: (ruta, parámetros, día UTC actual, versión global de datos)
+# - La versión se incrementa cada vez que una sesión confirma escrituras
+#   (ingesta, ponderación, altas/bajas de admin), así que las entradas
+#   viejas dejan de usarse sin invalidación explícita
+# - La versión es compartida entre workers (tabla data_version, ver core/versioning.py)
+# - Si el request leyó de una réplica atrasada respecto de esa versión, la
+#   respuesta se devuelve pero no se guarda (quedaría con datos viejos bajo
+#   una clave nueva hasta la próxima escritura)
+# - Memoria acotada con desalojo LRU y contadores de hits/misses
+# ----------------------------------------------------------
+
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_ENTRIES
+from app.core.versioning import data_version, session_data_version
+
+
+# --------------------------
+# Caché LRU
+# --------------------------
+class ResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Retorna (encontrado, valor)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "data_version": data_version(),
+            }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+def _cache_key(name: str, kwargs: dict):
+    # Sólo parámetros simples (query params); la sesión de BD y similares quedan afuera
+    # (las listas de query params, p.ej. ?ids=1&ids=2, entran como tupla)
+    params = tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in kwargs.items()
+        if isinstance(v, _KEY_TYPES) or (isinstance(v, list) and all(isinstance(x, _KEY_TYPES) for x in v))
+    ))
+    # El día UTC entra en la clave porque los endpoints resuelven "hoy + day"
+    return name, params, datetime.utcnow().date(), data_version()
+
+
+def _request_session(kwargs: dict):
+    for valor in kwargs.values():
+        if isinstance(valor, (Session, AsyncSession)):
+            return valor
+    return None
+
+
+async def served_version(session) -> Optional[int]:
+    """Versión de datos que ve la sesión del request (None si no se puede saber)."""
+    if isinstance(session, AsyncSession):
+        return await session.run_sync(session_data_version)
+    if isinstance(session, Session):
+        return session_data_version(session)
+    return None
+
+
+def is_behind(vista: Optional[int], version: int) -> bool:
+    """True si los datos se leyeron de una réplica que todavía no llegó a `version`."""
+    return vista is not None and vista < version
+
+
+def cached_route(name: str):
+    """
+    Decorador para handlers de lectura. Se aplica debajo de @router.get(...):
+    FastAPI sigue viendo la firma original gracias a functools.wraps.
+    """
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not RESPONSE_CACHE_ENABLED:
+                    return await fn(*args, **kwargs)
+                key = _cache_key(name, kwargs)
+                found, value = response_cache.get(key)
+                if found:
+                    return value
+                # La versión se lee antes que los datos: la réplica sólo avanza
+                vista = await served_version(_request_session(kwargs))
+                value = await fn(*args, **kwargs)
+                if not is_behind(vista, key[-1]):
+                    response_cache.set(key, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            key = _cache_key(name, kwargs)
+            found, value = response_cache.get(key)
+            if found:
+                return value
+            session = _request_session(kwargs)
+            vista = session_data_version(session) if isinstance(session, Session) else None
+            value = fn(*args, **kwargs)
+            if not is_behind(vista, key[-1]):
+                response_cache.set(key, value)
+            return value
+        return sync_wrapper
+
+    return decorator
@@ -4,5 +4,110 @@ import os
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Driver async para los endpoints async (si no se define, se deriva de DATABASE_URL con asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# Réplica de sólo lectura para los GET (opcional; sin definir, todo va al primario)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL")
+# Tras escribir (POST/PUT/DELETE), los GET de ese mismo cliente van al primario durante esta ventana
+# (la hora de la escritura viaja en la cookie nautic_last_write / header X-Last-Write-At)
+REPLICA_STALENESS_SECONDS = float(os.getenv("REPLICA_STALENESS_SECONDS", "5"))
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 STORMGLASS_API_KEY = os.getenv("STORMGLASS_API_KEY")
+
+# Ingesta meteorológica
+INGESTION_MODE = os.getenv("INGESTION_MODE", "async")  # "async" | "sync"
+INGESTION_GOOGLE_CONCURRENCY = int(os.getenv("INGESTION_GOOGLE_CONCURRENCY", "8"))
+INGESTION_STORMGLASS_CONCURRENCY = int(os.getenv("INGESTION_STORMGLASS_CONCURRENCY", "4"))
+INGESTION_DEADLINE_SECONDS = float(os.getenv("INGESTION_DEADLINE_SECONDS", "600"))
+
+# Cliente HTTP de proveedores (Google / StormGlass)
+PROVIDER_CONNECT_TIMEOUT = float(os.getenv("PROVIDER_CONNECT_TIMEOUT", "3.05"))
+PROVIDER_READ_TIMEOUT = float(os.getenv("PROVIDER_READ_TIMEOUT", "20"))
+PROVIDER_MAX_RETRIES = int(os.getenv("PROVIDER_MAX_RETRIES", "3"))
+PROVIDER_BACKOFF_BASE = float(os.getenv("PROVIDER_BACKOFF_BASE", "0.5"))
+PROVIDER_BACKOFF_MAX = float(os.getenv("PROVIDER_BACKOFF_MAX", "30"))
+PROVIDER_POOL_MAXSIZE = int(os.getenv("PROVIDER_POOL_MAXSIZE", "16"))
+
+# Caché en disco de respuestas de proveedores
+PROVIDER_CACHE_ENABLED = os.getenv("PROVIDER_CACHE_ENABLED", "1") == "1"
+PROVIDER_CACHE_PATH = os.getenv("PROVIDER_CACHE_PATH", ".cache/provider_cache.sqlite3")
+PROVIDER_CACHE_PRECISION = int(os.getenv("PROVIDER_CACHE_PRECISION", "3"))  # decimales de lat/lon en la clave
+PROVIDER_CACHE_TTL_GOOGLE = float(os.getenv("PROVIDER_CACHE_TTL_GOOGLE", "3600"))
+PROVIDER_CACHE_TTL_STORMGLASS = float(os.getenv("PROVIDER_CACHE_TTL_STORMGLASS", "21600"))
+PROVIDER_CACHE_STALE_SECONDS = float(os.getenv("PROVIDER_CACHE_STALE_SECONDS", "86400"))
+PROVIDER_CACHE_MAX_ENTRIES = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "5000"))
+
+# Agrupación espacial de consultas a proveedores (tamaño de celda en grados; 0 = un fetch por spot)
+INGESTION_GRID_GOOGLE = float(os.getenv("INGESTION_GRID_GOOGLE", "0.01"))
+INGESTION_GRID_STORMGLASS = float(os.getenv("INGESTION_GRID_STORMGLASS", "0.05"))
+
+# Caché de respuestas de endpoints públicos
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+# La versión de datos que invalida las cachés vive en la tabla data_version (compartida entre
+# workers); cada proceso la relee cada tantos segundos. 0 = contador local del proceso
+# (sólo correcto con un único worker)
+RESPONSE_CACHE_VERSION_POLL_SECONDS = float(os.getenv("RESPONSE_CACHE_VERSION_POLL_SECONDS", "2"))
+
+# Índice espacial de spots (búsqueda por coordenadas)
+SPOT_LOOKUP_TOLERANCE_M = float(os.getenv("SPOT_LOOKUP_TOLERANCE_M", "50"))
+SPATIAL_INDEX_CELL_DEG = float(os.getenv("SPATIAL_INDEX_CELL_DEG", "0.05"))
+
+# Capas del mapa por viewport (bbox + zoom)
+CLUSTER_MAX_ZOOM = int(os.getenv("CLUSTER_MAX_ZOOM", "11"))  # desde este zoom se devuelven elementos sueltos
+CLUSTER_CELL_PX = int(os.getenv("CLUSTER_CELL_PX", "64"))  # tamaño aproximado de un cluster en pantalla
+MAP_LAYER_CACHE_MAX_ENTRIES = int(os.getenv("MAP_LAYER_CACHE_MAX_ENTRIES", "64"))
+
+# Endpoint de pronóstico en lote (spots × días)
+FORECAST_BATCH_MAX_SPOTS = int(os.getenv("FORECAST_BATCH_MAX_SPOTS", "200"))
+FORECAST_BATCH_MAX_DAYS = int(os.getenv("FORECAST_BATCH_MAX_DAYS", "16"))
+
+# Pool de conexiones a la base (engine sync y async)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # segundos esperando una conexión libre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # segundos; -1 = nunca reciclar
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 = sin límite
+
+# Instrumentación SQL por request (cantidad de consultas, tiempo en BD, N+1)
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "1") == "1"
+SQL_DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "0") == "1"  # X-DB-Query-Count / X-DB-Time-Ms (sólo dev/tests)
+SQL_WARN_QUERY_COUNT = int(os.getenv("SQL_WARN_QUERY_COUNT", "20"))
+SQL_WARN_DB_TIME_MS = float(os.getenv("SQL_WARN_DB_TIME_MS", "500"))
+SQL_WARN_REPEATED_SHAPE = int(os.getenv("SQL_WARN_REPEATED_SHAPE", "5"))  # misma consulta N veces → posible N+1
+
+# Métricas HTTP (formato Prometheus en /metrics)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_LATENCY_BUCKETS = [
+    float(b) for b in os.getenv("METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")
+]
+
+# Logging estructurado (ver core/logging_config.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")  # por módulo: "app.services.WeatherLogic=DEBUG,sqlalchemy.engine=WARNING"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" (clave=valor) o "json" (una línea JSON por evento)
+LOG_QUEUE_MAX_SIZE = int(os.getenv("LOG_QUEUE_MAX_SIZE", "10000"))  # si se llena, se descartan eventos
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))  # fracción emitida de los mensajes muestreados
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")  # por módulo: "app.services.WeatherLogic=0.5"
+
+# Trazas de corridas de ingesta / ponderación (ver core/tracing.py)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") == "1"
+TRACE_FILE = os.getenv("TRACE_FILE", ".cache/ingestion_traces.jsonl")  # una corrida por línea (JSON)
+TRACE_FILE_MAX_BYTES = int(os.getenv("TRACE_FILE_MAX_BYTES", str(5 * 1024 * 1024)))  # al superarlo rota a .1
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "20000"))  # por corrida; el resto sólo se cuenta
+
+# Profiling por request (ver core/profiling.py). Con 0 el middleware ni se instala.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "x-profile")  # header "X-Profile: 1"...
+PROFILING_QUERY_PARAM = os.getenv("PROFILING_QUERY_PARAM", "__profile")  # ...o query "?__profile=1"
+PROFILING_DIR = os.getenv("PROFILING_DIR", ".cache/profiles")
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))  # período de muestreo de stacks
+PROFILING_TOP_ALLOCATIONS = int(os.getenv("PROFILING_TOP_ALLOCATIONS", "30"))
+PROFILING_TRACEMALLOC_FRAMES = int(os.getenv("PROFILING_TRACEMALLOC_FRAMES", "10"))
+
+# Arranque: la API sirve los datos existentes de inmediato y la ingesta corre en segundo plano
+STARTUP_INGESTION = os.getenv("STARTUP_INGESTION", "background")  # "background" | "off"
+STARTUP_INGESTION_DELAY_SECONDS = float(os.getenv("STARTUP_INGESTION_DELAY_SECONDS", "0"))
+READY_REQUIRES_WARMUP = os.getenv("READY_REQUIRES_WARMUP", "0") == "1"  # 1 = /ready espera a la ingesta inicial
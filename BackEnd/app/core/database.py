@@ -1,14 +1,210 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import DATABASE_URL 
+import math
+import threading
+import time
+from typing import Optional
 
-engine = create_engine(DATABASE_URL)
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URL,
+    REPLICA_STALENESS_SECONDS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+
+# --------------------------
+# Pool instrumentado: cuánto se espera por una conexión y cuántas veces se agota
+# --------------------------
+class _PoolMetricsMixin:
+    def _metrics(self) -> dict:
+        if not hasattr(self, "_pool_metrics"):
+            self._pool_metrics = {"waits": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "timeouts": 0}
+            self._pool_metrics_lock = threading.Lock()
+        return self._pool_metrics
+
+    def _do_get(self):
+        metrics = self._metrics()
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._pool_metrics_lock:
+                metrics["timeouts"] += 1
+            raise
+        finally:
+            espera_ms = (time.perf_counter() - inicio) * 1000
+            with self._pool_metrics_lock:
+                metrics["waits"] += 1
+                metrics["wait_ms_total"] += espera_ms
+                metrics["wait_ms_max"] = max(metrics["wait_ms_max"], espera_ms)
+
+    def stats(self) -> dict:
+        metrics = dict(self._metrics())
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout_s": self._timeout,
+            "checkouts": metrics["waits"],
+            "wait_ms_avg": round(metrics["wait_ms_total"] / metrics["waits"], 3) if metrics["waits"] else 0.0,
+            "wait_ms_max": round(metrics["wait_ms_max"], 3),
+            "timeouts": metrics["timeouts"],
+        }
+
+
+class InstrumentedQueuePool(_PoolMetricsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url, poolclass, read_only: bool = False) -> dict:
+    """
+    Opciones de create_engine / create_async_engine tomadas de la config DB_*.
+    read_only=True abre las transacciones como READ ONLY (engine de réplica).
+    """
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    settings = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+    if read_only:
+        settings["default_transaction_read_only"] = "on"
+
+    drivername = make_url(url).drivername
+    if settings and drivername in ("postgresql", "postgres", "postgresql+psycopg2"):
+        options["connect_args"] = {"options": " ".join(f"-c {k}={v}" for k, v in settings.items())}
+    elif settings and drivername == "postgresql+asyncpg":
+        options["connect_args"] = {"server_settings": settings}
+    return options
+
+
+# --------------------------
+# Réplica y "leer lo propio" por cliente
+# - Sólo cuentan las escrituras hechas por un request (POST/PUT/DELETE...):
+#   la ingesta, la ponderación y el warm-up no frenan el uso de la réplica
+# - La hora de la escritura viaja con el cliente (cookie + header), así que
+#   vale entre workers y contenedores, no sólo en el proceso que escribió
+# --------------------------
+REPLICA_WRITE_COOKIE = "nautic_last_write"
+REPLICA_WRITE_HEADER = "x-last-write-at"
+
+
+def bind_request(db, request: Optional[Request]):
+    """Asocia la sesión al request que la pidió si éste puede escribir."""
+    if request is not None and request.method not in ("GET", "HEAD"):
+        db.info["request"] = request
+
+
+@event.listens_for(Session, "after_commit", insert=True)
+def _record_request_write(session):
+    # insert=True: corre antes que el listener de core/versioning.py, que limpia "has_writes"
+    request = session.info.get("request")
+    if request is not None and session.info.get("has_writes"):
+        request.state.last_write_at = time.time()
+
+
+def last_client_write(request: Request) -> Optional[float]:
+    """Epoch de la última escritura del cliente (header o cookie), None si no hay."""
+    valor = request.headers.get(REPLICA_WRITE_HEADER) or request.cookies.get(REPLICA_WRITE_COOKIE)
+    try:
+        return float(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def use_replica(request: Request = None) -> bool:
+    """
+    Los GET/HEAD van a la réplica, salvo que el mismo cliente haya escrito hace
+    menos de REPLICA_STALENESS_SECONDS (para que lea lo que acaba de escribir).
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return False
+    escrito = last_client_write(request)
+    return escrito is None or time.time() - escrito > REPLICA_STALENESS_SECONDS
+
+
+class ReplicaStickinessMiddleware:
+    """Devuelve la hora de la escritura (cookie + header X-Last-Write-At) a quien escribió."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_write_mark(message):
+            escrito = scope.get("state", {}).get("last_write_at")
+            if message["type"] == "http.response.start" and escrito is not None:
+                valor = f"{escrito:.3f}"
+                cookie = (
+                    f"{REPLICA_WRITE_COOKIE}={valor}; Path=/; Max-Age={math.ceil(REPLICA_STALENESS_SECONDS) + 1}; "
+                    "HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", []))
+                    + [(b"set-cookie", cookie.encode()), (REPLICA_WRITE_HEADER.encode(), valor.encode())],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_write_mark)
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal() #Crea una nueva sesión con la base de datos
+# Réplica de sólo lectura (opcional)
+replica_engine = (
+    create_engine(DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL, InstrumentedQueuePool, read_only=True))
+    if DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine is not None else None
+)
+
+def get_db(request: Request = None):
+    # GET → réplica (si está configurada y no hubo escrituras recientes); el resto → primario
+    factory = ReplicaSessionLocal if ReplicaSessionLocal is not None and use_replica(request) else SessionLocal
+    db = factory() #Crea una nueva sesión con la base de datos
+    bind_request(db, request)
     try:
         yield db #La “cede” temporalmente a FastAPI para usarla dentro del endpoint
     finally:
-        db.close() #Cierra la sesión al finalizar la petición
\ No newline at end of file
+        db.close() #Cierra la sesión al finalizar la petición
+
+
+def pool_stats() -> dict:
+    """Estado en vivo del pool del engine sync (y de la réplica, si hay)."""
+    stats = {"primary": engine.pool.stats()}
+    if replica_engine is not None:
+        stats["replica"] = replica_engine.pool.stats()
+    return stats
+
+
+# Registra los listeners que incrementan la versión global de datos en cada commit con
+# escrituras: cualquier proceso que use la BD (API, CLI de ingesta, scripts) la mantiene al día
+import app.core.versioning  # noqa: E402,F401
@@ -1,9 +1,2 @@
-from app.core.database import SessionLocal
-from sqlalchemy.orm import Session
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# Única fábrica de sesiones: core/database.py (se re-exporta por compatibilidad)
+from app.core.database import SessionLocal, get_db  # noqa: F401
@@ -0,0 +1,185 @@
+# app/core/logging_config.py
+# ------------------------------------------------------------
+# Logging estructurado y no bloqueante
+# - Los loggers escriben en una cola en memoria (QueueHandler); un único hilo
+#   (QueueListener) formatea y escribe a stdout. Un request nunca espera I/O.
+# - Si la cola se llena, el evento se descarta y se cuenta (log_stats()).
+# - Formato "text" (clave=valor) o "json" (una línea por evento), con los
+#   campos pasados en extra={...}.
+# - Nivel global (LOG_LEVEL) y por módulo (LOG_LEVELS).
+# - Muestreo de mensajes de alto volumen: extra={"sampled": True} emite sólo
+#   una fracción (LOG_SAMPLE_RATE / LOG_SAMPLE_RATES) de cada mensaje.
+#
+# Uso:
+#   from app.core.logging_config import get_logger
+#   log = get_logger(__name__)
+#   log.info("Spot procesado", extra={"spot_id": 3, "upserts": 65})
+# ------------------------------------------------------------
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.config import (
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_FORMAT,
+    LOG_QUEUE_MAX_SIZE,
+    LOG_SAMPLE_RATE,
+    LOG_SAMPLE_RATES,
+)
+
+# Atributos propios de LogRecord: todo lo demás vino por extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["_NonBlockingQueueHandler"] = None
+
+
+def _parse_por_modulo(valor: str, convertir) -> Dict[str, object]:
+    """'a.b=DEBUG,c=WARNING' → {'a.b': 'DEBUG', 'c': 'WARNING'} (ignora entradas mal formadas)."""
+    resultado = {}
+    for item in valor.split(","):
+        nombre, sep, dato = item.partition("=")
+        if sep and nombre.strip() and dato.strip():
+            resultado[nombre.strip()] = convertir(dato.strip())
+    return resultado
+
+
+# --------------------------
+# Formato
+# --------------------------
+def _campos(record: logging.LogRecord) -> Dict[str, object]:
+    return {k: v for k, v in vars(record).items() if k not in _RESERVED and not k.startswith("_")}
+
+
+class StructuredFormatter(logging.Formatter):
+    def __init__(self, fmt: str = "text"):
+        super().__init__()
+        self.fmt = fmt
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds")
+        mensaje = record.getMessage()
+        campos = _campos(record)
+        error = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+
+        if self.fmt == "json":
+            evento = {"ts": ts, "level": record.levelname, "logger": record.name, "msg": mensaje, **campos}
+            if error:
+                evento["exc"] = error
+            return json.dumps(evento, ensure_ascii=False, default=str)
+
+        linea = f"{ts} {record.levelname:<7} {record.name} {mensaje}"
+        if campos:
+            linea += " " + " ".join(f"{k}={v}" for k, v in campos.items())
+        if error:
+            linea += "\n" + error
+        return linea
+
+
+# --------------------------
+# Muestreo
+# --------------------------
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar 1 de cada round(1/tasa) eventos marcados con extra={"sampled": True},
+    contando por (logger, mensaje sin formatear). WARNING o superior nunca se muestrea.
+    La tasa sale de LOG_SAMPLE_RATES (prefijo de módulo más largo) o LOG_SAMPLE_RATE.
+    """
+
+    def __init__(self, default_rate: float, rates: Dict[str, float]):
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = rates
+        self._vistos: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _rate(self, nombre: str) -> float:
+        mejor = None
+        for prefijo in self.rates:
+            if (nombre == prefijo or nombre.startswith(prefijo + ".")) and (mejor is None or len(prefijo) > len(mejor)):
+                mejor = prefijo
+        return self.rates[mejor] if mejor is not None else self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        cada = max(1, round(1 / rate))
+        with self._lock:
+            n = self._vistos[(record.name, record.msg)]
+            self._vistos[(record.name, record.msg)] = n + 1
+        return n % cada == 0
+
+
+# --------------------------
+# Handler no bloqueante
+# --------------------------
+class _NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolvemos args y traceback acá (pueden no ser serializables entre hilos),
+        # pero el formateo final queda para el hilo del listener.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging() -> None:
+    """Configura el logging del proceso una única vez (idempotente)."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return
+
+        salida = logging.StreamHandler(sys.stdout)
+        salida.setFormatter(StructuredFormatter(LOG_FORMAT))
+
+        _queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_MAX_SIZE))
+        _queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE, _parse_por_modulo(LOG_SAMPLE_RATES, float)))
+
+        root = logging.getLogger()
+        root.addHandler(_queue_handler)
+        root.setLevel(LOG_LEVEL.upper())
+        for nombre, nivel in _parse_por_modulo(LOG_LEVELS, str.upper).items():
+            logging.getLogger(nombre).setLevel(nivel)
+
+        _listener = QueueListener(_queue_handler.queue, salida, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)  # vacía la cola al terminar el proceso
+
+
+def get_logger(name: str) -> logging.Logger:
+    setup_logging()
+    return logging.getLogger(name)
+
+
+def log_stats() -> dict:
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
@@ -0,0 +1,125 @@
+# app/core/metrics.py
+# ----------------------------------------------------------
+# Métricas HTTP en memoria, expuestas en formato de texto Prometheus
+# - Histograma de latencia por (método, ruta)
+# - Contador de requests por (método, ruta, status)
+# - Requests en curso
+# - La ruta es el template (/spot/list), no el path real, para acotar
+#   la cardinalidad; lo que no matchea ninguna ruta queda como "unmatched"
+# ----------------------------------------------------------
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+
+from app.core.config import METRICS_ENABLED, METRICS_LATENCY_BUCKETS
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class HttpMetrics:
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = defaultdict(int)                      # (método, ruta, status) → n
+        self.hist_counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))  # último = +Inf
+        self.hist_sum = defaultdict(float)
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, method: str, route: str, status: int, seconds: float):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(method, route, status)] += 1
+            self.hist_counts[(method, route)][i] += 1
+            self.hist_sum[(method, route)] += seconds
+
+    def render(self, extra_gauges=None) -> str:
+        """Texto Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            requests = dict(self.requests)
+            counts = {k: list(v) for k, v in self.hist_counts.items()}
+            sums = dict(self.hist_sum)
+            in_flight = self.in_flight
+
+        lines = [
+            "# HELP nautic_http_requests_in_flight Requests HTTP en curso.",
+            "# TYPE nautic_http_requests_in_flight gauge",
+            f"nautic_http_requests_in_flight {in_flight}",
+            "# HELP nautic_http_requests_total Requests HTTP por método, ruta y status.",
+            "# TYPE nautic_http_requests_total counter",
+        ]
+        for (method, route, status), n in sorted(requests.items()):
+            lines.append(f'nautic_http_requests_total{{method="{method}",route="{_esc(route)}",status="{status}"}} {n}')
+
+        lines += [
+            "# HELP nautic_http_request_duration_seconds Latencia de requests HTTP.",
+            "# TYPE nautic_http_request_duration_seconds histogram",
+        ]
+        for (method, route), bucket_counts in sorted(counts.items()):
+            labels = f'method="{method}",route="{_esc(route)}"'
+            acumulado = 0
+            for limite, n in zip(self.buckets, bucket_counts):
+                acumulado += n
+                lines.append(f'nautic_http_request_duration_seconds_bucket{{{labels},le="{limite:g}"}} {acumulado}')
+            acumulado += bucket_counts[-1]
+            lines.append(f'nautic_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {acumulado}')
+            lines.append(f"nautic_http_request_duration_seconds_sum{{{labels}}} {sums[(method, route)]:.6f}")
+            lines.append(f"nautic_http_request_duration_seconds_count{{{labels}}} {acumulado}")
+
+        for name, help_text, samples in extra_gauges or []:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in samples:
+                etiqueta = ",".join(f'{k}="{_esc(str(v))}"' for k, v in labels.items())
+                lines.append(f"{name}{{{etiqueta}}} {value}" if etiqueta else f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _esc(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+http_metrics = HttpMetrics(METRICS_LATENCY_BUCKETS)
+
+
+# --------------------------
+# Middleware ASGI
+# --------------------------
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._route_paths = None  # endpoint → template de ruta (se arma en el primer request)
+
+    def _route_of(self, scope) -> str:
+        if self._route_paths is None:
+            router = scope["app"].router
+            self._route_paths = {
+                getattr(r, "endpoint", None): r.path for r in router.routes if hasattr(r, "path")
+            }
+        return self._route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_metrics.start()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # El router completa scope["endpoint"] al resolver la ruta
+            http_metrics.finish(scope.get("method", ""), self._route_of(scope), status["code"], time.perf_counter() - inicio)
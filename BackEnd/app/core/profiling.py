@@ -0,0 +1,192 @@
+# app/core/profiling.py
+# ----------------------------------------------------------
+# Profiling opt-in de un request puntual (CPU + memoria)
+# - Sólo se instala con PROFILING_ENABLED=1; si no, no hay ningún costo
+# - Se activa por request con el header "X-Profile: 1" o "?__profile=1",
+#   y sólo si la sesión es de un admin (en otro caso se ignora el pedido)
+# - CPU: un hilo muestrea los stacks cada PROFILING_INTERVAL_MS y escribe
+#   <id>.folded (formato "stack colapsado": flamegraph.pl, speedscope...)
+# - Memoria: tracemalloc durante el request → <id>.alloc.txt con el pico de
+#   memoria y las líneas que más memoria asignaron y siguen vivas al final
+# - Un request perfilado por vez (tracemalloc es global); si hay otro en
+#   curso, el request corre normal y responde X-Profile-Status: busy
+# ----------------------------------------------------------
+
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+
+from app.core.config import (
+    PROFILING_DIR,
+    PROFILING_HEADER,
+    PROFILING_INTERVAL_MS,
+    PROFILING_QUERY_PARAM,
+    PROFILING_TOP_ALLOCATIONS,
+    PROFILING_TRACEMALLOC_FRAMES,
+)
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
+
+# Hilos ociosos (event loop esperando en select, workers esperando trabajo):
+# si el frame más interno está en uno de estos módulos, la muestra no aporta
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+_profile_lock = threading.Lock()
+
+
+# --------------------------
+# Muestreo de stacks (CPU)
+# --------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    archivo = "/".join(code.co_filename.replace("\\", "/").split("/")[-2:])
+    return f"{code.co_name} ({archivo}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def _run(self):
+        propio = threading.get_ident()
+        nombres = {}
+        while not self._stop.wait(self.interval_s):
+            for ident, frame in sys._current_frames().items():
+                if ident == propio or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                if ident not in nombres:
+                    nombres = {t.ident: t.name for t in threading.enumerate()}
+                pila = []
+                while frame is not None:
+                    pila.append(_frame_label(frame))
+                    frame = frame.f_back
+                pila.append(nombres.get(ident, str(ident)))
+                self.stacks[";".join(reversed(pila))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{pila} {n}\n" for pila, n in self.stacks.most_common())
+
+
+# --------------------------
+# Reportes
+# --------------------------
+def _allocation_report(snapshot, limite: int, encabezado: str) -> str:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    stats = snapshot.statistics("lineno")
+    total = sum(s.size for s in stats)
+    lineas = [encabezado, f"Memoria viva asignada durante el request: {total / 1024:.1f} KiB en {len(stats)} líneas", ""]
+    for i, stat in enumerate(stats[:limite], 1):
+        frame = stat.traceback[0]
+        lineas.append(f"#{i:<3} {stat.size / 1024:10.1f} KiB  {stat.count:8d} bloques  {frame.filename}:{frame.lineno}")
+    return "\n".join(lineas) + "\n"
+
+
+def _write_files(profile_id: str, folded: str, alloc: str):
+    os.makedirs(PROFILING_DIR, exist_ok=True)
+    base = os.path.join(PROFILING_DIR, profile_id)
+    with open(base + ".folded", "w", encoding="utf-8") as f:
+        f.write(folded)
+    with open(base + ".alloc.txt", "w", encoding="utf-8") as f:
+        f.write(alloc)
+    return base
+
+
+# --------------------------
+# Middleware ASGI
+# --------------------------
+def _requested(scope) -> bool:
+    header = PROFILING_HEADER.lower().encode()
+    for nombre, valor in scope.get("headers", []):
+        if nombre == header and valor not in (b"", b"0"):
+            return True
+    query = scope.get("query_string", b"")
+    if PROFILING_QUERY_PARAM.encode() in query:
+        valores = parse_qs(query.decode("latin-1")).get(PROFILING_QUERY_PARAM, [])
+        return any(v not in ("", "0") for v in valores)
+    return False
+
+
+def _is_admin(scope) -> bool:
+    # La sesión la decodifica SessionMiddleware, que tiene que ir por fuera de este middleware
+    sesion = scope.get("session") or {}
+    return (sesion.get("tipo_usuario") or "").lower() == "admin"
+
+
+class ProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope) or not _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, _with_headers(send, [(b"x-profile-status", b"busy")]))
+            return
+
+        ruta = re.sub(r"[^A-Za-z0-9]+", "_", scope.get("path", "")).strip("_") or "root"
+        profile_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}_{scope.get('method', '')}_{ruta}"
+        send = _with_headers(send, [(b"x-profile-status", b"ok"), (b"x-profile-id", profile_id.encode())])
+
+        ya_trazaba = tracemalloc.is_tracing()
+        sampler = StackSampler(PROFILING_INTERVAL_MS / 1000)
+        inicio = time.perf_counter()
+        try:
+            if ya_trazaba:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+            sampler.start()
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            _, pico = tracemalloc.get_traced_memory()
+            if not ya_trazaba:
+                tracemalloc.stop()
+            _profile_lock.release()
+
+            ms = (time.perf_counter() - inicio) * 1000
+            encabezado = (
+                f"{scope.get('method')} {scope.get('path')} — {ms:.1f} ms, {sampler.samples} muestras\n"
+                f"Pico de memoria trazada durante el request: {pico / 1024:.1f} KiB"
+            )
+            try:
+                loop = asyncio.get_running_loop()
+                alloc = await loop.run_in_executor(None, _allocation_report, snapshot, PROFILING_TOP_ALLOCATIONS, encabezado)
+                base = await loop.run_in_executor(None, _write_files, profile_id, sampler.folded(), alloc)
+                log.info("🔬 Perfil de request guardado", extra={"archivo": base, "ms": round(ms, 1), "muestras": sampler.samples})
+            except Exception:
+                log.exception("❌ No se pudo guardar el perfil del request", extra={"profile_id": profile_id})
+
+
+def _with_headers(send, extra):
+    async def send_with_headers(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers", [])) + extra}
+        await send(message)
+    return send_with_headers
@@ -0,0 +1,141 @@
+# app/core/sql_instrumentation.py
+# ----------------------------------------------------------
+# Instrumentación SQL por request
+# - Eventos de Engine (aplican a todos los engines, sync y async):
+#   cuentan consultas, tiempo en BD y "formas" de statement repetidas
+# - Las métricas viven en un contextvar que abre el middleware por request
+#   (también lo ven los handlers sync del threadpool y el greenlet de asyncio)
+# - El middleware agrega X-DB-Query-Count / X-DB-Time-Ms y avisa cuando se
+#   pasan los umbrales o una misma consulta se repite N veces (N+1)
+# ----------------------------------------------------------
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+    SQL_DEBUG_HEADERS,
+    SQL_INSTRUMENTATION_ENABLED,
+    SQL_WARN_DB_TIME_MS,
+    SQL_WARN_QUERY_COUNT,
+    SQL_WARN_REPEATED_SHAPE,
+)
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
+
+
+class RequestSQLStats:
+    __slots__ = ("queries", "db_time_ms", "shapes")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time_ms = 0.0
+        self.shapes = Counter()
+
+    def repeated(self, minimo: int):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= minimo]
+
+
+_request_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> Optional[RequestSQLStats]:
+    return _request_stats.get()
+
+
+# --------------------------
+# Forma del statement (sin valores ni largo de listas IN)
+# --------------------------
+_PARAM_RE = re.compile(r"%\(\w+\)s|\$\d+|\?|:\w+|%s")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _LIST_RE.sub("(?)", shape)
+    return _SPACES_RE.sub(" ", shape).strip()
+
+
+# --------------------------
+# Eventos de Engine
+# --------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    inicios = conn.info.get("query_start")
+    if inicios:
+        stats.db_time_ms += (time.perf_counter() - inicios.pop()) * 1000
+    stats.queries += 1
+    stats.shapes[statement_shape(statement)] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    # La consulta falló: no hay after_cursor_execute, descartamos su inicio
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+# --------------------------
+# Middleware ASGI
+# --------------------------
+def _report(method: str, path: str, stats: RequestSQLStats):
+    avisos = []
+    if stats.queries > SQL_WARN_QUERY_COUNT:
+        avisos.append(f"{stats.queries} consultas (umbral {SQL_WARN_QUERY_COUNT})")
+    if stats.db_time_ms > SQL_WARN_DB_TIME_MS:
+        avisos.append(f"{stats.db_time_ms:.1f} ms en BD (umbral {SQL_WARN_DB_TIME_MS:.0f} ms)")
+    for shape, n in stats.repeated(SQL_WARN_REPEATED_SHAPE):
+        avisos.append(f"posible N+1: {n}× «{shape[:160]}»")
+    if avisos:
+        log.warning(
+            "⚠️ SQL por encima de los umbrales",
+            extra={"method": method, "path": path, "queries": stats.queries,
+                   "db_time_ms": round(stats.db_time_ms, 1), "avisos": "; ".join(avisos)},
+        )
+
+
+class SQLStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_headers(message):
+            # Los headers salen al iniciar la respuesta: cuentan las consultas hechas hasta ahí
+            if message["type"] == "http.response.start" and SQL_DEBUG_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.queries).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.db_time_ms:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            _report(scope.get("method", ""), scope.get("path", ""), stats)
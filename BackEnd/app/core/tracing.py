@@ -0,0 +1,208 @@
+# app/core/tracing.py
+# ----------------------------------------------------------
+# Trazas livianas de corridas batch (ingesta, ponderación)
+# - trace_run(nombre): abre una corrida; si ya hay una activa, se comporta
+#   como un span más dentro de ella
+# - span(nombre, **attrs): mide una etapa (fetch, parse, upsert, commit...)
+#   con atributos (spot_id, provider, rows...). Fuera de una corrida no hace nada
+# - La corrida y el span actuales viven en contextvars: los ven las tasks de
+#   asyncio; para hilos del executor hay que pasar por contextvars.copy_context()
+# - Al terminar, la corrida se agrega como una línea JSON a TRACE_FILE
+#   (rota a .1 al superar TRACE_FILE_MAX_BYTES)
+# ----------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import TRACE_ENABLED, TRACE_FILE, TRACE_FILE_MAX_BYTES, TRACE_MAX_SPANS
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "attrs", "_t0", "start_ms", "ms", "error")
+
+    def __init__(self, name: str, parent: Optional[int], attrs: dict, run_t0: float):
+        self.id = None
+        self.parent = parent
+        self.name = name
+        self.attrs = attrs
+        self._t0 = time.perf_counter()
+        self.start_ms = round((self._t0 - run_t0) * 1000, 3)
+        self.ms = None
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        d = {"id": self.id, "parent": self.parent, "name": self.name, "start_ms": self.start_ms, "ms": self.ms, **self.attrs}
+        if self.error:
+            d["error"] = self.error
+        return d
+
+
+class TraceRun:
+    def __init__(self, name: str, attrs: dict):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.t0 = time.perf_counter()
+        self.root = Span(name, None, attrs, self.t0)
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._add(self.root)
+
+    def _add(self, span: Span) -> bool:
+        with self._lock:
+            if len(self.spans) >= TRACE_MAX_SPANS:
+                self.dropped += 1
+                return False
+            span.id = len(self.spans)
+            self.spans.append(span)
+            return True
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "ms": self.root.ms,
+            "attrs": self.root.attrs,
+            "error": self.root.error,
+            "stages": stage_summary(self.spans[1:]),
+            "spans": [s.to_dict() for s in self.spans[1:]],
+            "dropped_spans": self.dropped,
+        }
+
+
+_current_run: ContextVar[Optional[TraceRun]] = ContextVar("trace_run", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+_file_lock = threading.Lock()
+
+
+def stage_summary(spans) -> Dict[str, dict]:
+    """{etapa: {count, total_ms, max_ms, rows}} (las etapas concurrentes pueden sumar más que la corrida)."""
+    etapas: Dict[str, dict] = {}
+    for s in spans:
+        d = s if isinstance(s, dict) else s.to_dict()
+        if d.get("ms") is None:
+            continue
+        e = etapas.setdefault(d["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        e["count"] += 1
+        e["total_ms"] = round(e["total_ms"] + d["ms"], 3)
+        e["max_ms"] = max(e["max_ms"], d["ms"])
+        e["rows"] += d.get("rows") or 0
+    return etapas
+
+
+# --------------------------
+# API de instrumentación
+# --------------------------
+@contextmanager
+def span(name: str, **attrs):
+    run = _current_run.get()
+    if run is None:
+        yield _NOOP
+        return
+
+    padre = _current_span.get()
+    s = Span(name, padre.id if padre else None, attrs, run.t0)
+    if not run._add(s):
+        yield _NOOP
+        return
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as exc:
+        s.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        s.ms = round((time.perf_counter() - s._t0) * 1000, 3)
+        _current_span.reset(token)
+
+
+@contextmanager
+def trace_run(name: str, **attrs):
+    if not TRACE_ENABLED or _current_run.get() is not None:
+        with span(name, **attrs) as s:
+            yield s
+        return
+
+    run = TraceRun(name, attrs)
+    run_token = _current_run.set(run)
+    span_token = _current_span.set(run.root)
+    try:
+        yield run.root
+    except BaseException as exc:
+        run.root.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        run.root.ms = round((time.perf_counter() - run.root._t0) * 1000, 3)
+        _current_span.reset(span_token)
+        _current_run.reset(run_token)
+        _write_run(run)
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+# --------------------------
+# Persistencia
+# --------------------------
+def _write_run(run: TraceRun):
+    try:
+        linea = json.dumps(run.to_dict(), ensure_ascii=False, default=str)
+        with _file_lock:
+            carpeta = os.path.dirname(TRACE_FILE)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            if os.path.exists(TRACE_FILE) and os.path.getsize(TRACE_FILE) > TRACE_FILE_MAX_BYTES:
+                os.replace(TRACE_FILE, TRACE_FILE + ".1")
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(linea + "\n")
+    except Exception:
+        log.exception("❌ No se pudo escribir la traza de la corrida", extra={"run_id": run.run_id})
+        return
+    log.info("🧭 Traza de corrida guardada", extra={"run_id": run.run_id, "corrida": run.name, "ms": run.root.ms})
+
+
+def recent_runs(limit: int = 10, name: Optional[str] = None, include_spans: bool = False) -> List[dict]:
+    """Últimas `limit` corridas del archivo de trazas (la más reciente primero)."""
+    lineas: List[str] = []
+    with _file_lock:
+        for ruta in (TRACE_FILE, TRACE_FILE + ".1"):
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, encoding="utf-8") as f:
+                candidatas = f.read().splitlines()
+            lineas.extend(reversed(candidatas))
+
+    corridas = []
+    for linea in lineas:
+        try:
+            corrida = json.loads(linea)
+        except ValueError:
+            continue  # línea truncada (p.ej. el proceso murió escribiendo)
+        if name and corrida.get("name") != name:
+            continue
+        if not include_spans:
+            corrida.pop("spans", None)
+        corridas.append(corrida)
+        if len(corridas) >= limit:
+            break
+    return corridas
@@ -0,0 +1,160 @@
+# app/core/versioning.py
+# ----------------------------------------------------------
+# Versión global de datos (la usan las cachés en memoria)
+# - Vive en la tabla data_version (migración 0006): toda transacción con
+#   escrituras la incrementa antes del commit, en la misma transacción,
+#   así vale entre workers, contenedores y procesos sueltos (CLI de ingesta)
+# - Los listeners se registran al importar app.core.database: cualquier
+#   proceso que escriba por el ORM incrementa la versión
+# - Cada proceso que sirve requests la relee en un hilo aparte cada
+#   RESPONSE_CACHE_VERSION_POLL_SECONDS (los requests no consultan la BD
+#   para armar la clave). Sin la tabla, o con el poll en 0, es un contador
+#   local del proceso (sólo sirve con un único worker)
+# ----------------------------------------------------------
+
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.config import RESPONSE_CACHE_VERSION_POLL_SECONDS
+from app.core.logging_config import get_logger
+
+TABLE_RECHECK_SECONDS = 60  # sin tabla (base sin migrar): cada cuánto se vuelve a buscar
+
+log = get_logger(__name__)
+
+_data_version = 0
+_version_lock = threading.Lock()
+_shared = False     # True cuando la versión sale de la tabla data_version
+_offset = 0         # al pasar de contador local a tabla, para no repetir versiones ya usadas
+_poller: Optional[threading.Thread] = None
+_table_exists: Optional[bool] = None
+_table_checked_at = 0.0
+
+
+def data_version() -> int:
+    _start_poller()
+    return _data_version
+
+
+def bump_data_version() -> int:
+    """Incremento local (sin tabla data_version)."""
+    global _data_version
+    with _version_lock:
+        _data_version += 1
+        return _data_version
+
+
+def _observe(version_bd: int):
+    """Adopta una versión leída/escrita en data_version (nunca retrocede)."""
+    global _data_version, _shared, _offset, _table_exists
+    with _version_lock:
+        _table_exists = True
+        if not _shared:
+            _offset = _data_version + 1
+            _shared = True
+            log.info("🔢 Versión de datos compartida (tabla data_version)", extra={"version": version_bd})
+        _data_version = max(_data_version, _offset + version_bd)
+
+
+def _has_table(session: Session) -> bool:
+    """¿Existe data_version? Se consulta una vez (los negativos se revisan cada TABLE_RECHECK_SECONDS)."""
+    global _table_exists, _table_checked_at
+    if _table_exists or (_table_exists is False and time.monotonic() - _table_checked_at < TABLE_RECHECK_SECONDS):
+        return bool(_table_exists)
+    existe = inspect(session.connection()).has_table("data_version")
+    with _version_lock:
+        _table_exists = _table_exists or existe
+        _table_checked_at = time.monotonic()
+    return existe
+
+
+def session_data_version(session: Session) -> Optional[int]:
+    """
+    Versión que ve esta sesión (p.ej. una réplica atrasada), en la misma escala
+    que data_version(). None si no hay tabla o todavía no se adoptó la versión compartida.
+    """
+    if not _shared or not _has_table(session):
+        return None
+    version_bd = session.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+    return None if version_bd is None else _offset + version_bd
+
+
+def _read_shared_version(bind=None) -> Optional[int]:
+    if bind is None:
+        from app.core.database import engine as bind  # diferido: database importa este módulo
+
+    try:
+        with bind.connect() as conn:
+            return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+    except Exception:
+        return None
+
+
+def _poll_version():
+    avisado = False
+    while True:
+        version_bd = _read_shared_version()
+        if version_bd is not None:
+            _observe(version_bd)
+        elif not _shared and not avisado:
+            avisado = True
+            log.warning("⚠️ Sin tabla data_version: la versión de las cachés es local a este proceso (usar un único worker)")
+        time.sleep(RESPONSE_CACHE_VERSION_POLL_SECONDS)
+
+
+def _start_poller():
+    global _poller
+    if _poller is not None or RESPONSE_CACHE_VERSION_POLL_SECONDS <= 0:
+        return
+    with _version_lock:
+        if _poller is None:
+            _poller = threading.Thread(target=_poll_version, name="data-version-poller", daemon=True)
+            _poller.start()
+
+
+# --------------------------
+# Escrituras → versión
+# --------------------------
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    # INSERT/UPDATE/DELETE ejecutados directamente (upserts, query.delete(), etc.)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_shared_version(session):
+    # Misma transacción que las escrituras: ningún worker ve los datos nuevos con la versión vieja.
+    # session.new/dirty/deleted: lo pendiente se flushea después de este evento
+    if not (session.info.get("has_writes") or session.new or session.dirty or session.deleted):
+        return
+    if not _has_table(session):
+        return
+    session.info["data_version"] = session.execute(
+        text("UPDATE data_version SET version = version + 1 WHERE id = 1 RETURNING version")
+    ).scalar()
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    version_bd = session.info.pop("data_version", None)
+    if session.info.pop("has_writes", False) or version_bd is not None:
+        if version_bd is not None:
+            _observe(version_bd)
+        else:
+            bump_data_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop("has_writes", None)
+    session.info.pop("data_version", None)
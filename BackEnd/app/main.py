@@ -2,11 +2,26 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from app.api import spot_routes, business_owner_routes, admin_routes, test_routes, user_routes, deporte_routes
-from app.core.database import Base, engine
+from app.api import spot_routes, business_owner_routes, admin_routes, test_routes, user_routes, deporte_routes, health_routes
+from app.core.database import Base, engine, ReplicaStickinessMiddleware, replica_engine
+from app.core.async_database import async_engine, async_replica_engine
+from app.core.sql_instrumentation import SQLStatsMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.logging_config import setup_logging
+from app.core.profiling import ProfilerMiddleware
+from app.core.config import PROFILING_ENABLED, STARTUP_INGESTION
+from app.services.StartupWarmup import disable_warmup, start_background_warmup
+
+# Logging estructurado vía cola (ver core/logging_config.py), antes de levantar la app
+setup_logging()
 
 app = FastAPI(title="Nautic API", version="1.0")
 
+# Profiling opt-in por request (header X-Profile / ?__profile=1, sólo admins).
+# Se agrega antes que SessionMiddleware para quedar por dentro y ver la sesión.
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
 app.add_middleware(
     SessionMiddleware,
     secret_key="change_me",
@@ -24,12 +39,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "X-Profile-Id", "X-Profile-Status", "X-Last-Write-At"],
 )
 
+# Con réplica: quien escribe recibe la hora de su escritura y sus GET siguientes van al primario
+if replica_engine is not None or async_replica_engine is not None:
+    app.add_middleware(ReplicaStickinessMiddleware)
+
+# Consultas y tiempo en BD por request (headers X-DB-* y aviso de N+1)
+app.add_middleware(SQLStatsMiddleware)
+
+# Latencia por ruta, requests en curso y status (ver /metrics); va por fuera de todo
+app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(spot_routes.router)
 app.include_router(business_owner_routes.router)
 app.include_router(user_routes.router)
 app.include_router(admin_routes.router)
 app.include_router(test_routes.router)
-app.include_router(deporte_routes.router)
\ No newline at end of file
+app.include_router(deporte_routes.router)
+app.include_router(health_routes.router)
+
+@app.on_event("startup")
+def start_ingestion():
+    # La API sirve de inmediato; la ingesta inicial corre en segundo plano (ver /ready)
+    if STARTUP_INGESTION == "background":
+        start_background_warmup()
+    else:
+        disable_warmup()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    # Cierra los pools de los engines async (core/async_database.py)
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
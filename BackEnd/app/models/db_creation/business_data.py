@@ -2,6 +2,9 @@ from decimal import Decimal
 
 from app.core.database import SessionLocal
 from app.models.models import Negocio, Usuario, EstadoNegocio
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 businesses_data = [
     {
@@ -49,12 +52,12 @@ businesses_data = [
 def seed_businesses():
     db = SessionLocal()
     try:
-        print("🏪 Insertando negocios en la base de datos...")
+        log.info("🏪 Insertando negocios en la base de datos...")
 
         for negocio_data in businesses_data:
             dueno = db.query(Usuario).filter(Usuario.email == negocio_data["email_dueno"]).first()
             if not dueno:
-                print(f"⚠️  No se encontró usuario con email {negocio_data['email_dueno']}, se omite negocio.")
+                log.warning("⚠️ No se encontró el usuario dueño, se omite negocio", extra={"email": negocio_data["email_dueno"]})
                 continue
 
             existing = (
@@ -66,8 +69,9 @@ def seed_businesses():
                 .first()
             )
             if existing:
-                print(
-                    f"ℹ️  El negocio '{negocio_data['nombre_fantasia']}' ya existe para {negocio_data['email_dueno']}, se omite."
+                log.info(
+                    "ℹ️ El negocio ya existe, se omite",
+                    extra={"negocio": negocio_data["nombre_fantasia"], "email": negocio_data["email_dueno"]},
                 )
                 continue
 
@@ -88,11 +92,11 @@ def seed_businesses():
 
         db.commit()
 
-        print("✅ Negocios insertados correctamente.")
+        log.info("✅ Negocios insertados correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar negocios: {e}")
+        log.exception("❌ Error al insertar negocios")
     finally:
         db.close()
 
@@ -1,6 +1,18 @@
-from app.core.database import Base, engine
-from app.models.models import *
+from app.core.database import SessionLocal
+from app.models.migrations.runner import run_migrations
+from app.services.WeatherSummary import reconstruir_resumen_si_vacio
+from app.core.logging_config import get_logger
 
-print("Creando tablas en la base de datos...")
-Base.metadata.create_all(bind=engine)
-print("✅ Tablas creadas correctamente en Railway.")
+log = get_logger(__name__)
+
+log.info("Creando tablas en la base de datos...")
+# El esquema (tablas, claves e índices) lo crean y actualizan las migraciones
+run_migrations()
+log.info("✅ Tablas creadas correctamente en Railway.")
+
+# Backfill del resumen meteorológico para bases con datos previos
+session = SessionLocal()
+try:
+    reconstruir_resumen_si_vacio(session)
+finally:
+    session.close()
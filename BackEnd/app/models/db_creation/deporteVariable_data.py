@@ -5,6 +5,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from app.models.models import DeporteVariable
 from app.core.database import SessionLocal, engine, Base
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # -----------------------------
 # Datos base
@@ -91,14 +94,14 @@ def _upsert_deporte_variable(session: Session, data):
 # -----------------------------
 def seed_deporte_variable(session: Session):
     try:
-        print("🏄 Insertando relaciones Deporte-Variable...")
+        log.info("🏄 Insertando relaciones Deporte-Variable...")
         for item in DATA:
             _upsert_deporte_variable(session, item)
         session.commit()
-        print("✅ Relaciones DeporteVariable insertadas correctamente.")
-    except Exception as e:
+        log.info("✅ Relaciones DeporteVariable insertadas correctamente.")
+    except Exception:
         session.rollback()
-        print(f"❌ Error al insertar DeporteVariable: {e}")
+        log.exception("❌ Error al insertar DeporteVariable")
     finally:
         session.close()
 
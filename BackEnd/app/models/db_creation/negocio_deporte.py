@@ -1,5 +1,8 @@
 from app.core.database import SessionLocal
 from app.models.models import NegocioDeporte
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 negocio_deportes = [
     {"id_negocio": 1, "id_deporte": 2},
@@ -10,7 +13,7 @@ negocio_deportes = [
 def seed_negocio_deportes():
     db = SessionLocal()
     try:
-        print("🏪 Insertando relaciones de negocio y deporte")
+        log.info("🏪 Insertando relaciones de negocio y deporte")
 
         for negocio_deporte in negocio_deportes:
             nuevo_negocio_deporte = NegocioDeporte(
@@ -20,11 +23,11 @@ def seed_negocio_deportes():
             db.add(nuevo_negocio_deporte)
 
         db.commit()
-        print("✅ Relaciones insertadas correctamente.")
+        log.info("✅ Relaciones insertadas correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar relaciones: {e}")
+        log.exception("❌ Error al insertar relaciones")
     finally:
         db.close()
 
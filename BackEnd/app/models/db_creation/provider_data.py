@@ -1,5 +1,8 @@
 from app.core.database import SessionLocal
 from app.models.models import ProveedorDatos
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # Lista de proveedores de datos a insertar
 provider_data = [
@@ -13,7 +16,7 @@ def generar_codigo(prefix, id_num):
 def seed_providers():
     db = SessionLocal()
     try:
-        print("📡 Insertando proveedores de datos en la base de datos...")
+        log.info("📡 Insertando proveedores de datos en la base de datos...")
 
         for i, provider in enumerate(provider_data, start=1):
             nuevo_proveedor = ProveedorDatos(
@@ -25,11 +28,11 @@ def seed_providers():
             db.add(nuevo_proveedor)
 
         db.commit()
-        print("✅ Proveedores de datos insertados correctamente.")
+        log.info("✅ Proveedores de datos insertados correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar proveedores de datos: {e}")
+        log.exception("❌ Error al insertar proveedores de datos")
     finally:
         db.close()
 
@@ -1,5 +1,8 @@
 from app.core.database import SessionLocal
 from app.models.models import Deporte
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # Lista de deportes a insertar
 sports_data = [
@@ -14,7 +17,7 @@ def generar_codigo(prefix, id_num):
 def seed_sports():
     db = SessionLocal()
     try:
-        print("🏄‍♂️ Insertando deportes en la base de datos...")
+        log.info("🏄‍♂️ Insertando deportes en la base de datos...")
 
         for i, sport_data in enumerate(sports_data, start=1):
             nuevo_deporte = Deporte(
@@ -26,11 +29,11 @@ def seed_sports():
             db.add(nuevo_deporte)
 
         db.commit()
-        print("✅ Deportes insertados correctamente.")
+        log.info("✅ Deportes insertados correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar deportes: {e}")
+        log.exception("❌ Error al insertar deportes")
     finally:
         db.close()
 
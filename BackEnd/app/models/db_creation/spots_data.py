@@ -1,6 +1,9 @@
 from app.core.database import SessionLocal
 from app.models.models import Spot
 from decimal import Decimal
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # Lista de spots a insertar
 spots_data = [
@@ -20,13 +23,13 @@ def generar_codigo(prefix, id_num):
 def seed_spots():
     db = SessionLocal()
     try:
-        print("🌊 Insertando spots en la base de datos...")
+        log.info("🌊 Insertando spots en la base de datos...")
 
         for i, spot_data in enumerate(spots_data, start=1):
             codigo = generar_codigo("SPT", i)
             existing = db.query(Spot).filter(Spot.codigo == codigo).first()
             if existing:
-                print(f"ℹ️  Spot '{spot_data['nombre']}' ya existe, se omite.")
+                log.info("ℹ️ El spot ya existe, se omite", extra={"spot": spot_data["nombre"]})
                 continue
 
             nuevo_spot = Spot(
@@ -40,11 +43,11 @@ def seed_spots():
             db.add(nuevo_spot)
 
         db.commit()
-        print("✅ Spots insertados correctamente.")
+        log.info("✅ Spots insertados correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar spots: {e}")
+        log.exception("❌ Error al insertar spots")
     finally:
         db.close()
 
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.models.models import TipoVariableMeteorologica
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 DATA = [
     {"id": 1, "codigo": "VAR_UVINDEX", "nombre": "uvIndex", "unidad": "", "tipo": "numerico", "descripcion": "Índice ultravioleta instantáneo (0–11+). Valores >6 requieren protección elevada; crítico para exposición prolongada en agua."},
@@ -20,7 +23,7 @@ DATA = [
 
 def seed_tipo_variable_meteorologica(db: Session):
     try:
-        print("🌦️ Insertando tipos de variables meteorológicas en la base de datos...")
+        log.info("🌦️ Insertando tipos de variables meteorológicas en la base de datos...")
 
         for var in DATA:
             existe = db.query(TipoVariableMeteorologica).filter_by(nombre=var["nombre"]).first()
@@ -29,11 +32,11 @@ def seed_tipo_variable_meteorologica(db: Session):
                 db.add(nueva_var)
 
         db.commit()
-        print("✅ Variables meteorológicas insertadas correctamente.")
+        log.info("✅ Variables meteorológicas insertadas correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar variables meteorológicas: {e}")
+        log.exception("❌ Error al insertar variables meteorológicas")
     finally:
         db.close()
 
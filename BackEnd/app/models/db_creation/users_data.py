@@ -1,5 +1,8 @@
 from app.core.database import SessionLocal
 from app.models.models import Usuario
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # Lista de deportes a insertar
 users_data = [
@@ -15,12 +18,12 @@ users_data = [
 def seed_users():
     db = SessionLocal()
     try:
-        print("👤 Insertando usuarios en la base de datos...")
+        log.info("👤 Insertando usuarios en la base de datos...")
 
         for user_data in users_data:
             existing = db.query(Usuario).filter(Usuario.email == user_data["email"]).first()
             if existing:
-                print(f"ℹ️  Usuario {user_data['email']} ya existe, se omite.")
+                log.info("ℹ️ El usuario ya existe, se omite", extra={"email": user_data["email"]})
                 continue
 
             nuevo_usuario = Usuario(
@@ -34,11 +37,11 @@ def seed_users():
             db.add(nuevo_usuario)
 
         db.commit()
-        print("✅ Usuarios insertados correctamente.")
+        log.info("✅ Usuarios insertados correctamente.")
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"❌ Error al insertar usuarios: {e}")
+        log.exception("❌ Error al insertar usuarios")
     finally:
         db.close()
 
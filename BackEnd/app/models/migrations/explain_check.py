@@ -0,0 +1,195 @@
+# app/models/migrations/explain_check.py
+# ----------------------------------------------------------
+# Chequeo de planes de ejecución de las consultas calientes
+# - save:    guarda el EXPLAIN (FORMAT JSON) de cada consulta en un archivo
+# - compare: vuelve a explicarlas y compara contra lo guardado
+#            (costo estimado, nodos Seq Scan sobre tablas grandes, índices usados)
+#
+# Uso típico alrededor de una migración:
+#   python -m app.models.migrations.explain_check save antes.json
+#   python -m app.models.migrations.runner
+#   python -m app.models.migrations.explain_check compare antes.json
+# Con --analyze se usa EXPLAIN ANALYZE (ejecuta las consultas).
+# Sale con código 1 si alguna consulta empeoró.
+# ----------------------------------------------------------
+
+import json
+import sys
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.logging_config import get_logger
+
+log = get_logger(__name__)
+
+# Tablas que crecen con el histórico: un Seq Scan sobre ellas es una regresión
+HOT_TABLES = {"variable_meteorologica", "deporte_spot"}
+COST_TOLERANCE = 1.10  # +10% de costo estimado se considera ruido
+
+# Consultas equivalentes a las de los endpoints / servicios principales
+QUERIES = {
+    # SportsWeighting._ponderar (bloque spot × fecha)
+    "ponderacion_bloque": """
+        SELECT id_spot, fecha, id_tipo_variable, valor
+        FROM variable_meteorologica
+        WHERE id_spot IN (:id_spot) AND fecha IN (:fecha)
+    """,
+    # WeatherSummary (variables de un spot/día, la más reciente primero)
+    "resumen_spot_dia": """
+        SELECT vm.id_spot, vm.fecha, tv.nombre, vm.valor
+        FROM variable_meteorologica vm
+        JOIN tipo_variable_meteorologica tv ON vm.id_tipo_variable = tv.id
+        WHERE vm.id_spot = :id_spot AND vm.fecha = :fecha
+        ORDER BY vm.ultima_actualizacion DESC, vm.id DESC
+    """,
+    # SportsWeighting.pares_pendientes (ventana de pronóstico)
+    "pares_pendientes": """
+        SELECT vm.id_spot, vm.fecha
+        FROM variable_meteorologica vm
+        LEFT JOIN (
+            SELECT id_spot, fecha, min(ultima_actualizacion) AS ultima_actualizacion
+            FROM deporte_spot WHERE fecha >= :fecha GROUP BY id_spot, fecha
+        ) p ON p.id_spot = vm.id_spot AND p.fecha = vm.fecha
+        WHERE vm.fecha >= :fecha
+        GROUP BY vm.id_spot, vm.fecha, p.ultima_actualizacion
+        HAVING p.ultima_actualizacion IS NULL OR max(vm.ultima_actualizacion) > p.ultima_actualizacion
+    """,
+    # /spot/sportspoints
+    "sportspoints": """
+        SELECT d.nombre, ds.ponderacion
+        FROM deporte_spot ds JOIN deporte d ON d.id = ds.id_deporte
+        WHERE ds.id_spot = :id_spot AND ds.fecha = :fecha AND d.activo = true
+        ORDER BY d.nombre
+    """,
+    # /spot/list (mejor deporte por spot en un día)
+    "spot_list": """
+        SELECT s.nombre, s.lat, s.lon, r.sport, r.score
+        FROM spot s
+        LEFT JOIN (
+            SELECT ds.id_spot, d.nombre AS sport, coalesce(ds.ponderacion, 0) AS score,
+                   row_number() OVER (PARTITION BY ds.id_spot
+                                      ORDER BY coalesce(ds.ponderacion, 0) DESC, d.nombre) AS rn
+            FROM deporte_spot ds JOIN deporte d ON d.id = ds.id_deporte
+            WHERE ds.fecha = :fecha AND d.activo = true
+        ) r ON r.id_spot = s.id AND r.rn = 1
+        WHERE s.activo = true
+        ORDER BY s.id
+    """,
+    # SportsWeighting.ponderar_deporte / filtros por deporte
+    "deporte_fecha": """
+        SELECT id_spot, ponderacion
+        FROM deporte_spot
+        WHERE fecha = :fecha AND id_deporte = :id_deporte
+    """,
+    # /spot/general_weather y /spot/weather_average
+    "resumen_pk": """
+        SELECT * FROM resumen_meteorologico_diario
+        WHERE id_spot = :id_spot AND fecha = :fecha
+    """,
+}
+
+
+def _sample_params(conn) -> dict:
+    """Un spot/fecha/deporte reales para que el planner use estadísticas representativas."""
+    fila = conn.execute(text(
+        "SELECT id_spot, fecha, id_deporte FROM deporte_spot ORDER BY fecha DESC, id_spot LIMIT 1"
+    )).first()
+    if fila:
+        return {"id_spot": fila[0], "fecha": fila[1], "id_deporte": fila[2]}
+    return {"id_spot": 1, "fecha": datetime.utcnow().date(), "id_deporte": 1}
+
+
+def _walk(plan: dict, nodos: list):
+    nodos.append({
+        "node": plan.get("Node Type"),
+        "relation": plan.get("Relation Name"),
+        "index": plan.get("Index Name"),
+    })
+    for hijo in plan.get("Plans", []):
+        _walk(hijo, nodos)
+
+
+def _summarize(explain_json) -> dict:
+    raiz = explain_json[0]
+    plan = raiz["Plan"]
+    nodos = []
+    _walk(plan, nodos)
+    resumen = {
+        "total_cost": plan.get("Total Cost"),
+        "seq_scans": sorted({n["relation"] for n in nodos if n["node"] == "Seq Scan" and n["relation"]}),
+        "indexes": sorted({n["index"] for n in nodos if n["index"]}),
+        "nodes": [n["node"] for n in nodos],
+    }
+    if "Execution Time" in raiz:
+        resumen["execution_ms"] = raiz["Execution Time"]
+    return resumen
+
+
+def collect_plans(analyze: bool = False) -> dict:
+    prefijo = "EXPLAIN (ANALYZE, FORMAT JSON) " if analyze else "EXPLAIN (FORMAT JSON) "
+    planes = {}
+    with engine.connect() as conn:
+        params = _sample_params(conn)
+        for nombre, sql in QUERIES.items():
+            explain = conn.execute(text(prefijo + sql), params).scalar()
+            if isinstance(explain, str):
+                explain = json.loads(explain)
+            planes[nombre] = _summarize(explain)
+        conn.rollback()
+    return planes
+
+
+def compare_plans(antes: dict, despues: dict) -> bool:
+    """Loguea la comparación (una línea por consulta); retorna True si ninguna consulta empeoró."""
+    ok = True
+    for nombre in QUERIES:
+        a, d = antes.get(nombre), despues.get(nombre)
+        if a is None:
+            log.info("🆕 Consulta sin plan previo", extra={"consulta": nombre, "costo": d["total_cost"]})
+            continue
+
+        nuevos_seq = sorted((set(d["seq_scans"]) & HOT_TABLES) - set(a["seq_scans"]))
+        peor_costo = d["total_cost"] > a["total_cost"] * COST_TOLERANCE
+        empeoro = bool(nuevos_seq) or peor_costo
+        ok = ok and not empeoro
+
+        campos = {"consulta": nombre, "costo_antes": a["total_cost"], "costo_despues": d["total_cost"]}
+        if a["seq_scans"] != d["seq_scans"]:
+            campos.update(seq_scans_antes=a["seq_scans"], seq_scans_despues=d["seq_scans"])
+        if a["indexes"] != d["indexes"]:
+            campos.update(indices_antes=a["indexes"], indices_despues=d["indexes"])
+        if "execution_ms" in a and "execution_ms" in d:
+            campos.update(ejecucion_ms_antes=round(a["execution_ms"], 2), ejecucion_ms_despues=round(d["execution_ms"], 2))
+        if nuevos_seq:
+            campos["nuevo_seq_scan"] = nuevos_seq
+        if empeoro:
+            log.warning("❌ Plan empeorado", extra=campos)
+        else:
+            log.info("✅ Plan sin regresiones", extra=campos)
+    return ok
+
+
+def main(argv) -> int:
+    analyze = "--analyze" in argv
+    args = [a for a in argv if a != "--analyze"]
+    if len(args) != 2 or args[0] not in ("save", "compare"):
+        log.error("Uso: python -m app.models.migrations.explain_check (save|compare) <archivo.json> [--analyze]")
+        return 2
+
+    accion, ruta = args
+    planes = collect_plans(analyze)
+    if accion == "save":
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(planes, f, indent=2, default=str)
+        log.info("💾 Planes guardados", extra={"archivo": ruta, "consultas": len(planes)})
+        return 0
+
+    with open(ruta, encoding="utf-8") as f:
+        antes = json.load(f)
+    return 0 if compare_plans(antes, planes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
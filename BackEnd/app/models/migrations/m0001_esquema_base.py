@@ -0,0 +1,198 @@
+# Esquema base, escrito explícitamente (no depende de models.py: si los modelos
+# cambian, el cambio va en una migración nueva, no acá).
+# IF NOT EXISTS: en bases anteriores a las migraciones sólo crea lo que falta.
+# Las claves únicas van dentro del CREATE TABLE para no fallar con los duplicados
+# de bases viejas (los limpia 0002 y las crea 0003); los índices no únicos los
+# crea 0005 sin bloquear escrituras.
+from sqlalchemy import text
+
+ID = "0001_esquema_base"
+DESCRIPCION = "Tablas base"
+TRANSACCIONAL = True
+
+# Tablas que crea esta migración: el runner verifica que existan antes de confiar en el registro
+TABLAS = [
+    "deporte",
+    "proveedor_datos",
+    "spot",
+    "tipo_variable_meteorologica",
+    "usuario",
+    "deporte_spot",
+    "deporte_variable",
+    "negocio",
+    "resumen_meteorologico_diario",
+    "variable_meteorologica",
+    "negocio_deporte",
+]
+
+SENTENCIAS = [
+    "CREATE SEQUENCE IF NOT EXISTS deporte_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS deporte (
+        id INTEGER NOT NULL,
+        codigo VARCHAR(15) NOT NULL,
+        nombre VARCHAR(30) NOT NULL,
+        descripcion TEXT,
+        activo BOOLEAN,
+        PRIMARY KEY (id),
+        UNIQUE (codigo),
+        UNIQUE (nombre)
+    )
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS proveedor_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS proveedor_datos (
+        id INTEGER NOT NULL,
+        codigo VARCHAR(15) NOT NULL,
+        nombre VARCHAR(30) NOT NULL,
+        url_base VARCHAR(255),
+        politica_licencia TEXT,
+        PRIMARY KEY (id),
+        UNIQUE (codigo)
+    )
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS spot_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS spot (
+        id INTEGER NOT NULL,
+        codigo VARCHAR(15) NOT NULL,
+        nombre VARCHAR(30) NOT NULL,
+        tipo VARCHAR(20),
+        lat NUMERIC(10, 6) NOT NULL,
+        lon NUMERIC(10, 6) NOT NULL,
+        activo BOOLEAN,
+        PRIMARY KEY (id),
+        UNIQUE (codigo)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tipo_variable_meteorologica (
+        id SERIAL NOT NULL,
+        codigo VARCHAR(15) NOT NULL,
+        nombre VARCHAR(50) NOT NULL,
+        unidad VARCHAR(20),
+        tipo VARCHAR(20),
+        descripcion TEXT,
+        PRIMARY KEY (id),
+        UNIQUE (codigo),
+        UNIQUE (nombre)
+    )
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS usuario_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS usuario (
+        id INTEGER NOT NULL,
+        nombre VARCHAR(50) NOT NULL,
+        apellido VARCHAR(50) NOT NULL,
+        telefono VARCHAR(30),
+        email VARCHAR(100) NOT NULL,
+        hashed_password VARCHAR(255) NOT NULL,
+        tipo_usuario VARCHAR(20),
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id),
+        UNIQUE (email)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deporte_spot (
+        id SERIAL NOT NULL,
+        id_spot INTEGER NOT NULL,
+        id_deporte INTEGER NOT NULL,
+        ponderacion INTEGER,
+        fecha DATE NOT NULL,
+        ultima_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_deporte_spot_spot_fecha_deporte UNIQUE (id_spot, fecha, id_deporte),
+        FOREIGN KEY (id_spot) REFERENCES spot (id),
+        FOREIGN KEY (id_deporte) REFERENCES deporte (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deporte_variable (
+        id_deporte INTEGER NOT NULL,
+        nombre_variable VARCHAR(50) NOT NULL,
+        umbral_min NUMERIC,
+        umbral_max NUMERIC,
+        peso INTEGER,
+        estado VARCHAR(50),
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        operador VARCHAR(10),
+        PRIMARY KEY (id_deporte, nombre_variable),
+        FOREIGN KEY (id_deporte) REFERENCES deporte (id)
+    )
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS negocio_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS negocio (
+        id_negocio INTEGER NOT NULL,
+        id_dueno INTEGER NOT NULL,
+        nombre_fantasia VARCHAR(100) NOT NULL,
+        rubro VARCHAR(50),
+        sitio_web VARCHAR(255),
+        telefono VARCHAR(30),
+        email VARCHAR(100),
+        direccion VARCHAR(255),
+        lat NUMERIC(10, 6) NOT NULL,
+        lon NUMERIC(10, 6) NOT NULL,
+        horarios VARCHAR(255),
+        estado VARCHAR(9) NOT NULL,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        descripcion TEXT,
+        PRIMARY KEY (id_negocio),
+        FOREIGN KEY (id_dueno) REFERENCES usuario (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumen_meteorologico_diario (
+        id_spot INTEGER NOT NULL,
+        fecha DATE NOT NULL,
+        "uvIndex" DOUBLE PRECISION,
+        precipitation_probability DOUBLE PRECISION,
+        "precipitation_qpfCuantity" DOUBLE PRECISION,
+        wind_speed DOUBLE PRECISION,
+        "wind_gustValue" DOUBLE PRECISION,
+        "cloudCover" DOUBLE PRECISION,
+        "maxTemperature" DOUBLE PRECISION,
+        "minTemperature" DOUBLE PRECISION,
+        "feelsLikeMaxTemperature" DOUBLE PRECISION,
+        "feelsLikeMinTemperature" DOUBLE PRECISION,
+        "waterTemperature" DOUBLE PRECISION,
+        "waveHeight" DOUBLE PRECISION,
+        "wavePeriod" DOUBLE PRECISION,
+        ultima_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id_spot, fecha),
+        FOREIGN KEY (id_spot) REFERENCES spot (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS variable_meteorologica (
+        id SERIAL NOT NULL,
+        id_tipo_variable INTEGER NOT NULL,
+        id_proveedor INTEGER NOT NULL,
+        id_spot INTEGER NOT NULL,
+        fecha DATE NOT NULL,
+        valor DOUBLE PRECISION,
+        fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        ultima_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_variable_meteorologica_natural UNIQUE (id_tipo_variable, id_proveedor, id_spot, fecha),
+        FOREIGN KEY (id_tipo_variable) REFERENCES tipo_variable_meteorologica (id),
+        FOREIGN KEY (id_proveedor) REFERENCES proveedor_datos (id),
+        FOREIGN KEY (id_spot) REFERENCES spot (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS negocio_deporte (
+        id_negocio INTEGER NOT NULL,
+        id_deporte INTEGER NOT NULL,
+        PRIMARY KEY (id_negocio, id_deporte),
+        FOREIGN KEY (id_negocio) REFERENCES negocio (id_negocio),
+        FOREIGN KEY (id_deporte) REFERENCES deporte (id)
+    )
+    """,
+]
+
+
+def upgrade(conn):
+    for sentencia in SENTENCIAS:
+        conn.execute(text(sentencia))
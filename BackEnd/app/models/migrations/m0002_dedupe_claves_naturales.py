@@ -0,0 +1,32 @@
+# Elimina duplicados previos a las claves únicas (se conserva la fila más reciente)
+from sqlalchemy import text
+
+ID = "0002_dedupe_claves_naturales"
+DESCRIPCION = "Duplicados en variable_meteorologica y deporte_spot"
+TRANSACCIONAL = True
+
+
+def upgrade(conn):
+    # variable_meteorologica: una fila por (tipo, proveedor, spot, fecha)
+    conn.execute(text(
+        """
+        DELETE FROM variable_meteorologica vm
+        USING variable_meteorologica newer
+        WHERE vm.id_tipo_variable = newer.id_tipo_variable
+          AND vm.id_proveedor = newer.id_proveedor
+          AND vm.id_spot = newer.id_spot
+          AND vm.fecha = newer.fecha
+          AND vm.id < newer.id
+        """
+    ))
+    # deporte_spot: una ponderación por (spot, fecha, deporte)
+    conn.execute(text(
+        """
+        DELETE FROM deporte_spot ds
+        USING deporte_spot newer
+        WHERE ds.id_spot = newer.id_spot
+          AND ds.fecha = newer.fecha
+          AND ds.id_deporte = newer.id_deporte
+          AND ds.id < newer.id
+        """
+    ))
@@ -0,0 +1,18 @@
+# Claves únicas requeridas por los upserts ON CONFLICT de WeatherLogic y SportsWeighting
+from app.models.migrations.runner import create_index_concurrently
+
+ID = "0003_claves_naturales_unicas"
+DESCRIPCION = "Índices únicos (concurrentes) de variable_meteorologica y deporte_spot"
+TRANSACCIONAL = False
+
+
+def upgrade(conn):
+    create_index_concurrently(
+        conn, "uq_variable_meteorologica_natural", "variable_meteorologica",
+        ["id_tipo_variable", "id_proveedor", "id_spot", "fecha"], unique=True,
+    )
+    # También cubre las búsquedas por (id_spot, fecha)
+    create_index_concurrently(
+        conn, "uq_deporte_spot_spot_fecha_deporte", "deporte_spot",
+        ["id_spot", "fecha", "id_deporte"], unique=True,
+    )
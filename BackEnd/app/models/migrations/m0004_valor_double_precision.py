@@ -0,0 +1,29 @@
+# variable_meteorologica.valor: TEXT → double precision (NULL = sin dato).
+# Los textos que no son números válidos ("" incluido) quedan en NULL.
+# Reescribe la tabla: correr en una ventana de baja actividad en bases grandes.
+from sqlalchemy import text
+
+ID = "0004_valor_double_precision"
+DESCRIPCION = "variable_meteorologica.valor como double precision"
+TRANSACCIONAL = True
+
+
+def upgrade(conn):
+    tipo = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'variable_meteorologica' AND column_name = 'valor'"
+    )).scalar()
+    if tipo != "text":
+        return  # base creada con el modelo ya numérico
+
+    conn.execute(text("ALTER TABLE variable_meteorologica ALTER COLUMN valor DROP NOT NULL"))
+    conn.execute(text(
+        r"""
+        ALTER TABLE variable_meteorologica ALTER COLUMN valor TYPE double precision
+        USING (
+            CASE WHEN btrim(valor) ~ '^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$'
+                 THEN btrim(valor)::double precision
+            END
+        )
+        """
+    ))
@@ -0,0 +1,22 @@
+# Índices compuestos para los caminos calientes:
+# - variable_meteorologica por (id_spot, fecha[, id_tipo_variable]): ponderación,
+#   resumen meteorológico, borrado por spot
+# - deporte_spot por (fecha, id_deporte): /spot/list (todos los spots de un día)
+#   y re-ponderación de un deporte
+# (deporte_spot por (id_spot, fecha) ya lo cubre uq_deporte_spot_spot_fecha_deporte)
+from app.models.migrations.runner import create_index_concurrently
+
+ID = "0005_indices_consultas"
+DESCRIPCION = "Índices compuestos (concurrentes) para lecturas por spot/fecha"
+TRANSACCIONAL = False
+
+
+def upgrade(conn):
+    create_index_concurrently(
+        conn, "ix_variable_meteorologica_spot_fecha_tipo", "variable_meteorologica",
+        ["id_spot", "fecha", "id_tipo_variable"],
+    )
+    create_index_concurrently(
+        conn, "ix_deporte_spot_fecha_deporte", "deporte_spot",
+        ["fecha", "id_deporte"],
+    )
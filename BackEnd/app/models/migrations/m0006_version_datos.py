@@ -0,0 +1,21 @@
+# Versión de datos compartida por todos los workers/contenedores (una sola fila):
+# la incrementa cada transacción con escrituras y la leen las cachés de respuestas
+# (ver app/core/versioning.py)
+from sqlalchemy import text
+
+ID = "0006_version_datos"
+DESCRIPCION = "Tabla data_version (versión global de datos para las cachés)"
+TRANSACCIONAL = True
+TABLAS = ["data_version"]
+
+
+def upgrade(conn):
+    conn.execute(text(
+        """
+        CREATE TABLE IF NOT EXISTS data_version (
+            id SMALLINT PRIMARY KEY CHECK (id = 1),
+            version BIGINT NOT NULL DEFAULT 0
+        )
+        """
+    ))
+    conn.execute(text("INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING"))
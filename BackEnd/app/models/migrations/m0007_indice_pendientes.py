@@ -0,0 +1,17 @@
+# Índice para pares_pendientes / pares_pendientes_resumen (ingesta): recorren la
+# ventana de pronóstico (fecha >= ayer) agrupando por (id_spot, fecha) con
+# max(ultima_actualizacion). Con fecha adelante es un range scan sólo sobre los
+# días vigentes, y con ultima_actualizacion incluida no hace falta ir a la tabla.
+# (deporte_spot por fecha ya lo cubre ix_deporte_spot_fecha_deporte)
+from app.models.migrations.runner import create_index_concurrently
+
+ID = "0007_indice_pendientes"
+DESCRIPCION = "Índice (concurrente) de variable_meteorologica por fecha para los pares pendientes"
+TRANSACCIONAL = False
+
+
+def upgrade(conn):
+    create_index_concurrently(
+        conn, "ix_variable_meteorologica_fecha_spot_act", "variable_meteorologica",
+        ["fecha", "id_spot", "ultima_actualizacion"],
+    )
@@ -0,0 +1,190 @@
+# app/models/migrations/runner.py
+# ----------------------------------------------------------
+# Migraciones de esquema versionadas
+# - Cada archivo mNNNN_<nombre>.py de esta carpeta es una migración con:
+#     ID           → "NNNN_<nombre>" (orden de aplicación)
+#     DESCRIPCION  → texto libre
+#     TRANSACCIONAL→ False para CREATE INDEX CONCURRENTLY y similares
+#     upgrade(conn)
+#     TABLAS       → (opcional) tablas que crea
+# - Las aplicadas se registran en schema_migrations; cada corrida aplica
+#   sólo las pendientes, en orden
+# - El registro no se cree a ciegas: si falta alguna TABLAS de una migración
+#   registrada (p.ej. se borraron las tablas), esa y las siguientes se vuelven
+#   a aplicar (todas son idempotentes)
+# - Un advisory lock de Postgres evita que dos contenedores migren a la vez
+#
+# Uso: python -m app.models.migrations.runner [status]
+# ----------------------------------------------------------
+
+import importlib
+import os
+import pkgutil
+import re
+import sys
+from typing import List
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Connection
+
+from app.core.database import engine
+from app.core.logging_config import get_logger
+
+MIGRATIONS_PACKAGE = "app.models.migrations"
+MIGRATION_MODULE_RE = re.compile(r"^m(\d{4})_\w+$")
+ADVISORY_LOCK_KEY = 726_001  # arbitrario, propio de las migraciones de Nautic
+
+log = get_logger(__name__)
+
+
+# --------------------------
+# Helpers para migraciones
+# --------------------------
+def create_index_concurrently(conn: Connection, name: str, table: str, columns: List[str], unique: bool = False):
+    """
+    CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS, sin bloquear escrituras.
+    Si una corrida anterior falló a mitad de camino, Postgres deja el índice
+    marcado como INVALID: se elimina y se vuelve a construir.
+    """
+    invalido = conn.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalido:
+        log.warning("↪ Índice inválido de una corrida anterior, se reconstruye", extra={"indice": name})
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    conn.execute(text(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+        f"ON {table} ({', '.join(columns)})"
+    ))
+
+
+# --------------------------
+# Descubrimiento y registro
+# --------------------------
+def discover_migrations() -> list:
+    carpeta = os.path.dirname(__file__)
+    nombres = sorted(
+        info.name for info in pkgutil.iter_modules([carpeta]) if MIGRATION_MODULE_RE.match(info.name)
+    )
+    migraciones = [importlib.import_module(f"{MIGRATIONS_PACKAGE}.{nombre}") for nombre in nombres]
+
+    ids = [m.ID for m in migraciones]
+    if len(ids) != len(set(ids)):
+        raise RuntimeError(f"IDs de migración duplicados: {ids}")
+    return migraciones
+
+
+def _ensure_table(conn: Connection):
+    conn.execute(text(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            id VARCHAR(100) PRIMARY KEY,
+            descripcion TEXT,
+            aplicada_en TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    ))
+
+
+def applied_migrations() -> set:
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        return {row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))}
+
+
+def drop_ledger(conn: Connection):
+    """Borra el registro de migraciones (junto con las tablas, p.ej. en /test/database/drop_all)."""
+    conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+
+def _discard_missing(migraciones: list, aplicadas: set) -> set:
+    """
+    Desde la primera migración registrada a la que le falta alguna de sus TABLAS,
+    saca del registro esa y todas las siguientes, para que se vuelvan a aplicar.
+    """
+    with engine.begin() as conn:
+        existentes = set(inspect(conn).get_table_names())
+        for i, migracion in enumerate(migraciones):
+            faltantes = [t for t in getattr(migracion, "TABLAS", []) if t not in existentes]
+            if migracion.ID not in aplicadas or not faltantes:
+                continue
+            descartadas = [m.ID for m in migraciones[i:] if m.ID in aplicadas]
+            log.warning(
+                "⚠️ Migración registrada pero faltan tablas: se vuelve a aplicar",
+                extra={"migracion": migracion.ID, "faltantes": faltantes, "descartadas": descartadas},
+            )
+            conn.execute(text("DELETE FROM schema_migrations WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)), {"ids": descartadas})
+            return aplicadas - set(descartadas)
+    return aplicadas
+
+
+def _record(conn: Connection, migracion):
+    conn.execute(
+        text("INSERT INTO schema_migrations (id, descripcion) VALUES (:id, :descripcion)"),
+        {"id": migracion.ID, "descripcion": migracion.DESCRIPCION},
+    )
+
+
+def _apply(migracion):
+    if getattr(migracion, "TRANSACCIONAL", True):
+        # Todo o nada: la migración y su registro en la misma transacción
+        with engine.begin() as conn:
+            migracion.upgrade(conn)
+            _record(conn, migracion)
+        return
+
+    # CONCURRENTLY no puede correr dentro de una transacción: autocommit.
+    # Las migraciones no transaccionales deben ser idempotentes (IF NOT EXISTS),
+    # porque si fallan a mitad de camino se reintentan completas.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        migracion.upgrade(conn)
+        _record(conn, migracion)
+
+
+# --------------------------
+# Ejecución
+# --------------------------
+def run_migrations() -> List[str]:
+    """Aplica las migraciones pendientes en orden. Retorna los IDs aplicados."""
+    log.info("🛠️ Aplicando migraciones de esquema")
+    lock_conn = None
+    if engine.dialect.name == "postgresql":
+        lock_conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": ADVISORY_LOCK_KEY})
+
+    try:
+        migraciones = discover_migrations()
+        aplicadas = _discard_missing(migraciones, applied_migrations())
+        nuevas = []
+        for migracion in migraciones:
+            if migracion.ID in aplicadas:
+                continue
+            log.info("➡️ Aplicando migración", extra={"migracion": migracion.ID, "descripcion": migracion.DESCRIPCION})
+            _apply(migracion)
+            nuevas.append(migracion.ID)
+        log.info("✅ Migraciones al día", extra={"aplicadas": len(nuevas)})
+        return nuevas
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": ADVISORY_LOCK_KEY})
+            lock_conn.close()
+
+
+def print_status():
+    aplicadas = applied_migrations()
+    for migracion in discover_migrations():
+        marca = "✅" if migracion.ID in aplicadas else "⏳"
+        log.info(f"{marca} {migracion.ID}: {migracion.DESCRIPCION}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        print_status()
+    else:
+        run_migrations()
@@ -4,11 +4,14 @@ from sqlalchemy import (
     Text,
     Boolean,
     Numeric,
+    Float,
     Date,
     TIMESTAMP,
     ForeignKey,
     Integer,
+    Index,
     PrimaryKeyConstraint,
+    UniqueConstraint,
     text,
     Sequence,
     Enum
@@ -82,10 +85,19 @@ class VariableMeteorologica(Base):
     id_proveedor = Column(Integer, ForeignKey("proveedor_datos.id"), nullable=False)
     id_spot = Column(Integer, ForeignKey("spot.id"), nullable=False)
     fecha = Column(Date, nullable=False)
-    valor = Column(Text, nullable=False)
+    valor = Column(Float)  # double precision; NULL = sin dato
     fecha_creacion = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
     ultima_actualizacion = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
 
+    __table_args__ = (
+        UniqueConstraint(
+            "id_tipo_variable", "id_proveedor", "id_spot", "fecha",
+            name="uq_variable_meteorologica_natural",
+        ),
+        Index("ix_variable_meteorologica_spot_fecha_tipo", "id_spot", "fecha", "id_tipo_variable"),
+        Index("ix_variable_meteorologica_fecha_spot_act", "fecha", "id_spot", "ultima_actualizacion"),
+    )
+
     tipo_variable_rel = relationship("TipoVariableMeteorologica", back_populates="variables")
     proveedor_rel = relationship("ProveedorDatos", back_populates="variables_meteorologicas")
     spot_rel = relationship("Spot", back_populates="variables_meteorologicas")
@@ -108,6 +120,32 @@ class TipoVariableMeteorologica(Base):
     variables = relationship("VariableMeteorologica", back_populates="tipo_variable_rel")
 
 
+# ------------------------------------------------------
+# Tabla ResumenMeteorologicoDiario (modelo de lectura)
+# Último valor por (spot, fecha, variable), pivoteado en columnas numéricas.
+# La mantiene WeatherSummary a partir de variable_meteorologica.
+# ------------------------------------------------------
+class ResumenMeteorologicoDiario(Base):
+    __tablename__ = "resumen_meteorologico_diario"
+
+    id_spot = Column(Integer, ForeignKey("spot.id"), primary_key=True)
+    fecha = Column(Date, primary_key=True)
+    uvIndex = Column(Float)
+    precipitation_probability = Column(Float)
+    precipitation_qpfCuantity = Column(Float)
+    wind_speed = Column(Float)
+    wind_gustValue = Column(Float)
+    cloudCover = Column(Float)
+    maxTemperature = Column(Float)
+    minTemperature = Column(Float)
+    feelsLikeMaxTemperature = Column(Float)
+    feelsLikeMinTemperature = Column(Float)
+    waterTemperature = Column(Float)
+    waveHeight = Column(Float)
+    wavePeriod = Column(Float)
+    ultima_actualizacion = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+
+
 
 # ------------------------------------------------------
 # Tabla intermedia DeporteSpot
@@ -122,6 +160,11 @@ class DeporteSpot(Base):
     fecha = Column(Date, nullable=False)
     ultima_actualizacion = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
 
+    __table_args__ = (
+        UniqueConstraint("id_spot", "fecha", "id_deporte", name="uq_deporte_spot_spot_fecha_deporte"),
+        Index("ix_deporte_spot_fecha_deporte", "fecha", "id_deporte"),
+    )
+
     # Relaciones
     deporte = relationship("Deporte", back_populates="spots")
     spot = relationship("Spot", back_populates="deportes")
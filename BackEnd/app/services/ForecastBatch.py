@@ -0,0 +1,80 @@
+# app/services/ForecastBatch.py
+# ----------------------------------------------------------
+# Matriz de pronóstico para varios spots y días en una sola respuesta
+# - Ejes: spots × fechas × (deportes | variables), en formato columnar
+#   (los nombres de cada eje van una sola vez)
+# - 3 consultas en total, sin importar cuántos spots/días se pidan
+#   (las variables salen de resumen_meteorologico_diario)
+# - Celdas sin dato → None
+# ----------------------------------------------------------
+
+from datetime import date
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Deporte, DeporteSpot, ResumenMeteorologicoDiario, Spot
+from app.services.WeatherSummary import VARIABLES
+
+
+def build_forecast_matrix(session: Session, spot_ids: List[int], fechas: List[date]) -> dict:
+    """
+    {
+      "spots": [{"id", "name", "lat", "lon"}],   # eje 0 (spots activos, en el orden pedido)
+      "dates": ["YYYY-MM-DD", ...],              # eje 1
+      "sports": [...], "scores": [spot][fecha][deporte],
+      "variables": [...], "values": [spot][fecha][variable]
+    }
+    """
+    spots_db = {
+        s.id: s
+        for s in session.query(Spot.id, Spot.nombre, Spot.lat, Spot.lon)
+        .filter(Spot.id.in_(spot_ids), Spot.activo == True)
+        .all()
+    }
+    spots = [spots_db[i] for i in dict.fromkeys(spot_ids) if i in spots_db]
+    ids = [s.id for s in spots]
+    pos_spot = {id_spot: i for i, id_spot in enumerate(ids)}
+    pos_fecha = {f: d for d, f in enumerate(fechas)}
+
+    # Ponderaciones de deportes activos
+    ponderaciones = (
+        session.query(DeporteSpot.id_spot, DeporteSpot.fecha, Deporte.nombre, DeporteSpot.ponderacion)
+        .join(Deporte, Deporte.id == DeporteSpot.id_deporte)
+        .filter(
+            DeporteSpot.id_spot.in_(ids),
+            DeporteSpot.fecha.in_(fechas),
+            Deporte.activo == True,
+        )
+        .all()
+    ) if ids else []
+
+    # Variables del día desde el resumen pivoteado (ver WeatherSummary)
+    resumenes = (
+        session.query(ResumenMeteorologicoDiario)
+        .filter(
+            ResumenMeteorologicoDiario.id_spot.in_(ids),
+            ResumenMeteorologicoDiario.fecha.in_(fechas),
+        )
+        .all()
+    ) if ids else []
+
+    sports = sorted({nombre for _, _, nombre, _ in ponderaciones})
+    pos_sport = {n: k for k, n in enumerate(sports)}
+
+    scores = [[[None] * len(sports) for _ in fechas] for _ in ids]
+    for id_spot, fecha, nombre, ponderacion in ponderaciones:
+        scores[pos_spot[id_spot]][pos_fecha[fecha]][pos_sport[nombre]] = float(ponderacion or 0)
+
+    values = [[[None] * len(VARIABLES) for _ in fechas] for _ in ids]
+    for resumen in resumenes:
+        values[pos_spot[resumen.id_spot]][pos_fecha[resumen.fecha]] = [getattr(resumen, v) for v in VARIABLES]
+
+    return {
+        "spots": [{"id": s.id, "name": s.nombre, "lat": float(s.lat), "lon": float(s.lon)} for s in spots],
+        "dates": [f.isoformat() for f in fechas],
+        "sports": sports,
+        "scores": scores,
+        "variables": VARIABLES,
+        "values": values,
+    }
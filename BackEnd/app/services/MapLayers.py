@@ -0,0 +1,135 @@
+# app/services/MapLayers.py
+# ----------------------------------------------------------
+# Capas del mapa (spots y negocios) por viewport
+# - MapLayer: features de una capa + índice de grilla para filtrar por
+#   bounding box + clusters precomputados por nivel de zoom
+# - Clusters: celdas de grilla de ~CLUSTER_CELL_PX píxeles en pantalla
+#   con cantidad, centroide, extensión y mejor puntaje
+# - Las capas se guardan por (capa, parámetros, día UTC, versión de datos),
+#   igual que la caché de respuestas: mover el mapa no vuelve a la BD
+# ----------------------------------------------------------
+
+import threading
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.cache import ResponseCache, data_version, is_behind, served_version
+from app.core.config import CLUSTER_MAX_ZOOM, CLUSTER_CELL_PX, MAP_LAYER_CACHE_MAX_ENTRIES
+from app.services.SpatialIndex import GridIndex
+
+MAX_ZOOM = 22
+TILE_SIZE_PX = 256
+
+BBox = Tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+
+
+def cluster_cell_deg(zoom: int) -> float:
+    """Tamaño de celda (grados) equivalente a CLUSTER_CELL_PX píxeles en ese zoom."""
+    zoom = max(0, min(MAX_ZOOM, int(zoom)))
+    return CLUSTER_CELL_PX * 360.0 / (TILE_SIZE_PX * 2 ** zoom)
+
+
+class MapLayer:
+    def __init__(self, features: List[dict], score_key: Optional[str] = None):
+        self.score_key = score_key
+        self.points = GridIndex()
+        self._orden: Dict[int, int] = {}
+        for posicion, feature in enumerate(features):
+            if feature.get("lat") is None or feature.get("lon") is None:
+                continue  # sin coordenadas no se puede ubicar en el mapa
+            self.points.insert(feature["lat"], feature["lon"], feature)
+            self._orden[id(feature)] = posicion
+        self._clusters: Dict[int, GridIndex] = {}
+        self._lock = threading.Lock()
+
+    # --------------------------
+    # Clusters por zoom (se calculan una vez por capa y nivel)
+    # --------------------------
+    def _build_clusters(self, zoom: int) -> GridIndex:
+        cells = GridIndex(cluster_cell_deg(zoom))
+        grupos: Dict[Tuple[int, int], List[dict]] = {}
+        for lat, lon, feature in self.points.items():
+            grupos.setdefault(cells._cell(lat, lon), []).append(feature)
+
+        index = GridIndex(cells.cell_deg)
+        for miembros in grupos.values():
+            if len(miembros) == 1:
+                # Una celda con un solo elemento se muestra como el elemento mismo
+                index.insert(miembros[0]["lat"], miembros[0]["lon"], miembros[0])
+                continue
+            lats = [m["lat"] for m in miembros]
+            lons = [m["lon"] for m in miembros]
+            cluster = {
+                "type": "cluster",
+                "lat": sum(lats) / len(lats),
+                "lon": sum(lons) / len(lons),
+                "count": len(miembros),
+                "bbox": [min(lats), min(lons), max(lats), max(lons)],
+                "best_score": None,
+            }
+            if self.score_key:
+                puntajes = [m for m in miembros if m.get(self.score_key) is not None]
+                if puntajes:
+                    mejor = max(puntajes, key=lambda m: m[self.score_key])
+                    cluster["best_score"] = mejor[self.score_key]
+                    cluster["best_sport"] = mejor.get("best_sport")
+            index.insert(cluster["lat"], cluster["lon"], cluster)
+        return index
+
+    def clusters(self, zoom: int) -> GridIndex:
+        zoom = max(0, min(MAX_ZOOM, int(zoom)))
+        with self._lock:
+            index = self._clusters.get(zoom)
+        if index is None:
+            index = self._build_clusters(zoom)
+            with self._lock:
+                self._clusters[zoom] = index
+        return index
+
+    # --------------------------
+    # Consulta por viewport
+    # --------------------------
+    def view(self, bbox: Optional[BBox] = None, zoom: Optional[int] = None) -> List[dict]:
+        """
+        Features dentro del bbox (todo el mundo si no se pasa). Con zoom menor a
+        CLUSTER_MAX_ZOOM devuelve clusters; si no, los elementos individuales.
+        """
+        agrupar = zoom is not None and zoom < CLUSTER_MAX_ZOOM
+        index = self.clusters(zoom) if agrupar else self.points
+        if bbox is None:
+            found = index.items()
+        else:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            if min_lon <= max_lon:
+                found = index.within_bbox(min_lat, min_lon, max_lat, max_lon)
+            else:
+                # El viewport cruza el antimeridiano: dos rectángulos
+                found = index.within_bbox(min_lat, min_lon, max_lat, 180.0)
+                found += index.within_bbox(min_lat, -180.0, max_lat, max_lon)
+
+        items = [item for _, _, item in found]
+        if not agrupar:
+            # Mismo orden que el listado completo
+            items.sort(key=lambda f: self._orden[id(f)])
+        return items
+
+
+# --------------------------
+# Caché de capas
+# --------------------------
+map_layer_cache = ResponseCache(MAP_LAYER_CACHE_MAX_ENTRIES)
+
+
+async def get_layer(name: str, params: dict, builder: Callable[[], Awaitable[MapLayer]], session=None) -> MapLayer:
+    """
+    Capa precomputada para (name, params) vigente; la construye con await builder() si no existe.
+    session: la que usa el builder; si es una réplica atrasada la capa no se guarda.
+    """
+    key = (name, tuple(sorted(params.items())), datetime.utcnow().date(), data_version())
+    found, layer = map_layer_cache.get(key)
+    if not found:
+        vista = await served_version(session)
+        layer = await builder()
+        if not is_behind(vista, key[-1]):
+            map_layer_cache.set(key, layer)
+    return layer
@@ -1,12 +1,14 @@
 import arrow
-import requests
 from app.core.config import STORMGLASS_API_KEY
+from app.services.ProviderClient import provider_get
+from app.services.ProviderCache import cached_fetch
 
-start = arrow.now()
-end = start.shift(days=+5)
-
-def get_marea_conditions(lat, lon):
-    response = requests.get(
+def _fetch_marea_conditions(lat, lon):
+    # Ventana calculada en cada llamada: las revalidaciones de la caché pueden ocurrir horas después
+    start = arrow.now()
+    end = start.shift(days=+5)
+    response = provider_get(
+      'STORMGLASS',
       'https://api.stormglass.io/v2/weather/point',
       params={
         'lat': lat,
@@ -23,3 +25,6 @@ def get_marea_conditions(lat, lon):
         return response.json()
     else:
         return {"error": "Unable to fetch data"}
+
+def get_marea_conditions(lat, lon, allow_stale=True):
+    return cached_fetch("STORMGLASS", lat, lon, _fetch_marea_conditions, allow_stale=allow_stale)
@@ -0,0 +1,218 @@
+# app/services/ProviderCache.py
+# ----------------------------------------------------------
+# Caché persistente (SQLite) de respuestas de proveedores
+# - Clave: (proveedor, lat redondeada, lon redondeada)
+# - TTL por proveedor; pasado el TTL se sirve el dato viejo
+#   mientras se revalida en segundo plano (stale-while-revalidate)
+# - allow_stale=False (ingesta programada): dato fresco o consulta en
+#   línea; el dato viejo sólo se usa si el proveedor falla
+# - Tamaño acotado con desalojo LRU
+# - Una conexión SQLite por hilo (modo WAL): lecturas concurrentes sin
+#   lock global; SQLite serializa las escrituras (busy timeout)
+# ----------------------------------------------------------
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import (
+    PROVIDER_CACHE_ENABLED,
+    PROVIDER_CACHE_PATH,
+    PROVIDER_CACHE_PRECISION,
+    PROVIDER_CACHE_TTL_GOOGLE,
+    PROVIDER_CACHE_TTL_STORMGLASS,
+    PROVIDER_CACHE_STALE_SECONDS,
+    PROVIDER_CACHE_MAX_ENTRIES,
+)
+from app.core.logging_config import get_logger
+
+TTL_BY_PROVIDER = {
+    "GOOGLE": PROVIDER_CACHE_TTL_GOOGLE,
+    "STORMGLASS": PROVIDER_CACHE_TTL_STORMGLASS,
+}
+
+CacheKey = Tuple[str, str, str]
+
+log = get_logger(__name__)
+
+_lock = threading.Lock()  # sólo protege la inicialización y _revalidating
+_local = threading.local()
+_initialized = False
+_revalidating = set()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(PROVIDER_CACHE_PATH, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _conn() -> sqlite3.Connection:
+    """Conexión del hilo actual (se abre la primera vez que el hilo usa la caché)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        _init_db()
+        conn = _local.conn = _connect()
+    return conn
+
+
+def _init_db():
+    global _initialized
+    with _lock:
+        if _initialized:
+            return
+        directory = os.path.dirname(PROVIDER_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = _connect()
+        try:
+            with conn:
+                _create_schema(conn)
+        finally:
+            conn.close()
+        _initialized = True
+
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS provider_cache (
+            provider TEXT NOT NULL,
+            lat_key TEXT NOT NULL,
+            lon_key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (provider, lat_key, lon_key)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_provider_cache_last_access ON provider_cache (last_access)")
+
+
+def cache_key(provider: str, lat, lon) -> CacheKey:
+    """Redondea las coordenadas a PROVIDER_CACHE_PRECISION decimales."""
+    fmt = f"{{:.{PROVIDER_CACHE_PRECISION}f}}"
+    return provider, fmt.format(float(lat)), fmt.format(float(lon))
+
+
+def _read(key: CacheKey) -> Optional[Tuple[dict, float]]:
+    conn = _conn()
+    with conn:
+        row = conn.execute(
+            "SELECT payload, fetched_at FROM provider_cache WHERE provider = ? AND lat_key = ? AND lon_key = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE provider_cache SET last_access = ? WHERE provider = ? AND lat_key = ? AND lon_key = ?",
+            (time.time(), *key),
+        )
+    return json.loads(row[0]), row[1]
+
+
+def _write(key: CacheKey, payload: dict):
+    now = time.time()
+    conn = _conn()
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO provider_cache (provider, lat_key, lon_key, payload, fetched_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (provider, lat_key, lon_key)
+            DO UPDATE SET payload = excluded.payload, fetched_at = excluded.fetched_at, last_access = excluded.last_access
+            """,
+            (*key, json.dumps(payload), now, now),
+        )
+        # Desalojo LRU si superamos el máximo
+        (total,) = conn.execute("SELECT COUNT(*) FROM provider_cache").fetchone()
+        exceso = total - PROVIDER_CACHE_MAX_ENTRIES
+        if exceso > 0:
+            conn.execute(
+                "DELETE FROM provider_cache WHERE rowid IN "
+                "(SELECT rowid FROM provider_cache ORDER BY last_access ASC LIMIT ?)",
+                (exceso,),
+            )
+
+
+def _is_cacheable(payload) -> bool:
+    # Las respuestas de error de WeatherAPI/MareaAPI nunca se guardan
+    return isinstance(payload, dict) and "error" not in payload
+
+
+def _fetch_and_store(key: CacheKey, fetch: Callable, lat, lon) -> dict:
+    payload = fetch(lat, lon)
+    if _is_cacheable(payload):
+        _write(key, payload)
+    return payload
+
+
+def _revalidate_in_background(key: CacheKey, fetch: Callable, lat, lon):
+    with _lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def _run():
+        try:
+            _fetch_and_store(key, fetch, lat, lon)
+        except Exception as e:
+            log.warning("⚠️ Error revalidando caché de proveedor", extra={"key": key, "error": str(e)})
+        finally:
+            with _lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=_run, name=f"revalidate-{key[0]}", daemon=True).start()
+
+
+def cached_fetch(provider: str, lat, lon, fetch: Callable, allow_stale: bool = True) -> dict:
+    """
+    Devuelve la respuesta del proveedor para (lat, lon) pasando por la caché.
+    - Fresca (edad <= TTL): se sirve sin llamar al proveedor.
+    - Vencida pero dentro de PROVIDER_CACHE_STALE_SECONDS:
+        allow_stale=True → se sirve y se revalida en segundo plano.
+        allow_stale=False → se consulta al proveedor en línea; la vencida sólo
+        se sirve si el proveedor falla (excepción o respuesta de error).
+    - Ausente o demasiado vieja: se consulta al proveedor en línea.
+    """
+    if not PROVIDER_CACHE_ENABLED:
+        return fetch(lat, lon)
+
+    key = cache_key(provider, lat, lon)
+    ttl = TTL_BY_PROVIDER.get(provider, 0)
+    entry = _read(key)
+    vencida = None
+    if entry is not None:
+        payload, fetched_at = entry
+        age = time.time() - fetched_at
+        if age <= ttl:
+            return payload
+        if age <= ttl + PROVIDER_CACHE_STALE_SECONDS:
+            if allow_stale:
+                _revalidate_in_background(key, fetch, lat, lon)
+                return payload
+            vencida = payload
+
+    if vencida is None:
+        return _fetch_and_store(key, fetch, lat, lon)
+
+    try:
+        nuevo = _fetch_and_store(key, fetch, lat, lon)
+    except Exception as e:
+        log.warning("⚠️ Proveedor caído: se usa la respuesta vencida de la caché", extra={"key": key, "error": str(e)})
+        return vencida
+    if not _is_cacheable(nuevo):
+        log.warning("⚠️ Proveedor con error: se usa la respuesta vencida de la caché", extra={"key": key})
+        return vencida
+    return nuevo
+
+
+def cache_stats() -> Dict[str, int]:
+    """Cantidad de entradas por proveedor."""
+    rows = _conn().execute("SELECT provider, COUNT(*) FROM provider_cache GROUP BY provider").fetchall()
+    return {provider: count for provider, count in rows}
@@ -0,0 +1,107 @@
+# app/services/ProviderClient.py
+# ----------------------------------------------------------
+# Cliente HTTP compartido para los proveedores meteorológicos
+# - Una requests.Session por proveedor (pool de conexiones + keep-alive)
+# - Timeouts de conexión y lectura en todas las llamadas
+# - Reintentos con backoff exponencial + jitter ante 429/5xx (respeta Retry-After)
+# ----------------------------------------------------------
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import (
+    PROVIDER_CONNECT_TIMEOUT,
+    PROVIDER_READ_TIMEOUT,
+    PROVIDER_MAX_RETRIES,
+    PROVIDER_BACKOFF_BASE,
+    PROVIDER_BACKOFF_MAX,
+    PROVIDER_POOL_MAXSIZE,
+)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(provider: str) -> requests.Session:
+    """
+    Devuelve la sesión del proveedor, creándola la primera vez.
+    La sesión mantiene las conexiones TCP/TLS abiertas entre llamadas.
+    """
+    with _sessions_lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PROVIDER_POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+        return session
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Backoff exponencial con jitter completo: uniforme en [0, base * 2^attempt] acotado al máximo."""
+    cap = min(PROVIDER_BACKOFF_MAX, PROVIDER_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Interpreta el header Retry-After (segundos o fecha HTTP). None si no viene o es inválido."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def provider_get(
+    provider: str,
+    url: str,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> requests.Response:
+    """
+    GET contra un proveedor con pool, timeouts y reintentos.
+    Retorna la última respuesta obtenida; los errores de red se propagan
+    si persisten después del último reintento.
+    """
+    session = _get_session(provider)
+    timeout = (PROVIDER_CONNECT_TIMEOUT, PROVIDER_READ_TIMEOUT)
+
+    for attempt in range(PROVIDER_MAX_RETRIES + 1):
+        last_attempt = attempt == PROVIDER_MAX_RETRIES
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+            time.sleep(_backoff_seconds(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUS or last_attempt:
+            return response
+
+        wait = _retry_after_seconds(response)
+        if wait is None:
+            wait = _backoff_seconds(attempt)
+        response.close()
+        time.sleep(min(wait, PROVIDER_BACKOFF_MAX))
+
+    return response
@@ -0,0 +1,154 @@
+# app/services/SpatialIndex.py
+# ----------------------------------------------------------
+# Índice espacial en memoria (grilla de celdas lat/lon)
+# - GridIndex: buckets por celda, vecino más cercano dentro de un radio
+#   (distancia haversine) y consultas por bounding box
+# - spot_index: spots activos, se reconstruye cuando cambia la versión
+#   global de datos (escrituras confirmadas en cualquier worker o proceso)
+# ----------------------------------------------------------
+
+import asyncio
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import SPOT_LOOKUP_TOLERANCE_M, SPATIAL_INDEX_CELL_DEG
+from app.core.database import SessionLocal
+from app.core.versioning import data_version
+from app.models.models import Spot
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEG_LAT = 111320.0
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    def __init__(self, cell_deg: float = SPATIAL_INDEX_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.buckets: Dict[Tuple[int, int], List[tuple]] = {}
+        self.size = 0
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def insert(self, lat: float, lon: float, item):
+        self.buckets.setdefault(self._cell(lat, lon), []).append((lat, lon, item))
+        self.size += 1
+
+    def nearest(self, lat: float, lon: float, max_distance_m: float):
+        """Item más cercano a (lat, lon) a no más de max_distance_m metros, o None."""
+        radius_lat = max_distance_m / METERS_PER_DEG_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        radius_lon = min(180.0, radius_lat / cos_lat)
+        ci, cj = self._cell(lat, lon)
+        di = math.ceil(radius_lat / self.cell_deg)
+        dj = math.ceil(radius_lon / self.cell_deg)
+
+        best, best_dist = None, max_distance_m
+        for i in range(ci - di, ci + di + 1):
+            for j in range(cj - dj, cj + dj + 1):
+                for p_lat, p_lon, item in self.buckets.get((i, j), ()):
+                    dist = haversine_m(lat, lon, p_lat, p_lon)
+                    if dist <= best_dist:
+                        best, best_dist = item, dist
+        return best
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[tuple]:
+        """[(lat, lon, item)] dentro del rectángulo (sin cruce del antimeridiano)."""
+        i0, j0 = self._cell(min_lat, min_lon)
+        i1, j1 = self._cell(max_lat, max_lon)
+        # Con viewports muy grandes conviene recorrer los buckets existentes
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.buckets):
+            cells = [c for c in self.buckets if i0 <= c[0] <= i1 and j0 <= c[1] <= j1]
+        else:
+            cells = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+        found = []
+        for cell in cells:
+            for p_lat, p_lon, item in self.buckets.get(cell, ()):
+                if min_lat <= p_lat <= max_lat and min_lon <= p_lon <= max_lon:
+                    found.append((p_lat, p_lon, item))
+        return found
+
+    def items(self) -> List[tuple]:
+        return [entry for bucket in self.buckets.values() for entry in bucket]
+
+
+class SpotIndex:
+    """
+    Índice de spots activos, guardado junto con la versión de datos con la que se
+    armó (core/versioning.py): cuando cualquier worker o proceso confirma escrituras
+    la versión cambia y el siguiente get() lo reconstruye. Siempre se arma desde el
+    primario, nunca con la sesión (posiblemente de réplica) del request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[int, GridIndex]] = None
+        self._generation = 0  # invalidate() explícito durante una construcción
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+            self._generation += 1
+
+    def _current(self, version: int) -> Optional[GridIndex]:
+        with self._lock:
+            if self._cached is not None and self._cached[0] == version:
+                return self._cached[1]
+        return None
+
+    def get(self, session: Optional[Session] = None) -> GridIndex:
+        """session: sesión del primario a usar para construirlo (por defecto abre una propia)."""
+        version = data_version()
+        index = self._current(version)
+        if index is not None:
+            return index
+        with self._lock:
+            generation = self._generation
+
+        if session is None:
+            with SessionLocal() as propia:
+                index = self._build(propia)
+        else:
+            index = self._build(session)
+
+        # Sólo se guarda si no hubo escrituras ni invalidate() mientras se construía
+        with self._lock:
+            if data_version() == version and self._generation == generation:
+                self._cached = (version, index)
+        return index
+
+    @staticmethod
+    def _build(session: Session) -> GridIndex:
+        rows = session.query(Spot.id, Spot.nombre, Spot.lat, Spot.lon).filter(Spot.activo == True).all()
+        index = GridIndex()
+        for id_spot, nombre, lat, lon in rows:
+            entry = {"id": id_spot, "nombre": nombre, "lat": float(lat), "lon": float(lon)}
+            index.insert(entry["lat"], entry["lon"], entry)
+        return index
+
+    def nearest(self, lat: float, lon: float, max_distance_m: Optional[float] = None) -> Optional[dict]:
+        """Spot activo más cercano dentro de la tolerancia (SPOT_LOOKUP_TOLERANCE_M por defecto)."""
+        tolerance = SPOT_LOOKUP_TOLERANCE_M if max_distance_m is None else max_distance_m
+        return self.get().nearest(float(lat), float(lon), tolerance)
+
+    async def nearest_async(self, lat: float, lon: float, max_distance_m: Optional[float] = None) -> Optional[dict]:
+        """Igual que nearest() desde handlers async: si hay que construir el índice, se hace en un hilo aparte."""
+        index = self._current(data_version())
+        if index is None:
+            index = await asyncio.get_running_loop().run_in_executor(None, self.get)
+        tolerance = SPOT_LOOKUP_TOLERANCE_M if max_distance_m is None else max_distance_m
+        return index.nearest(float(lat), float(lon), tolerance)
+
+
+spot_index = SpotIndex()
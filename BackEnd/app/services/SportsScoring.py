@@ -0,0 +1,124 @@
+# app/services/SportsScoring.py
+# ----------------------------------------------------------
+# Motor de ponderación vectorizado (NumPy)
+# - Matriz de reglas: deporte × variable (umbrales, peso, operador)
+# - Tensor de valores: spot × día × variable
+# - Un solo pase calcula spot × día × deporte con las mismas
+#   fórmulas min/max/between y el mismo promedio ponderado
+#   que SportsWeighting.sports_weighting
+# ----------------------------------------------------------
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+OPERADOR_CODES = {"min": 0, "max": 1, "between": 2}  # cualquier otro operador puntúa 0
+
+
+def build_rules_matrix(reglas: Iterable, deporte_ids: Sequence[int], var_names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Arma las matrices (deporte × variable) a partir de filas DeporteVariable.
+    Aplica los mismos defaults que sports_weighting: umbral None → 0, peso None/0 → 1.
+    """
+    dep_idx = {d: i for i, d in enumerate(deporte_ids)}
+    var_idx = {v: j for j, v in enumerate(var_names)}
+    shape = (len(deporte_ids), len(var_names))
+
+    umbral_min = np.zeros(shape)
+    umbral_max = np.zeros(shape)
+    peso = np.ones(shape)
+    operador = np.full(shape, -1, dtype=np.int8)
+    presente = np.zeros(shape, dtype=bool)
+
+    for regla in reglas:
+        i = dep_idx.get(regla.id_deporte)
+        j = var_idx.get(regla.nombre_variable)
+        if i is None or j is None:
+            continue
+        umbral_min[i, j] = float(regla.umbral_min or 0)
+        umbral_max[i, j] = float(regla.umbral_max or 0)
+        peso[i, j] = float(regla.peso or 1)
+        operador[i, j] = OPERADOR_CODES.get(regla.operador, -1)
+        presente[i, j] = True
+
+    return {
+        "umbral_min": umbral_min,
+        "umbral_max": umbral_max,
+        "peso": peso,
+        "operador": operador,
+        "presente": presente,
+    }
+
+
+def build_values_tensor(rows: Iterable, spot_ids: Sequence[int], fechas: Sequence, var_names: Sequence[str]):
+    """
+    Arma el tensor (spot × día × variable) a partir de filas (id_spot, fecha, nombre_variable, valor).
+    Retorna (valores, mascara): la máscara indica qué variables existen para ese spot/día.
+    Los valores NULL se ignoran (variable sin dato), igual que en sports_weighting.
+    """
+    spot_idx = {s: i for i, s in enumerate(spot_ids)}
+    fecha_idx = {f: i for i, f in enumerate(fechas)}
+    var_idx = {v: j for j, v in enumerate(var_names)}
+    shape = (len(spot_ids), len(fechas), len(var_names))
+
+    valores = np.zeros(shape)
+    mascara = np.zeros(shape, dtype=bool)
+    for id_spot, fecha, nombre, valor in rows:
+        i = spot_idx.get(id_spot)
+        d = fecha_idx.get(fecha)
+        j = var_idx.get(nombre)
+        if i is None or d is None or j is None or valor is None:
+            continue
+        valores[i, d, j] = valor
+        mascara[i, d, j] = True
+
+    return valores, mascara
+
+
+def score_batch(reglas: Dict[str, np.ndarray], valores: np.ndarray, mascara: np.ndarray) -> np.ndarray:
+    """
+    Calcula la ponderación (spot × día × deporte) sin redondear.
+
+    Las contribuciones se acumulan variable por variable en el orden de var_names,
+    que tiene que estar ordenado por nombre: es el orden en que _ponderar_deporte
+    suma las reglas, y con el mismo orden la suma en coma flotante coincide exactamente
+    (ver tests/test_sports_scoring.py).
+    """
+    n_spots, n_dias, n_vars = valores.shape
+    n_deportes = reglas["peso"].shape[0]
+    total = np.zeros((n_spots, n_dias, n_deportes))
+    peso_total = np.zeros((n_spots, n_dias, n_deportes))
+
+    for j in range(n_vars):
+        val = valores[:, :, j][:, :, None]                 # (spot, día, 1)
+        min_v = reglas["umbral_min"][:, j][None, None, :]  # (1, 1, deporte)
+        max_v = reglas["umbral_max"][:, j][None, None, :]
+        peso = reglas["peso"][:, j][None, None, :]
+        operador = reglas["operador"][:, j][None, None, :]
+
+        with np.errstate(invalid="ignore"):
+            score_min = np.fmax(0, 100 - (val - min_v) * 10)
+            score_max = np.fmax(0, 100 - (max_v - val) * 10)
+            dentro = (min_v <= val) & (val <= max_v)
+            dist = np.minimum(np.abs(val - min_v), np.abs(val - max_v))
+            score_between = np.where(dentro, 100.0, np.fmax(0, 100 - dist * 10))
+
+        score = np.where(
+            operador == OPERADOR_CODES["min"], score_min,
+            np.where(
+                operador == OPERADOR_CODES["max"], score_max,
+                np.where(operador == OPERADOR_CODES["between"], score_between, 0.0),
+            ),
+        )
+
+        aplica = mascara[:, :, j][:, :, None] & reglas["presente"][:, j][None, None, :]
+        total += np.where(aplica, score * peso, 0.0)
+        peso_total += np.where(aplica, peso, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(peso_total != 0, total / np.where(peso_total != 0, peso_total, 1), 0.0)
+
+
+def round_scores(scores: np.ndarray) -> List:
+    """Redondeo final con round() de Python (no np.round) para coincidir exactamente con sports_weighting."""
+    return [[[round(float(x), 2) for x in por_deporte] for por_deporte in por_dia] for por_dia in scores]
@@ -1,129 +1,310 @@
-from datetime import datetime
-from requests import Session
-from app.models.models import Spot, VariableMeteorologica
-from app.models.models import Deporte, DeporteVariable, VariableMeteorologica, DeporteSpot, TipoVariableMeteorologica
-from sqlalchemy import and_, func, distinct
-from datetime import datetime
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, distinct, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.models import Spot, Deporte, DeporteVariable, VariableMeteorologica, DeporteSpot, TipoVariableMeteorologica
+from app.services.SportsScoring import build_rules_matrix, build_values_tensor, score_batch, round_scores
+from app.core.logging_config import get_logger
+from app.core.tracing import span, trace_run
 
-def sports_weighting(session: Session, id_spot: int, fecha):
+UPSERT_BATCH_SIZE = 5000
+PENDIENTES_DIAS_ATRAS = 1  # margen por husos horarios: el pronóstico de "hoy" puede tener fecha de ayer
+
+log = get_logger(__name__)
+
+# ------------------------------------------------------
+# Datos de referencia (se cargan una sola vez por corrida)
+# ------------------------------------------------------
+def cargar_contexto_ponderacion(session: Session) -> dict:
+    """
+    Carga deportes, nombres de variables y reglas en memoria.
+    3 consultas en total, sin importar cuántos spots/fechas se ponderen después.
+    """
+    deportes = session.query(Deporte.id).order_by(Deporte.id).all()
+    tipos = session.query(TipoVariableMeteorologica.id, TipoVariableMeteorologica.nombre).all()
+    reglas = session.query(DeporteVariable).all()
+
+    reglas_por_deporte: Dict[int, list] = {}
+    for regla in reglas:
+        reglas_por_deporte.setdefault(regla.id_deporte, []).append(regla)
+
+    return {
+        "deporte_ids": [d.id for d in deportes],
+        "nombre_tipo": {t.id: t.nombre for t in tipos},
+        "reglas": reglas,
+        "reglas_por_deporte": reglas_por_deporte,
+    }
+
+
+def _upsert_ponderaciones(session: Session, rows: List[dict]) -> int:
+    """
+    Upsert masivo en DeporteSpot por (id_spot, id_deporte, fecha) con
+    INSERT ... ON CONFLICT DO UPDATE. Un statement cada UPSERT_BATCH_SIZE filas.
+    """
+    por_clave = {(r["id_spot"], r["id_deporte"], r["fecha"]): r for r in rows}
+    unicas = list(por_clave.values())
+
+    for i in range(0, len(unicas), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(DeporteSpot).values(unicas[i:i + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_spot", "id_deporte", "fecha"],
+            set_={
+                "ponderacion": stmt.excluded.ponderacion,
+                "ultima_actualizacion": func.now(),
+            },
+        )
+        session.execute(stmt)
+
+    return len(unicas)
+
+
+def _ponderar_deporte(reglas: list, valores: Dict[str, float]):
+    """
+    Ponderación (0–100) de un deporte según sus reglas y los valores del día.
+    Las reglas se suman ordenadas por nombre de variable, el mismo orden que
+    usa SportsScoring.score_batch: así ambos caminos dan resultados idénticos
+    (la suma en coma flotante depende del orden).
+    """
+    ponderacion_total = 0
+    peso_total = 0
+
+    for regla in sorted(reglas, key=lambda r: r.nombre_variable):
+        nombre_var = regla.nombre_variable
+        if nombre_var not in valores:
+            continue
+
+        val = valores[nombre_var]
+        min_v = float(regla.umbral_min or 0)
+        max_v = float(regla.umbral_max or 0)
+        peso = float(regla.peso or 1)
+
+        score = 0
+        if regla.operador == "min":
+            score = max(0, 100 - (val - min_v) * 10)
+        elif regla.operador == "max":
+            score = max(0, 100 - (max_v - val) * 10)
+        elif regla.operador == "between":
+            if min_v <= val <= max_v:
+                score = 100
+            else:
+                dist = min(abs(val - min_v), abs(val - max_v))
+                score = max(0, 100 - dist * 10)
+
+        ponderacion_total += score * peso
+        peso_total += peso
+
+    # Promedio ponderado
+    return round(ponderacion_total / peso_total, 2) if peso_total else 0
+
+
+def sports_weighting(session: Session, id_spot: int, fecha, contexto: Optional[dict] = None):
     """
     Calcula la ponderación (0–100) de cada deporte para un spot en una fecha
     según las reglas definidas en DeporteVariable y los valores en VariableMeteorologica.
+    Con un contexto ya cargado (cargar_contexto_ponderacion) cuesta 2 consultas:
+    los valores del día y un único upsert.
     """
-    # 1️⃣ Obtener todos los deportes
-    deportes = session.query(Deporte).all()
-    if not deportes:
+    # 1️⃣ Reglas y deportes (reutilizados si vienen en el contexto)
+    contexto = contexto or cargar_contexto_ponderacion(session)
+    if not contexto["deporte_ids"]:
         return
 
-    # 2️⃣ Obtener variables del día para el spot
+    # 2️⃣ Obtener variables del día para el spot → {nombre_variable: valor}
     variables_dia = (
-        session.query(VariableMeteorologica)
+        session.query(VariableMeteorologica.id_tipo_variable, VariableMeteorologica.valor)
         .filter(
-            and_(
-                VariableMeteorologica.id_spot == id_spot,
-                VariableMeteorologica.fecha == fecha,
-            )
+            VariableMeteorologica.id_spot == id_spot,
+            VariableMeteorologica.fecha == fecha,
         )
         .all()
     )
 
-    # Mapear {nombre_variable: valor}
     valores = {}
-    for var in variables_dia:
-        tipo_var = session.query(TipoVariableMeteorologica).filter_by(id=var.id_tipo_variable).first()
-        if tipo_var:
-            try:
-                valores[tipo_var.nombre] = float(var.valor)
-            except ValueError:
-                continue
-
-    # 3️⃣ Calcular ponderación por deporte
-    for dep in deportes:
-        ponderacion_total = 0
-        peso_total = 0
-
-        reglas = session.query(DeporteVariable).filter(DeporteVariable.id_deporte == dep.id).all()
-
-        for regla in reglas:
-            nombre_var = regla.nombre_variable
-            if nombre_var not in valores:
-                continue
-
-            val = valores[nombre_var]
-            min_v = float(regla.umbral_min or 0)
-            max_v = float(regla.umbral_max or 0)
-            peso = float(regla.peso or 1)
-
-            score = 0
-            if regla.operador == "min":
-                score = max(0, 100 - (val - min_v) * 10)
-            elif regla.operador == "max":
-                score = max(0, 100 - (max_v - val) * 10)
-            elif regla.operador == "between":
-                if min_v <= val <= max_v:
-                    score = 100
-                else:
-                    dist = min(abs(val - min_v), abs(val - max_v))
-                    score = max(0, 100 - dist * 10)
-
-            ponderacion_total += score * peso
-            peso_total += peso
-
-        # 4️⃣ Promedio ponderado
-        ponderacion_final = round(ponderacion_total / peso_total, 2) if peso_total else 0
-
-        # 5️⃣ Insertar o actualizar en DeporteSpot
-        existing = (
-            session.query(DeporteSpot)
+    for id_tipo_variable, valor in variables_dia:
+        nombre = contexto["nombre_tipo"].get(id_tipo_variable)
+        if nombre and valor is not None:
+            valores[nombre] = valor
+
+    # 3️⃣ Calcular ponderación por deporte y guardar todo en un upsert
+    rows = [
+        {
+            "id_spot": id_spot,
+            "id_deporte": id_deporte,
+            "fecha": fecha,
+            "ponderacion": _ponderar_deporte(contexto["reglas_por_deporte"].get(id_deporte, []), valores),
+        }
+        for id_deporte in contexto["deporte_ids"]
+    ]
+    _upsert_ponderaciones(session, rows)
+
+
+def _ponderar(
+    session: Session,
+    spot_ids: List[int],
+    fechas: list,
+    pares: Optional[Set[Tuple[int, object]]] = None,
+    deporte_ids: Optional[List[int]] = None,
+) -> int:
+    """
+    Núcleo vectorizado (ver SportsScoring): pondera spot_ids × fechas × deportes
+    y guarda con un upsert por lote. Si se pasan `pares`, sólo se escriben esos
+    (id_spot, fecha); si se pasan `deporte_ids`, sólo esos deportes.
+    No hace commit. Retorna cantidad de ponderaciones escritas.
+    """
+    contexto = cargar_contexto_ponderacion(session)
+    deporte_ids = [d for d in contexto["deporte_ids"] if deporte_ids is None or d in deporte_ids]
+    if not deporte_ids or not spot_ids or not fechas:
+        return 0
+
+    # Reglas (deporte × variable) y valores (spot × día × variable).
+    # var_names ordenado: score_batch acumula en este orden, igual que _ponderar_deporte
+    var_names = sorted({r.nombre_variable for r in contexto["reglas"]})
+    with span("ponderacion.lectura") as s:
+        filas = (
+            session.query(
+                VariableMeteorologica.id_spot,
+                VariableMeteorologica.fecha,
+                VariableMeteorologica.id_tipo_variable,
+                VariableMeteorologica.valor,
+            )
             .filter(
-                and_(
-                    DeporteSpot.id_spot == id_spot,
-                    DeporteSpot.id_deporte == dep.id,
-                    DeporteSpot.fecha == fecha,
-                )
+                VariableMeteorologica.id_spot.in_(spot_ids),
+                VariableMeteorologica.fecha.in_(fechas),
             )
-            .one_or_none()
+            .all()
         )
+        s.set(rows=len(filas))
+    filas = [(id_spot, fecha, contexto["nombre_tipo"].get(id_tipo), valor) for id_spot, fecha, id_tipo, valor in filas]
 
-        if existing:
-            existing.ponderacion = ponderacion_final
-            existing.ultima_actualizacion = func.now()
-        else:
-            session.add(
-                DeporteSpot(
-                    id_spot=id_spot,
-                    id_deporte=dep.id,
-                    ponderacion=ponderacion_final,
-                    fecha=fecha,
-                    ultima_actualizacion=datetime.utcnow(),
-                )
-            )
+    with span("ponderacion.calculo", spots=len(spot_ids), fechas=len(fechas), deportes=len(deporte_ids)):
+        matriz_reglas = build_rules_matrix(contexto["reglas"], deporte_ids, var_names)
+        valores, mascara = build_values_tensor(filas, spot_ids, fechas, var_names)
+
+        # Ponderación de todo el bloque en un solo pase
+        scores = round_scores(score_batch(matriz_reglas, valores, mascara))
+
+        rows = [
+            {"id_spot": id_spot, "id_deporte": id_deporte, "fecha": fecha, "ponderacion": scores[i][d][k]}
+            for i, id_spot in enumerate(spot_ids)
+            for d, fecha in enumerate(fechas)
+            if pares is None or (id_spot, fecha) in pares
+            for k, id_deporte in enumerate(deporte_ids)
+        ]
+    with span("ponderacion.upsert", rows=len(rows)):
+        return _upsert_ponderaciones(session, rows)
+
+
+def _ponderar_y_confirmar(session: Session, **kwargs) -> int:
+    try:
+        escritas = _ponderar(session, **kwargs)
+        with span("commit", rows=escritas):
+            session.commit()
+        return escritas
+    except Exception:
+        log.exception("❌ Error guardando ponderaciones")
+        session.rollback()
+        return 0
+
+
+def inicio_ventana_pendientes() -> date:
+    """Primera fecha que miran pares_pendientes / pares_pendientes_resumen por defecto."""
+    return date.today() - timedelta(days=PENDIENTES_DIAS_ATRAS)
 
-def ponderar_todos_los_deportes(session: Session):
+
+def pares_pendientes(session: Session, desde: Optional[date] = None) -> Set[Tuple[int, object]]:
+    """
+    (id_spot, fecha) cuyas variables son más nuevas que su ponderación, o que no
+    tienen ponderación. La marca de "sucio" queda persistida en los timestamps:
+    si la ponderación incremental falla o el proceso muere después de que la
+    ingesta confirmó, la próxima corrida recupera esos pares. 1 consulta (2 sin deportes).
+    Sólo mira la ventana de pronóstico (fecha >= desde, por defecto ayer): el histórico
+    no se vuelve a ponderar y recorrerlo entero en cada corrida crece sin límite.
+    """
+    if session.query(Deporte.id).limit(1).first() is None:
+        return set()  # sin deportes no se escribe ninguna ponderación: nada pendiente
+    desde = desde or inicio_ventana_pendientes()
+
+    ponderado = (
+        session.query(
+            DeporteSpot.id_spot,
+            DeporteSpot.fecha,
+            func.min(DeporteSpot.ultima_actualizacion).label("ultima_actualizacion"),
+        )
+        .filter(DeporteSpot.fecha >= desde)
+        .group_by(DeporteSpot.id_spot, DeporteSpot.fecha)
+        .subquery()
+    )
+    filas = (
+        session.query(VariableMeteorologica.id_spot, VariableMeteorologica.fecha)
+        .outerjoin(ponderado, and_(
+            ponderado.c.id_spot == VariableMeteorologica.id_spot,
+            ponderado.c.fecha == VariableMeteorologica.fecha,
+        ))
+        .filter(VariableMeteorologica.fecha >= desde)
+        .group_by(VariableMeteorologica.id_spot, VariableMeteorologica.fecha, ponderado.c.ultima_actualizacion)
+        .having(or_(
+            ponderado.c.ultima_actualizacion.is_(None),
+            func.max(VariableMeteorologica.ultima_actualizacion) > ponderado.c.ultima_actualizacion,
+        ))
+        .all()
+    )
+    return {(id_spot, fecha) for id_spot, fecha in filas}
+
+
+def ponderar_pares(session: Session, pares: Iterable[Tuple[int, object]]) -> int:
+    """
+    Re-pondera sólo los (id_spot, fecha) indicados, típicamente los que la ingesta
+    marcó como modificados (más los pendientes de corridas anteriores, ver pares_pendientes).
+    """
+    pares = set(pares)
+    if not pares:
+        log.info("⚖️ Sin cambios meteorológicos: no hay ponderaciones para recalcular")
+        return 0
+
+    log.info("⚖️ Re-ponderando pares (spot, fecha) modificados", extra={"pares": len(pares)})
+    with trace_run("ponderacion", pares=len(pares)) as s:
+        spot_ids = sorted({id_spot for id_spot, _ in pares})
+        fechas = sorted({fecha for _, fecha in pares})
+        escritas = _ponderar_y_confirmar(session, spot_ids=spot_ids, fechas=fechas, pares=pares)
+        s.set(rows=escritas)
+    log.info("✅ Ponderación incremental finalizada", extra={"ponderaciones": escritas})
+    return escritas
+
+
+def _todos_los_spots_y_fechas(session: Session):
+    fechas = sorted(row[0] for row in session.query(distinct(VariableMeteorologica.fecha)).all())
+    spot_ids = [row[0] for row in session.query(Spot.id).order_by(Spot.id).all()]
+    return spot_ids, fechas
+
+
+def ponderar_deporte(session: Session, id_deporte: int) -> int:
+    """
+    Re-pondera un único deporte en todos los spots y fechas (p.ej. tras cambiar sus reglas).
+    """
+    log.info("⚖️ Re-ponderando deporte en todos los spots", extra={"id_deporte": id_deporte})
+    with trace_run("ponderacion_deporte", id_deporte=id_deporte) as s:
+        spot_ids, fechas = _todos_los_spots_y_fechas(session)
+        escritas = _ponderar_y_confirmar(session, spot_ids=spot_ids, fechas=fechas, deporte_ids=[id_deporte])
+        s.set(rows=escritas)
+    log.info("✅ Ponderación del deporte finalizada", extra={"id_deporte": id_deporte, "ponderaciones": escritas})
+    return escritas
+
+
+def ponderar_todos_los_deportes(session: Session) -> int:
     """
     Recorre todos los spots y fechas en VariableMeteorologica,
-    y calcula las ponderaciones deportivas para cada combinación.
-    """
-    print("⚖️ Iniciando ponderación de todos los deportes en todos los spots...")
-
-    # 1️⃣ Obtener todas las fechas registradas en VariableMeteorologica
-    fechas = [row[0] for row in session.query(distinct(VariableMeteorologica.fecha)).all()]
-    fechas = sorted(fechas)
-    print(f"📅 Fechas encontradas para procesar: {fechas}")
-
-    # 2️⃣ Obtener todos los spots
-    spots = session.query(Spot).all()
-    print(f"📍 Spots encontrados: {[s.nombre for s in spots]}")
-
-    # 3️⃣ Iterar spot x fecha
-    for spot in spots:
-        for fecha in fechas:
-            try:
-                print(f"➡️ Ponderando {spot.nombre} para {fecha}...")
-                sports_weighting(session, spot.id, fecha)
-            except Exception as e:
-                print(f"❌ Error ponderando {spot.nombre} ({fecha}): {e}")
-                session.rollback()
-
-    session.commit()
-    print("✅ Ponderación global finalizada.")
\ No newline at end of file
+    y calcula las ponderaciones deportivas para cada combinación
+    en un único pase vectorizado (ver SportsScoring).
+    Recalculo completo: sólo se usa como operación explícita de administración.
+    """
+    log.info("⚖️ Iniciando ponderación de todos los deportes en todos los spots")
+    with trace_run("ponderacion_global") as s:
+        spot_ids, fechas = _todos_los_spots_y_fechas(session)
+        log.debug("📅 Fechas a procesar", extra={"fechas": [str(f) for f in fechas]})
+        log.info("📍 Spots y fechas a ponderar", extra={"spots": len(spot_ids), "fechas": len(fechas)})
+
+        escritas = _ponderar_y_confirmar(session, spot_ids=spot_ids, fechas=fechas)
+        s.set(rows=escritas)
+    log.info("✅ Ponderación global finalizada", extra={"ponderaciones": escritas})
+    return escritas
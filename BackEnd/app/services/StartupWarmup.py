@@ -0,0 +1,113 @@
+# app/services/StartupWarmup.py
+# ----------------------------------------------------------
+# Ingesta inicial en segundo plano
+# - La API arranca y sirve lo que ya hay en la BD; la ingesta meteorológica
+#   (que también pondera los pares modificados y refresca el resumen) corre
+#   una sola vez en un hilo aparte
+# - Un advisory lock de Postgres evita que varios contenedores que arrancan
+#   a la vez consulten a los proveedores en paralelo: el que no lo obtiene
+#   no ingesta (los datos son compartidos)
+# - Si hay variables pero ninguna ponderación (p.ej. base restaurada),
+#   se hace una ponderación completa
+# - El estado se expone en /ready (separado de /health)
+# ----------------------------------------------------------
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import STARTUP_INGESTION_DELAY_SECONDS
+from app.core.database import SessionLocal, engine
+from app.core.logging_config import get_logger
+from app.models.models import DeporteSpot, VariableMeteorologica
+from app.services.SpatialIndex import spot_index
+from app.services.SportsWeighting import ponderar_todos_los_deportes
+from app.services.WeatherLogic import insert_forecast_for_all_spots
+
+ADVISORY_LOCK_KEY = 726_002  # distinto del de las migraciones (726_001)
+
+log = get_logger(__name__)
+
+# pending → running → done | failed; "other_instance" si la ingesta la hace otro contenedor;
+# "disabled" con STARTUP_INGESTION=off
+_state = {"status": "pending", "started_at": None, "finished_at": None, "error": None}
+_state_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _set(**cambios):
+    with _state_lock:
+        _state.update(cambios)
+
+
+def warmup_state() -> dict:
+    with _state_lock:
+        return dict(_state)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def has_forecast_data(session) -> bool:
+    """True si ya hay ponderaciones para servir (los endpoints públicos leen de ahí)."""
+    return session.query(DeporteSpot.id).limit(1).first() is not None
+
+
+def _ingest(session):
+    insert_forecast_for_all_spots(session)
+    if not has_forecast_data(session) and session.query(VariableMeteorologica.id).limit(1).first() is not None:
+        ponderar_todos_los_deportes(session)
+    spot_index.get(session)  # deja armado el índice espacial para el primer request
+
+
+def run_startup_ingestion():
+    """Corre la ingesta inicial una vez. Pensado para un hilo de fondo."""
+    if STARTUP_INGESTION_DELAY_SECONDS > 0:
+        time.sleep(STARTUP_INGESTION_DELAY_SECONDS)
+
+    lock_conn = None
+    try:
+        if engine.dialect.name == "postgresql":
+            lock_conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            if not lock_conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": ADVISORY_LOCK_KEY}).scalar():
+                lock_conn.close()
+                lock_conn = None
+                log.info("⏭️ Otra instancia está haciendo la ingesta inicial; se omite")
+                _set(status="other_instance", finished_at=_now())
+                return
+
+        _set(status="running", started_at=_now())
+        log.info("🌅 Ingesta inicial en segundo plano")
+        session = SessionLocal()
+        try:
+            _ingest(session)
+        finally:
+            session.close()
+        _set(status="done", finished_at=_now())
+        log.info("🌞 Ingesta inicial completada")
+    except Exception as exc:
+        _set(status="failed", finished_at=_now(), error=type(exc).__name__)  # lo publica /ready: el detalle va al log
+        log.exception("❌ Falló la ingesta inicial")
+    finally:
+        if lock_conn is not None:
+            try:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": ADVISORY_LOCK_KEY})
+            finally:
+                lock_conn.close()
+
+
+def start_background_warmup():
+    """Lanza la ingesta inicial en un hilo daemon (idempotente)."""
+    global _thread
+    if _thread is not None:
+        return
+    _thread = threading.Thread(target=run_startup_ingestion, name="startup-ingestion", daemon=True)
+    _thread.start()
+
+
+def disable_warmup():
+    _set(status="disabled")
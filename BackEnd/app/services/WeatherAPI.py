@@ -1,9 +1,22 @@
-import requests
 from app.core.config import GOOGLE_API_KEY
+from app.services.ProviderClient import provider_get
+from app.services.ProviderCache import cached_fetch
 
-def get_weather_conditions(lat, lon):
-    response = requests.get(f"https://weather.googleapis.com/v1/forecast/days:lookup?key={GOOGLE_API_KEY}&location.latitude={lat}&location.longitude={lon}&days=5")
+def _fetch_weather_conditions(lat, lon):
+    response = provider_get(
+        "GOOGLE",
+        "https://weather.googleapis.com/v1/forecast/days:lookup",
+        params={
+            "key": GOOGLE_API_KEY,
+            "location.latitude": lat,
+            "location.longitude": lon,
+            "days": 5,
+        },
+    )
     if response.status_code == 200:
         return response.json()
     else:
-        return {"error": "Unable to fetch data"}
\ No newline at end of file
+        return {"error": "Unable to fetch data"}
+
+def get_weather_conditions(lat, lon, allow_stale=True):
+    return cached_fetch("GOOGLE", lat, lon, _fetch_weather_conditions, allow_stale=allow_stale)
@@ -5,17 +5,32 @@
 # - StormGlass (horario → promedios diarios): waterTemperature, waveHeight, wavePeriod
 # ----------------------------------------------------------
 
+import asyncio
+import contextvars
 import json
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from statistics import mean
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # 🔁 Inyección de sesión (DI)
 # Ajustá el import según tu layout real (p.ej. "from app.dependencies import get_db")
-from app.core.dependencies import get_db
+from app.core.database import get_db
+from app.core.config import (
+    INGESTION_MODE,
+    INGESTION_GOOGLE_CONCURRENCY,
+    INGESTION_STORMGLASS_CONCURRENCY,
+    INGESTION_DEADLINE_SECONDS,
+    INGESTION_GRID_GOOGLE,
+    INGESTION_GRID_STORMGLASS,
+)
+from app.core.logging_config import get_logger
+from app.core.tracing import span, trace_run
 
 from app.models.models import (
     Spot,
@@ -26,7 +41,8 @@ from app.models.models import (
 
 from app.services.WeatherAPI import get_weather_conditions
 from app.services.MareaAPI import get_marea_conditions
-from app.services.SportsWeighting import ponderar_todos_los_deportes
+from app.services.SportsWeighting import pares_pendientes, ponderar_pares
+from app.services.WeatherSummary import pares_pendientes_resumen, refrescar_resumen
 
 import re
 
@@ -50,6 +66,9 @@ PROVIDER_BY_VAR = {
     "wavePeriod": "STORMGLASS",
 }
 VAR_NAMES = list(PROVIDER_BY_VAR.keys())
+UPSERT_BATCH_SIZE = 1000
+
+log = get_logger(__name__)
 
 
 # --------------------------
@@ -63,6 +82,12 @@ def _safe_get(dct, *keys, default=None):
         cur = cur[k]
     return cur
 
+def _as_float(val) -> Optional[float]:
+    try:
+        return None if val is None else float(val)
+    except (TypeError, ValueError):
+        return None
+
 def _avg(values):
     vals = [v for v in values if v is not None]
     return mean(vals) if vals else 0
@@ -84,95 +109,54 @@ def _tipo_variable_map(session: Session) -> Dict[str, int]:
     rows = session.query(TipoVariableMeteorologica).all()
     return {r.nombre: r.id for r in rows}
 
-def _upsert_variable(
-    session: Session,
-    id_tipo_variable: int,
-    id_proveedor: int,
-    id_spot: int,
-    fecha,
-    valor_text: str,
-) -> VariableMeteorologica:
-    """
-    Upsert por (id_tipo_variable, id_proveedor, id_spot, fecha).
-    """
-    existing = (
-        session.query(VariableMeteorologica)
-        .filter(
-            and_(
-                VariableMeteorologica.id_tipo_variable == id_tipo_variable,
-                VariableMeteorologica.id_proveedor == id_proveedor,
-                VariableMeteorologica.id_spot == id_spot,
-                VariableMeteorologica.fecha == fecha,
-            )
-        )
-        .one_or_none()
-    )
-    if existing:
-        existing.valor = valor_text
-        existing.ultima_actualizacion = func.now()
-        return existing
-
-    row = VariableMeteorologica(
-        id_tipo_variable=id_tipo_variable,
-        id_proveedor=id_proveedor,
-        id_spot=id_spot,
-        fecha=fecha,
-        valor=valor_text,
-    )
-    session.add(row)
-    return row
+def _upsert_variables(session: Session, rows: List[dict], dirty: Optional[Set[Tuple[int, object]]] = None) -> int:
+    """
+    Upsert masivo por (id_tipo_variable, id_proveedor, id_spot, fecha) usando
+    INSERT ... ON CONFLICT DO UPDATE. Un statement cada UPSERT_BATCH_SIZE filas.
+    Las filas cuyo valor no cambió no se tocan; los (id_spot, fecha) insertados o
+    modificados se agregan a `dirty`. Retorna cantidad de filas enviadas.
+    """
+    # Una misma clave no puede aparecer dos veces en un ON CONFLICT: gana la última
+    por_clave = {
+        (r["id_tipo_variable"], r["id_proveedor"], r["id_spot"], r["fecha"]): r
+        for r in rows
+    }
+    unicas = list(por_clave.values())
+
+    for i in range(0, len(unicas), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(VariableMeteorologica).values(unicas[i:i + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_tipo_variable", "id_proveedor", "id_spot", "fecha"],
+            set_={
+                "valor": stmt.excluded.valor,
+                "ultima_actualizacion": func.now(),
+            },
+            where=VariableMeteorologica.valor.is_distinct_from(stmt.excluded.valor),
+        ).returning(VariableMeteorologica.id_spot, VariableMeteorologica.fecha)
+        cambios = session.execute(stmt).all()
+        if dirty is not None:
+            dirty.update((id_spot, fecha) for id_spot, fecha in cambios)
+
+    return len(unicas)
 
 
 # --------------------------
-# Core (inserta en BD)
+# Parseo de respuestas de proveedores
 # --------------------------
-def insert_forecast_for_spot(session: Session, spot: Spot) -> int:
+def _parse_google_days(forecast_weather_json: dict) -> List[Tuple[str, dict]]:
     """
-    Obtiene el forecast del spot y lo inserta en variable_meteorologica.
-    Retorna cantidad de registros insertados/actualizados.
+    Google (diario) → [(YYYY-MM-DD, {variable: valor})] en el orden de forecastDays.
     """
-    # 1) Resolver lat/lon
-    lat = spot.lat
-    lon = spot.lon
-
-    # 2) Cargar mapas de tipos y proveedores
-    tipo_map = _tipo_variable_map(session)  # {nombre_variable -> id_tipo}
-    proveedor_ids = {p: _get_or_create_proveedor(session, p) for p in set(PROVIDER_BY_VAR.values())}
-
-    # 3) Consultar APIs
-    forecast_weather_json = get_weather_conditions(lat, lon)  # Google (diario)
-    forecast_marea_json = get_marea_conditions(lat, lon)      # StormGlass (horario)
-
-    # 4) Indexar horas StormGlass por fecha YYYY-MM-DD
-    horas_por_fecha: Dict[str, List[dict]] = {}
-    for hour in forecast_marea_json.get("hours", []):
-        iso = hour.get("time", "")
-        if not iso:
-            continue
-        dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
-        key = str(dt.date())
-        horas_por_fecha.setdefault(key, []).append(hour)
-
-    # 5) Recorrer días de Google y persistir variables
-    count = 0
+    days = []
     for day in forecast_weather_json.get("forecastDays", []):
         disp = day.get("displayDate", {})
         try:
             date_str = f"{disp['year']}-{disp['month']:02d}-{disp['day']:02d}"
         except Exception:
             continue
-        fecha = datetime.strptime(date_str, "%Y-%m-%d").date()
 
         daytime = day.get("daytimeForecast", {}) or {}
-
-        # Promedios StormGlass para esa fecha
-        sg_hours = horas_por_fecha.get(date_str, [])
-        avg_water_temp = _avg([_safe_get(h, "waterTemperature", "sg") for h in sg_hours])
-        avg_wave_height = _avg([_safe_get(h, "waveHeight", "sg") for h in sg_hours])
-        avg_wave_period  = _avg([_safe_get(h, "wavePeriod",  "sg") for h in sg_hours])
-
-        # Construir valores por variable (solo las definidas)
-        values = {
+        days.append((date_str, {
             "uvIndex": _safe_get(daytime, "uvIndex", default=0),
             "precipitation_probability": _safe_get(daytime, "precipitation", "probability", "percent", default=0),
             "precipitation_qpfCuantity": _safe_get(daytime, "precipitation", "qpf", "quantity", default=0),
@@ -183,12 +167,78 @@ def insert_forecast_for_spot(session: Session, spot: Spot) -> int:
             "minTemperature": _safe_get(day, "minTemperature", "degrees", default=0),
             "feelsLikeMaxTemperature": _safe_get(day, "feelsLikeMaxTemperature", "degrees", default=0),
             "feelsLikeMinTemperature": _safe_get(day, "feelsLikeMinTemperature", "degrees", default=0),
-            "waterTemperature": avg_water_temp,
-            "waveHeight": avg_wave_height,
-            "wavePeriod":  avg_wave_period,
+        }))
+    return days
+
+
+def _parse_stormglass_days(forecast_marea_json: dict) -> Dict[str, dict]:
+    """
+    StormGlass (horario) → {YYYY-MM-DD: {variable: promedio diario}}.
+    """
+    horas_por_fecha: Dict[str, List[dict]] = {}
+    for hour in forecast_marea_json.get("hours", []):
+        iso = hour.get("time", "")
+        if not iso:
+            continue
+        dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+        key = str(dt.date())
+        horas_por_fecha.setdefault(key, []).append(hour)
+
+    return {
+        date_str: {
+            "waterTemperature": _avg([_safe_get(h, "waterTemperature", "sg") for h in sg_hours]),
+            "waveHeight": _avg([_safe_get(h, "waveHeight", "sg") for h in sg_hours]),
+            "wavePeriod": _avg([_safe_get(h, "wavePeriod", "sg") for h in sg_hours]),
         }
+        for date_str, sg_hours in horas_por_fecha.items()
+    }
+
+
+# Sin horas StormGlass para una fecha, los promedios quedan en 0 (igual que _avg([]))
+_STORMGLASS_EMPTY_DAY = {"waterTemperature": 0, "waveHeight": 0, "wavePeriod": 0}
+
+FETCHERS = {
+    "GOOGLE": get_weather_conditions,
+    "STORMGLASS": get_marea_conditions,
+}
+PARSERS = {
+    "GOOGLE": _parse_google_days,
+    "STORMGLASS": _parse_stormglass_days,
+}
+
+
+def _fetch_and_parse(proveedor: str, lat, lon, allow_stale: bool = False):
+    # La ingesta programada no acepta datos vencidos de la caché (ver ProviderCache.cached_fetch)
+    with span("fetch", provider=proveedor):
+        payload = FETCHERS[proveedor](lat, lon, allow_stale=allow_stale)
+    with span("parse", provider=proveedor) as s:
+        dias = PARSERS[proveedor](payload)
+        s.set(rows=len(dias))
+    return dias
+
+
+# --------------------------
+# Core (inserta en BD)
+# --------------------------
+def _persist_forecast(
+    session: Session,
+    id_spot: int,
+    tipo_map: Dict[str, int],
+    proveedor_ids: Dict[str, int],
+    google_days: List[Tuple[str, dict]],
+    stormglass_days: Dict[str, dict],
+    dirty: Optional[Set[Tuple[int, object]]] = None,
+) -> int:
+    """
+    Combina los días ya parseados de Google y StormGlass y los persiste
+    en variable_meteorologica. Retorna cantidad de registros insertados/actualizados.
+    """
+    rows: List[dict] = []
+    for date_str, google_values in google_days:
+        fecha = datetime.strptime(date_str, "%Y-%m-%d").date()
+        values = {**google_values, **stormglass_days.get(date_str, _STORMGLASS_EMPTY_DAY)}
 
-        # Persistir cada variable
+        # Una fila por variable
         for var_name, val in values.items():
             id_tipo = tipo_map.get(var_name)
             if not id_tipo:
@@ -196,41 +246,297 @@ def insert_forecast_for_spot(session: Session, spot: Spot) -> int:
                 continue
 
             id_prov = proveedor_ids[PROVIDER_BY_VAR[var_name]]
-            valor_text = "" if val is None else f"{val}"
+            rows.append({
+                "id_tipo_variable": id_tipo,
+                "id_proveedor": id_prov,
+                "id_spot": id_spot,
+                "fecha": fecha,
+                "valor": _as_float(val),
+            })
+
+    # Persistir todo el spot en un único upsert
+    with span("upsert", spot_id=id_spot, rows=len(rows)):
+        return _upsert_variables(session, rows, dirty)
+
+
+def insert_forecast_for_spot(
+    session: Session,
+    spot: Spot,
+    dirty: Optional[Set[Tuple[int, object]]] = None,
+    allow_stale: bool = False,
+) -> int:
+    """
+    Obtiene el forecast del spot y lo inserta en variable_meteorologica.
+    Retorna cantidad de registros insertados/actualizados; los (id_spot, fecha)
+    cuyo valor cambió se agregan a `dirty`. Con allow_stale=True la caché de
+    proveedores puede responder con un dato vencido y revalidarlo en segundo plano.
+    """
+    with span("spot", spot_id=spot.id) as s:
+        # 1) Resolver lat/lon
+        lat = spot.lat
+        lon = spot.lon
+
+        # 2) Cargar mapas de tipos y proveedores
+        tipo_map = _tipo_variable_map(session)  # {nombre_variable -> id_tipo}
+        proveedor_ids = {p: _get_or_create_proveedor(session, p) for p in set(PROVIDER_BY_VAR.values())}
+
+        # 3) Consultar APIs
+        google_days = _fetch_and_parse("GOOGLE", lat, lon, allow_stale)          # Google (diario)
+        stormglass_days = _fetch_and_parse("STORMGLASS", lat, lon, allow_stale)  # StormGlass (horario)
+
+        # 4) Persistir valores diarios
+        escritas = _persist_forecast(session, spot.id, tipo_map, proveedor_ids, google_days, stormglass_days, dirty)
+        s.set(rows=escritas)
+        return escritas
+
+
+# --------------------------
+# Planificación por celdas de grilla
+# --------------------------
+GRID_RESOLUTION = {
+    "GOOGLE": INGESTION_GRID_GOOGLE,
+    "STORMGLASS": INGESTION_GRID_STORMGLASS,
+}
 
-            _upsert_variable(
-                session=session,
-                id_tipo_variable=id_tipo,
-                id_proveedor=id_prov,
-                id_spot=spot.id,
-                fecha=fecha,
-                valor_text=valor_text,
-            )
-            count += 1
 
-    return count
+def _grid_cell(spot: Spot, resolution: float) -> tuple:
+    if resolution <= 0:
+        return ("spot", spot.id)
+    return (math.floor(float(spot.lat) / resolution), math.floor(float(spot.lon) / resolution))
 
 
-def insert_forecast_for_all_spots(session: Session) -> None:
+def plan_provider_fetches(spots: List[Spot]) -> Tuple[Dict[str, Dict[tuple, dict]], Dict[str, Dict[int, tuple]]]:
     """
-    Itera todos los spots y los inserta en variable_meteorologica usando la sesión inyectada.
+    Agrupa los spots por celda de grilla de cada proveedor (GRID_RESOLUTION en grados).
+    Retorna:
+      - celdas: {proveedor: {celda: {"lat", "lon", "spot_ids"}}}, donde (lat, lon) es el
+        centroide de los spots de la celda y es el punto que se consulta al proveedor.
+      - celda_de_spot: {proveedor: {id_spot: celda}}
     """
-    print("⛅ Iniciando ingesta meteorológica para todos los spots...")
-    spots = session.query(Spot).all()
+    celdas: Dict[str, Dict[tuple, dict]] = {}
+    celda_de_spot: Dict[str, Dict[int, tuple]] = {}
+    for proveedor, resolution in GRID_RESOLUTION.items():
+        grupos: Dict[tuple, List[Spot]] = {}
+        for sp in spots:
+            grupos.setdefault(_grid_cell(sp, resolution), []).append(sp)
+
+        celdas[proveedor] = {
+            cell: {
+                "lat": round(mean(float(sp.lat) for sp in miembros), 6),
+                "lon": round(mean(float(sp.lon) for sp in miembros), 6),
+                "spot_ids": [sp.id for sp in miembros],
+            }
+            for cell, miembros in grupos.items()
+        }
+        celda_de_spot[proveedor] = {sp.id: cell for cell, miembros in grupos.items() for sp in miembros}
+    return celdas, celda_de_spot
+
+
+def _persist_spot_from_cells(
+    session: Session,
+    sp: Spot,
+    tipo_map: Dict[str, int],
+    proveedor_ids: Dict[str, int],
+    google_days,
+    stormglass_days,
+    dirty: Set[Tuple[int, object]],
+) -> bool:
+    """
+    Persiste un spot con los datos ya parseados de sus celdas (commit por spot,
+    rollback si falla). Si alguna celda terminó con error, el spot se reporta como fallido.
+    Los pares modificados sólo se agregan a `dirty` si el commit del spot fue exitoso.
+    """
+    for resultado in (google_days, stormglass_days):
+        if isinstance(resultado, Exception):
+            log.error("❌ Error en spot", extra={"spot_id": sp.id, "spot": sp.nombre, "error": str(resultado)})
+            return False
+    cambios: Set[Tuple[int, object]] = set()
+    try:
+        inserted = _persist_forecast(session, sp.id, tipo_map, proveedor_ids, google_days, stormglass_days, cambios)
+        with span("commit", spot_id=sp.id, rows=inserted):
+            session.commit()
+        dirty.update(cambios)
+        # Un evento por spot: muestreado para no inundar los logs en corridas grandes
+        log.info("✅ Spot procesado", extra={"spot_id": sp.id, "spot": sp.nombre, "upserts": inserted, "sampled": True})
+        return True
+    except Exception:
+        session.rollback()
+        log.exception("❌ Error en spot", extra={"spot_id": sp.id, "spot": sp.nombre})
+        return False
+
+
+def _resolve_reference_data(session: Session) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Tipos y proveedores se resuelven una sola vez por corrida."""
+    tipo_map = _tipo_variable_map(session)
+    proveedor_ids = {p: _get_or_create_proveedor(session, p) for p in set(PROVIDER_BY_VAR.values())}
+    session.commit()
+    return tipo_map, proveedor_ids
+
+
+def _insert_forecast_sequential(session: Session, spots: List[Spot], dirty: Set[Tuple[int, object]]) -> Dict[str, int]:
+    """
+    Modo secuencial: un spot por vez; cada celda de grilla se consulta una sola vez
+    y se reutiliza para los demás spots de la misma celda.
+    """
+    resumen = {"ok": 0, "error": 0, "vencidos": 0}
+    if not spots:
+        return resumen
+
+    tipo_map, proveedor_ids = _resolve_reference_data(session)
+    celdas, celda_de_spot = plan_provider_fetches(spots)
+    resultados: Dict[str, Dict[tuple, object]] = {p: {} for p in celdas}
+
+    def _cell_result(proveedor: str, sp: Spot):
+        cell = celda_de_spot[proveedor][sp.id]
+        if cell not in resultados[proveedor]:
+            info = celdas[proveedor][cell]
+            try:
+                resultados[proveedor][cell] = _fetch_and_parse(proveedor, info["lat"], info["lon"])
+            except Exception as e:
+                resultados[proveedor][cell] = e
+        return resultados[proveedor][cell]
+
     for sp in spots:
+        ok = _persist_spot_from_cells(
+            session, sp, tipo_map, proveedor_ids,
+            _cell_result("GOOGLE", sp), _cell_result("STORMGLASS", sp), dirty,
+        )
+        resumen["ok" if ok else "error"] += 1
+
+    resumen["fetches"] = {p: len(resultados[p]) for p in resultados}
+    return resumen
+
+
+# --------------------------
+# Ingesta concurrente (asyncio)
+# --------------------------
+async def _fetch_cell(
+    loop: asyncio.AbstractEventLoop,
+    executor: ThreadPoolExecutor,
+    semaforo: asyncio.Semaphore,
+    proveedor: str,
+    cell: tuple,
+    lat,
+    lon,
+) -> Tuple[str, tuple, object]:
+    """
+    Consulta y parsea una celda respetando el límite de concurrencia del proveedor.
+    La llamada HTTP bloqueante corre en el executor; los errores se devuelven como
+    resultado para poder atribuirlos a los spots de la celda.
+    """
+    async with semaforo:
         try:
-            inserted = insert_forecast_for_spot(session, sp)
-            session.commit()
-            print(f"✅ Spot {sp.id} ('{sp.nombre}') → {inserted} upserts.")
+            # copy_context: los spans de fetch/parse quedan dentro de la corrida actual
+            ctx = contextvars.copy_context()
+            resultado = await loop.run_in_executor(executor, ctx.run, _fetch_and_parse, proveedor, lat, lon)
         except Exception as e:
-            session.rollback()
-            print(f"❌ Error en spot {sp.id} ('{sp.nombre}'): {e}")
+            resultado = e
+    return proveedor, cell, resultado
 
-    # 🔄 Después de insertar todas las variables, ponderar deportes
-    print("⚙️ Iniciando ponderación de deportes tras completar la ingesta...")
-    ponderar_todos_los_deportes(session)
 
-    print("🏁 Ingesta completada.")
+async def insert_forecast_for_all_spots_async(
+    session: Session,
+    dirty: Set[Tuple[int, object]],
+    google_concurrency: Optional[int] = None,
+    stormglass_concurrency: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Consulta los proveedores para muchas celdas a la vez y persiste cada spot apenas
+    están listas sus dos celdas (commit por spot, rollback si ese spot falla).
+    Los spots que no terminan antes del deadline se cancelan y se reportan como vencidos.
+    """
+    # None = valor de config; un 0 explícito se respeta
+    google_concurrency = google_concurrency if google_concurrency is not None else INGESTION_GOOGLE_CONCURRENCY
+    stormglass_concurrency = stormglass_concurrency if stormglass_concurrency is not None else INGESTION_STORMGLASS_CONCURRENCY
+    deadline_seconds = deadline_seconds if deadline_seconds is not None else INGESTION_DEADLINE_SECONDS
+    if google_concurrency < 1 or stormglass_concurrency < 1:
+        raise ValueError("La concurrencia por proveedor tiene que ser al menos 1")
+
+    spots = session.query(Spot).all()
+    spots_by_id = {sp.id: sp for sp in spots}
+    resumen = {"ok": 0, "error": 0, "vencidos": 0}
+    if not spots:
+        return resumen
+
+    tipo_map, proveedor_ids = _resolve_reference_data(session)
+    celdas, celda_de_spot = plan_provider_fetches(spots)
+    resumen["fetches"] = {p: len(c) for p, c in celdas.items()}
+    procesados: Set[int] = set()
+
+    loop = asyncio.get_running_loop()
+    semaforos = {
+        "GOOGLE": asyncio.Semaphore(google_concurrency),
+        "STORMGLASS": asyncio.Semaphore(stormglass_concurrency),
+    }
+    executor = ThreadPoolExecutor(
+        max_workers=google_concurrency + stormglass_concurrency,
+        thread_name_prefix="ingesta",
+    )
+    tasks = [
+        asyncio.ensure_future(
+            _fetch_cell(loop, executor, semaforos[proveedor], proveedor, cell, info["lat"], info["lon"])
+        )
+        for proveedor, por_celda in celdas.items()
+        for cell, info in por_celda.items()
+    ]
+    resultados: Dict[str, Dict[tuple, object]] = {p: {} for p in celdas}
+
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline_seconds):
+            proveedor, cell, resultado = await next_done
+            resultados[proveedor][cell] = resultado
+
+            # Persistir los spots de esta celda cuya otra celda ya está resuelta
+            for spot_id in celdas[proveedor][cell]["spot_ids"]:
+                google_cell = celda_de_spot["GOOGLE"][spot_id]
+                stormglass_cell = celda_de_spot["STORMGLASS"][spot_id]
+                if google_cell not in resultados["GOOGLE"] or stormglass_cell not in resultados["STORMGLASS"]:
+                    continue
+                ok = _persist_spot_from_cells(
+                    session, spots_by_id[spot_id], tipo_map, proveedor_ids,
+                    resultados["GOOGLE"][google_cell], resultados["STORMGLASS"][stormglass_cell], dirty,
+                )
+                procesados.add(spot_id)
+                resumen["ok" if ok else "error"] += 1
+    except asyncio.TimeoutError:
+        vencidos = sorted(set(spots_by_id) - procesados)
+        resumen["vencidos"] = len(vencidos)
+        log.warning(
+            "⏱️ Deadline de ingesta alcanzado",
+            extra={"deadline_s": deadline_seconds, "vencidos": len(vencidos), "spot_ids": vencidos},
+        )
+    finally:
+        for t in tasks:
+            t.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return resumen
+
+
+def insert_forecast_for_all_spots(session: Session, mode: Optional[str] = None) -> None:
+    """
+    Itera todos los spots y los inserta en variable_meteorologica usando la sesión inyectada.
+    mode="async" consulta los proveedores de forma concurrente; mode="sync" va spot por spot.
+    """
+    mode = mode or INGESTION_MODE
+    with trace_run("ingesta", modo=mode) as corrida:
+        log.info("⛅ Iniciando ingesta meteorológica para todos los spots", extra={"modo": mode})
+        dirty: Set[Tuple[int, object]] = set()
+        if mode == "async":
+            resumen = asyncio.run(insert_forecast_for_all_spots_async(session, dirty))
+        else:
+            resumen = _insert_forecast_sequential(session, session.query(Spot).all(), dirty)
+        log.info("📊 Resumen ingesta", extra=resumen)
+        corrida.set(spots_ok=resumen["ok"], spots_error=resumen["error"], spots_vencidos=resumen["vencidos"], pares=len(dirty))
+
+        # 🔄 Después de insertar todas las variables, ponderar sólo los (spot, fecha) que cambiaron,
+        # más los que quedaron pendientes de una corrida anterior que falló o se cortó
+        log.info("⚙️ Iniciando ponderación de deportes tras completar la ingesta")
+        ponderar_pares(session, dirty | pares_pendientes(session))
+        refrescar_resumen(session, dirty | pares_pendientes_resumen(session))
+
+        log.info("🏁 Ingesta completada")
 
 
 # ----------------------------------------------------------
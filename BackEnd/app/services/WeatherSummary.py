@@ -0,0 +1,144 @@
+# app/services/WeatherSummary.py
+# ----------------------------------------------------------
+# Mantenimiento del modelo de lectura resumen_meteorologico_diario
+# - Una fila por (spot, fecha) con el último valor de cada variable
+#   (mismo criterio que antes usaban los endpoints: ultima_actualizacion
+#   DESC, id DESC)
+# - Refresco incremental con los pares (spot, fecha) que marcó la ingesta
+# - Reconstrucción completa para bases existentes (backfill)
+# ----------------------------------------------------------
+
+from datetime import date
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.logging_config import get_logger
+from app.core.tracing import span
+from app.models.models import ResumenMeteorologicoDiario, TipoVariableMeteorologica, VariableMeteorologica
+from app.services.SportsWeighting import inicio_ventana_pendientes
+
+UPSERT_BATCH_SIZE = 1000
+
+log = get_logger(__name__)
+
+# Columnas de variables del resumen (= nombres en tipo_variable_meteorologica)
+VARIABLES = [
+    c.name
+    for c in ResumenMeteorologicoDiario.__table__.columns
+    if c.name not in ("id_spot", "fecha", "ultima_actualizacion")
+]
+
+
+def _filas_resumen(session: Session, spot_ids: List[int], fechas: list, pares: Optional[Set[Tuple[int, object]]] = None) -> List[dict]:
+    """Pivotea variable_meteorologica → [{id_spot, fecha, variable: valor, ...}]."""
+    q = (
+        session.query(
+            VariableMeteorologica.id_spot,
+            VariableMeteorologica.fecha,
+            TipoVariableMeteorologica.nombre,
+            VariableMeteorologica.valor,
+        )
+        .join(TipoVariableMeteorologica, VariableMeteorologica.id_tipo_variable == TipoVariableMeteorologica.id)
+        .filter(TipoVariableMeteorologica.nombre.in_(VARIABLES))
+        .order_by(
+            VariableMeteorologica.ultima_actualizacion.desc(),
+            VariableMeteorologica.id.desc(),
+        )
+    )
+    if spot_ids is not None:
+        q = q.filter(VariableMeteorologica.id_spot.in_(spot_ids), VariableMeteorologica.fecha.in_(fechas))
+
+    filas = {}
+    vistos = set()
+    for id_spot, fecha, nombre, valor in q.all():
+        if pares is not None and (id_spot, fecha) not in pares:
+            continue
+        if (id_spot, fecha, nombre) in vistos:
+            continue  # ya tomamos la más reciente por el ORDER BY
+        vistos.add((id_spot, fecha, nombre))
+        fila = filas.setdefault((id_spot, fecha), {"id_spot": id_spot, "fecha": fecha, **dict.fromkeys(VARIABLES)})
+        fila[nombre] = valor
+    return list(filas.values())
+
+
+def _upsert_resumen(session: Session, rows: List[dict]) -> int:
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(ResumenMeteorologicoDiario).values(rows[i:i + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_spot", "fecha"],
+            set_={**{v: stmt.excluded[v] for v in VARIABLES}, "ultima_actualizacion": func.now()},
+        )
+        session.execute(stmt)
+    return len(rows)
+
+
+def _refrescar_y_confirmar(session: Session, *args) -> int:
+    try:
+        with span("resumen") as s:
+            escritas = _upsert_resumen(session, _filas_resumen(session, *args))
+            session.commit()
+            s.set(rows=escritas)
+        return escritas
+    except Exception:
+        log.exception("❌ Error actualizando resumen meteorológico")
+        session.rollback()
+        return 0
+
+
+def pares_pendientes_resumen(session: Session, desde: Optional[date] = None) -> Set[Tuple[int, object]]:
+    """
+    (id_spot, fecha) con variables más nuevas que su fila de resumen, o sin fila.
+    Igual que SportsWeighting.pares_pendientes: recupera los pares de una corrida
+    que confirmó la ingesta pero no llegó a refrescar el resumen (misma ventana de fechas).
+    """
+    desde = desde or inicio_ventana_pendientes()
+    resumen = ResumenMeteorologicoDiario
+    filas = (
+        session.query(VariableMeteorologica.id_spot, VariableMeteorologica.fecha)
+        .join(TipoVariableMeteorologica, VariableMeteorologica.id_tipo_variable == TipoVariableMeteorologica.id)
+        .outerjoin(resumen, and_(
+            resumen.id_spot == VariableMeteorologica.id_spot,
+            resumen.fecha == VariableMeteorologica.fecha,
+        ))
+        .filter(TipoVariableMeteorologica.nombre.in_(VARIABLES), VariableMeteorologica.fecha >= desde)
+        .group_by(VariableMeteorologica.id_spot, VariableMeteorologica.fecha, resumen.ultima_actualizacion)
+        .having(or_(
+            resumen.ultima_actualizacion.is_(None),
+            func.max(VariableMeteorologica.ultima_actualizacion) > resumen.ultima_actualizacion,
+        ))
+        .all()
+    )
+    return {(id_spot, fecha) for id_spot, fecha in filas}
+
+
+def refrescar_resumen(session: Session, pares: Iterable[Tuple[int, object]]) -> int:
+    """
+    Recalcula el resumen sólo para los (id_spot, fecha) indicados,
+    típicamente los que la ingesta marcó como modificados.
+    """
+    pares = set(pares)
+    if not pares:
+        return 0
+
+    spot_ids = sorted({id_spot for id_spot, _ in pares})
+    fechas = sorted({fecha for _, fecha in pares})
+    escritas = _refrescar_y_confirmar(session, spot_ids, fechas, pares)
+    log.info("🗂️ Resumen meteorológico actualizado", extra={"filas": escritas})
+    return escritas
+
+
+def reconstruir_resumen(session: Session) -> int:
+    """Recalcula el resumen completo desde variable_meteorologica."""
+    escritas = _refrescar_y_confirmar(session, None, None)
+    log.info("🗂️ Resumen meteorológico reconstruido", extra={"filas": escritas})
+    return escritas
+
+
+def reconstruir_resumen_si_vacio(session: Session) -> int:
+    """Backfill para bases que ya tenían datos antes de existir el resumen."""
+    if session.query(ResumenMeteorologicoDiario.id_spot).first() is not None:
+        return 0
+    return reconstruir_resumen(session)
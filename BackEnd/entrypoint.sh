@@ -15,18 +15,14 @@ while True:
         time.sleep(1)
 PY
 
-echo "[ENTRYPOINT] Creando tablas y cargando taxonomias base (scripts db_creation/*)"
+echo "[ENTRYPOINT] Aplicando migraciones y cargando taxonomias base (scripts db_creation/*)"
 # Usa tus scripts existentes, en el mismo orden del .bat
 python - <<'PY'
 import importlib
-from app.core.database import Base, engine, SessionLocal
-from app.models import models  # aseguro modelos importados para create_all
-
-Base.metadata.create_all(bind=engine)
 
 # === Orden histórico del .bat (no invento nombres) ===
 sequence = [
-    ("app.models.db_creation.create_db",              None),  # al importar ya hace create_all y loguea
+    ("app.models.db_creation.create_db",              None),  # al importar aplica las migraciones (app/models/migrations)
     ("app.models.db_creation.provider_data",          "seed_providers"),
     ("app.models.db_creation.sports_data",            "seed_sports"),
     ("app.models.db_creation.spots_data",             "seed_spots"),
@@ -56,13 +52,10 @@ for mod_name, func in sequence:
                 db.close()
 PY
 
-echo "[ENTRYPOINT] Ingestion meteorologica desde APIs (WeatherLogic)..."
-# Ejecuta TU servicio tal cual, como modulo
-python -m app.services.WeatherLogic
-
-echo "[ENTRYPOINT] Calculo/pesos por deporte (SportsWeighting)..."
-python -m app.services.SportsWeighting
-
-echo "[ENTRYPOINT] Iniciando backend..."
+# La ingesta meteorologica (y la ponderacion de lo que cambio) ya no bloquea el arranque:
+# la API sirve los datos existentes y la ingesta corre una vez en segundo plano
+# (STARTUP_INGESTION=background, ver app/services/StartupWarmup.py y /ready).
+# Para correrla a mano: python -m app.services.WeatherLogic
+echo "[ENTRYPOINT] Iniciando backend (ingesta inicial: ${STARTUP_INGESTION:-background})..."
 PORT="${BACKEND_PORT:-8000}"
 exec uvicorn app.main:app --host 0.0.0.0 --port "$PORT" --reload --reload-dir /app/app --proxy-headers --forwarded-allow-ips '*'
\ No newline at end of file
@@ -14,7 +14,7 @@ if exist "%~dp0env\Scripts\activate.bat" (
 REM 2. Ejecutar scripts de creacion en orden
 set SCRIPT_DIR=%~dp0app\models\db_creation
 
-echo Ejecutando create_db.py...
+echo Ejecutando create_db.py (migraciones de esquema)...
 py -m app.models.db_creation.create_db || goto :error
 
 echo Ejecutando provider_data.py...
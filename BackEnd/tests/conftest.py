@@ -0,0 +1,41 @@
+# tests/conftest.py
+# ----------------------------------------------------------
+# Entorno mínimo para importar la app sin Postgres ni proveedores:
+# config.py lee las variables al importarse, así que van antes que nada
+# ----------------------------------------------------------
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("PROVIDER_CACHE_ENABLED", "0")
+os.environ.setdefault("TRACE_ENABLED", "0")
+os.environ.setdefault("SQL_DEBUG_HEADERS", "1")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def engine():
+    from app.core.database import Base
+    import app.models.models  # noqa: F401  (registra las tablas en Base.metadata)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine, monkeypatch):
+    """Sesión sobre SQLite en memoria; los upserts ON CONFLICT usan el insert de SQLite."""
+    import app.services.SportsWeighting as SportsWeighting
+    import app.services.WeatherSummary as WeatherSummary
+
+    monkeypatch.setattr(SportsWeighting, "pg_insert", sqlite_insert)
+    monkeypatch.setattr(WeatherSummary, "pg_insert", sqlite_insert)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
@@ -0,0 +1,147 @@
+# tests/test_data_version.py
+# ----------------------------------------------------------
+# Versión de datos de las cachés: compartida vía tabla data_version
+# ----------------------------------------------------------
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from sqlalchemy import text
+
+import app.core.versioning as versioning
+from app.models.migrations import m0006_version_datos
+from app.models.models import Deporte
+
+
+@pytest.fixture(autouse=True)
+def estado_limpio(monkeypatch):
+    monkeypatch.setattr(versioning, "_data_version", 0)
+    monkeypatch.setattr(versioning, "_shared", False)
+    monkeypatch.setattr(versioning, "_offset", 0)
+    monkeypatch.setattr(versioning, "_table_exists", None)
+    monkeypatch.setattr(versioning, "_table_checked_at", 0.0)
+    monkeypatch.setattr(versioning, "_poller", object())  # sin hilo: el poll se llama a mano
+
+
+@pytest.fixture
+def tabla(engine):
+    with engine.begin() as conn:
+        m0006_version_datos.upgrade(conn)
+
+
+def _version_bd(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+
+
+def test_sin_tabla_el_contador_es_local(engine, session):
+    assert versioning._read_shared_version(engine) is None
+
+    session.add(Deporte(id=1, codigo="KITE", nombre="Kitesurf"))
+    session.commit()
+    assert versioning.data_version() == 1
+
+
+def test_escrituras_incrementan_la_version_en_la_bd(engine, session, tabla):
+    versioning._observe(versioning._read_shared_version(engine))
+    inicial = versioning.data_version()
+
+    session.add(Deporte(id=1, codigo="KITE", nombre="Kitesurf"))  # pendiente: se flushea en el commit
+    session.commit()
+    assert _version_bd(engine) == 1
+    assert versioning.data_version() == inicial + 1
+
+    session.query(Deporte).all()
+    session.commit()  # sin escrituras: no cambia
+    assert _version_bd(engine) == 1
+
+    session.add(Deporte(id=2, codigo="SURF", nombre="Surf"))
+    session.flush()
+    session.rollback()
+    assert _version_bd(engine) == 1
+    assert versioning.data_version() == inicial + 1
+
+
+def test_escribe_la_version_sin_haberla_leido_nunca(engine, session, tabla):
+    # Primer request de un worker = un POST de admin: el poll todavía no corrió
+    session.add(Deporte(id=1, codigo="KITE", nombre="Kitesurf"))
+    session.commit()
+    assert _version_bd(engine) == 1
+
+
+def test_ve_las_escrituras_de_otro_worker(engine, tabla):
+    versioning._observe(versioning._read_shared_version(engine))
+    inicial = versioning.data_version()
+
+    with engine.begin() as conn:  # otro proceso confirmó escrituras
+        conn.execute(text("UPDATE data_version SET version = version + 1 WHERE id = 1"))
+    versioning._observe(versioning._read_shared_version(engine))
+
+    assert versioning.data_version() == inicial + 1
+
+
+def test_pasar_de_local_a_compartida_no_repite_versiones(engine, session, tabla, monkeypatch):
+    monkeypatch.setattr(versioning, "_table_exists", False)
+    monkeypatch.setattr(versioning, "_table_checked_at", float("inf"))
+    session.add(Deporte(id=1, codigo="KITE", nombre="Kitesurf"))
+    session.commit()  # todavía sin detectar la tabla: contador local
+    local = versioning.data_version()
+
+    versioning._observe(versioning._read_shared_version(engine))
+    assert versioning.data_version() > local
+
+
+def test_proceso_que_no_importa_la_cache_tambien_incrementa(tmp_path):
+    # Como el CLI de ingesta (python -m app.services.WeatherLogic): sólo usa app.core.database
+    db = tmp_path / "cli.db"
+    script = textwrap.dedent(
+        """
+        import sys
+        from sqlalchemy import text
+        from app.core.database import Base, SessionLocal, engine
+        from app.models.models import Deporte
+        from app.models.migrations import m0006_version_datos
+
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            m0006_version_datos.upgrade(conn)
+
+        session = SessionLocal()
+        session.add(Deporte(id=1, codigo="KITE", nombre="Kitesurf"))
+        session.commit()
+        assert "app.core.cache" not in sys.modules
+        with engine.connect() as conn:
+            print(conn.execute(text("SELECT version FROM data_version")).scalar())
+        """
+    )
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db}", "PYTHONPATH": raiz, "LOG_LEVEL": "WARNING"}
+    salida = subprocess.run([sys.executable, "-c", script], env=env, cwd=raiz, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip().splitlines()[-1] == "1"
+
+
+def test_no_guarda_respuestas_de_una_replica_atrasada(engine, session, tabla, monkeypatch):
+    import app.core.cache as cache
+
+    monkeypatch.setattr(cache, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "response_cache", cache.ResponseCache(10))
+    llamadas = []
+
+    @cache.cached_route("test/replica")
+    def handler(day: int, db=None):
+        llamadas.append(day)
+        return {"day": day}
+
+    versioning._observe(3)  # el poll ya vio la versión 3 en el primario; esta "réplica" sigue en 0
+    handler(day=1, db=session)
+    handler(day=1, db=session)
+    assert len(llamadas) == 2
+
+    with engine.begin() as conn:  # la réplica se pone al día
+        conn.execute(text("UPDATE data_version SET version = 3 WHERE id = 1"))
+    session.rollback()
+    handler(day=1, db=session)
+    handler(day=1, db=session)
+    assert len(llamadas) == 3
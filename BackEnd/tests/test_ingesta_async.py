@@ -0,0 +1,50 @@
+# tests/test_ingesta_async.py
+# ----------------------------------------------------------
+# Parámetros explícitos de la ingesta concurrente (un 0 no es "usar el default")
+# y reporte de los spots que no llegan al deadline
+# ----------------------------------------------------------
+import asyncio
+import logging
+import threading
+
+import pytest
+
+import app.services.WeatherLogic as WeatherLogic
+from app.models.models import Spot
+
+
+@pytest.fixture
+def spots(session):
+    session.add_all([
+        Spot(id=i, codigo=f"S{i}", nombre=f"Spot {i}", lat=-38 - i, lon=-57.5 - i)
+        for i in (3, 7, 9)
+    ])
+    session.commit()
+
+
+@pytest.fixture
+def proveedor_colgado(monkeypatch):
+    liberar = threading.Event()
+
+    def colgado(lat, lon, allow_stale=False):
+        liberar.wait(5)
+        return {}
+
+    monkeypatch.setattr(WeatherLogic, "FETCHERS", {"GOOGLE": colgado, "STORMGLASS": colgado})
+    yield
+    liberar.set()
+
+
+def test_deadline_cero_vence_todos_y_loguea_los_ids(session, spots, proveedor_colgado, caplog):
+    with caplog.at_level(logging.WARNING, logger=WeatherLogic.__name__):
+        resumen = asyncio.run(WeatherLogic.insert_forecast_for_all_spots_async(session, set(), deadline_seconds=0))
+
+    assert resumen["vencidos"] == 3 and resumen["ok"] == 0
+    (registro,) = [r for r in caplog.records if "Deadline" in r.getMessage()]
+    assert registro.spot_ids == [3, 7, 9]
+    assert registro.deadline_s == 0
+
+
+def test_concurrencia_cero_es_un_error(session, spots):
+    with pytest.raises(ValueError):
+        asyncio.run(WeatherLogic.insert_forecast_for_all_spots_async(session, set(), google_concurrency=0))
@@ -0,0 +1,66 @@
+# tests/test_migrations.py
+# ----------------------------------------------------------
+# Registro de migraciones: no se confía en él si faltan las tablas
+# ----------------------------------------------------------
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+import app.models.migrations.runner as runner
+from app.core.database import Base
+from app.models.migrations import m0001_esquema_base
+
+
+def _migracion(id_, tablas=()):
+    return SimpleNamespace(ID=id_, DESCRIPCION=id_, TABLAS=list(tablas))
+
+
+def _registradas(engine):
+    with engine.begin() as conn:
+        return {row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))}
+
+
+def test_esquema_base_cubre_todas_las_tablas_del_modelo():
+    import app.models.models  # noqa: F401
+
+    assert set(m0001_esquema_base.TABLAS) == set(Base.metadata.tables)
+    ddl = " ".join(m0001_esquema_base.SENTENCIAS)
+    for tabla in m0001_esquema_base.TABLAS:
+        assert f"CREATE TABLE IF NOT EXISTS {tabla} (" in ddl
+
+
+def test_descarta_registro_si_faltan_tablas(engine, monkeypatch):
+    monkeypatch.setattr(runner, "engine", engine)
+    migraciones = [
+        _migracion("0001_base", ["spot", "no_existe"]),
+        _migracion("0002_datos"),
+        _migracion("0003_otra", ["deporte"]),
+    ]
+    with engine.begin() as conn:
+        runner._ensure_table(conn)
+        for m in migraciones:
+            runner._record(conn, m)
+
+    aplicadas = runner._discard_missing(migraciones, _registradas(engine))
+
+    assert aplicadas == set()
+    assert _registradas(engine) == set()
+
+
+def test_registro_coherente_no_se_toca(engine, monkeypatch):
+    monkeypatch.setattr(runner, "engine", engine)
+    migraciones = [_migracion("0001_base", ["spot", "deporte"]), _migracion("0002_datos")]
+    with engine.begin() as conn:
+        runner._ensure_table(conn)
+        runner._record(conn, migraciones[0])
+
+    assert runner._discard_missing(migraciones, {"0001_base"}) == {"0001_base"}
+    assert _registradas(engine) == {"0001_base"}
+
+
+def test_drop_ledger(engine):
+    with engine.begin() as conn:
+        runner._ensure_table(conn)
+        runner.drop_ledger(conn)
+    with engine.begin() as conn:
+        assert "schema_migrations" not in {r[0] for r in conn.execute(text("SELECT name FROM sqlite_master"))}
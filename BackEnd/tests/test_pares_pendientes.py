@@ -0,0 +1,90 @@
+# tests/test_pares_pendientes.py
+# ----------------------------------------------------------
+# Los pares (spot, fecha) sin ponderar / sin resumen se detectan desde la BD,
+# aunque se haya perdido el set en memoria de la ingesta
+# ----------------------------------------------------------
+from datetime import date, datetime, timedelta, timezone
+
+from app.models.models import (
+    Deporte,
+    DeporteSpot,
+    ProveedorDatos,
+    ResumenMeteorologicoDiario,
+    Spot,
+    TipoVariableMeteorologica,
+    VariableMeteorologica,
+)
+from app.services.SportsWeighting import pares_pendientes, ponderar_pares
+from app.services.WeatherSummary import pares_pendientes_resumen, refrescar_resumen
+
+HOY = date(2026, 10, 18)
+T0 = datetime(2026, 10, 18, 6, 0, tzinfo=timezone.utc)
+
+
+def _cargar(session):
+    session.add_all([
+        Deporte(id=1, codigo="KITE", nombre="Kitesurf"),
+        Spot(id=1, codigo="PG", nombre="Playa Grande", lat=-38.0, lon=-57.5),
+        Spot(id=2, codigo="WK", nombre="Waikiki", lat=-38.1, lon=-57.6),
+        ProveedorDatos(id=1, codigo="GOOGLE", nombre="Google"),
+        TipoVariableMeteorologica(id=1, codigo="WS", nombre="wind_speed"),
+    ])
+    for id_spot in (1, 2):
+        for d in range(2):
+            session.add(VariableMeteorologica(
+                id_tipo_variable=1, id_proveedor=1, id_spot=id_spot,
+                fecha=HOY + timedelta(days=d), valor=15.0, ultima_actualizacion=T0,
+            ))
+    session.commit()
+
+
+def _marcar(session, modelo, ts):
+    session.query(modelo).update({modelo.ultima_actualizacion: ts})
+    session.commit()
+
+
+def test_sin_ponderar_ni_resumen_todo_pendiente(session):
+    _cargar(session)
+    todos = {(s, HOY + timedelta(days=d)) for s in (1, 2) for d in range(2)}
+    assert pares_pendientes(session, HOY) == todos
+    assert pares_pendientes_resumen(session, HOY) == todos
+
+
+def test_variable_mas_nueva_que_la_ponderacion(session):
+    _cargar(session)
+    ponderar_pares(session, pares_pendientes(session, HOY))
+    refrescar_resumen(session, pares_pendientes_resumen(session, HOY))
+    _marcar(session, DeporteSpot, T0 + timedelta(minutes=5))
+    _marcar(session, ResumenMeteorologicoDiario, T0 + timedelta(minutes=5))
+    assert pares_pendientes(session, HOY) == set()
+    assert pares_pendientes_resumen(session, HOY) == set()
+
+    # La ingesta confirmó un cambio pero el proceso murió antes de ponderar
+    session.query(VariableMeteorologica).filter(
+        VariableMeteorologica.id_spot == 2, VariableMeteorologica.fecha == HOY,
+    ).update({VariableMeteorologica.valor: 30.0, VariableMeteorologica.ultima_actualizacion: T0 + timedelta(minutes=10)})
+    session.commit()
+
+    assert pares_pendientes(session, HOY) == {(2, HOY)}
+    assert pares_pendientes_resumen(session, HOY) == {(2, HOY)}
+
+
+def test_sin_deportes_no_hay_pendientes(session):
+    _cargar(session)
+    session.query(Deporte).delete()
+    session.commit()
+    assert pares_pendientes(session, HOY) == set()
+
+
+def test_el_historico_fuera_de_la_ventana_no_se_revisa(session):
+    _cargar(session)
+    session.add(VariableMeteorologica(
+        id_tipo_variable=1, id_proveedor=1, id_spot=1,
+        fecha=HOY - timedelta(days=30), valor=10.0, ultima_actualizacion=T0,
+    ))
+    session.commit()
+
+    manana = HOY + timedelta(days=1)
+    assert pares_pendientes(session, manana) == {(1, manana), (2, manana)}
+    assert pares_pendientes_resumen(session, manana) == {(1, manana), (2, manana)}
+    assert (1, HOY - timedelta(days=30)) not in pares_pendientes(session, HOY)
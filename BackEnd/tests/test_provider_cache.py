@@ -0,0 +1,101 @@
+# tests/test_provider_cache.py
+# ----------------------------------------------------------
+# Caché de proveedores: stale-while-revalidate sólo cuando se permite,
+# y acceso concurrente desde varios hilos (una conexión por hilo)
+# ----------------------------------------------------------
+import threading
+import time
+
+import pytest
+
+import app.services.ProviderCache as ProviderCache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ProviderCache, "PROVIDER_CACHE_ENABLED", True)
+    monkeypatch.setattr(ProviderCache, "PROVIDER_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(ProviderCache, "PROVIDER_CACHE_STALE_SECONDS", 3600)
+    monkeypatch.setattr(ProviderCache, "TTL_BY_PROVIDER", {"GOOGLE": 60})
+    monkeypatch.setattr(ProviderCache, "_local", threading.local())
+    monkeypatch.setattr(ProviderCache, "_initialized", False)
+
+
+def _vencer(segundos: float):
+    conn = ProviderCache._conn()
+    with conn:
+        conn.execute("UPDATE provider_cache SET fetched_at = fetched_at - ?", (segundos,))
+
+
+class Proveedor:
+    def __init__(self):
+        self.llamadas = 0
+        self.respuesta = {"version": 1}
+
+    def __call__(self, lat, lon):
+        self.llamadas += 1
+        if isinstance(self.respuesta, Exception):
+            raise self.respuesta
+        return self.respuesta
+
+
+def test_fresca_no_consulta_al_proveedor():
+    proveedor = Proveedor()
+    assert ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor, allow_stale=False) == {"version": 1}
+    assert ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor, allow_stale=False) == {"version": 1}
+    assert proveedor.llamadas == 1
+
+
+def test_sin_stale_consulta_en_linea():
+    proveedor = Proveedor()
+    ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor)
+    _vencer(120)
+    proveedor.respuesta = {"version": 2}
+
+    assert ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor, allow_stale=False) == {"version": 2}
+    assert proveedor.llamadas == 2
+
+
+@pytest.mark.parametrize("falla", [RuntimeError("timeout"), {"error": "Unable to fetch data"}])
+def test_sin_stale_usa_la_vencida_si_el_proveedor_falla(falla):
+    proveedor = Proveedor()
+    ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor)
+    _vencer(120)
+    proveedor.respuesta = falla
+
+    assert ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor, allow_stale=False) == {"version": 1}
+
+
+def test_con_stale_sirve_la_vencida_y_revalida():
+    proveedor = Proveedor()
+    ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor)
+    _vencer(120)
+    proveedor.respuesta = {"version": 2}
+
+    assert ProviderCache.cached_fetch("GOOGLE", -38, -57.5, proveedor) == {"version": 1}
+    limite = time.time() + 5
+    while ProviderCache._read(ProviderCache.cache_key("GOOGLE", -38, -57.5))[0] != {"version": 2}:
+        assert time.time() < limite, "la revalidación en segundo plano no terminó"
+        time.sleep(0.01)
+
+
+def test_acceso_concurrente_desde_varios_hilos():
+    errores = []
+
+    def trabajar(i):
+        try:
+            for j in range(20):
+                lat = -38 - (i * 20 + j) / 100
+                ProviderCache.cached_fetch("GOOGLE", lat, -57.5, lambda la, lo: {"lat": la})
+                assert ProviderCache.cached_fetch("GOOGLE", lat, -57.5, Proveedor()) == {"lat": lat}
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=trabajar, args=(i,)) for i in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert errores == []
+    assert ProviderCache.cache_stats() == {"GOOGLE": 160}
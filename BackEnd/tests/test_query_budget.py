@@ -0,0 +1,102 @@
+# tests/test_query_budget.py
+# ----------------------------------------------------------
+# Presupuesto de consultas de la ponderación: no puede crecer con la
+# cantidad de spots/fechas (sin N+1)
+# ----------------------------------------------------------
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.models import (
+    Deporte,
+    DeporteSpot,
+    DeporteVariable,
+    ProveedorDatos,
+    Spot,
+    TipoVariableMeteorologica,
+    VariableMeteorologica,
+)
+from app.services.SportsWeighting import (
+    cargar_contexto_ponderacion,
+    ponderar_pares,
+    ponderar_todos_los_deportes,
+    sports_weighting,
+)
+
+HOY = date(2026, 10, 18)
+VARIABLES = ["wind_speed", "waveHeight", "maxTemperature"]
+
+
+@contextmanager
+def contar_consultas(engine):
+    sentencias = []
+
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _contar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, "before_cursor_execute", _contar)
+
+
+def _cargar(session, n_spots: int, n_dias: int):
+    session.add(ProveedorDatos(id=1, codigo="GOOGLE", nombre="Google"))
+    for j, nombre in enumerate(VARIABLES, 1):
+        session.add(TipoVariableMeteorologica(id=j, codigo=f"V{j}", nombre=nombre))
+    for i, nombre in enumerate(["Kitesurf", "Surf", "Kayak"], 1):
+        session.add(Deporte(id=i, codigo=f"D{i}", nombre=nombre))
+        for j, variable in enumerate(VARIABLES):
+            session.add(DeporteVariable(
+                id_deporte=i, nombre_variable=variable, umbral_min=j, umbral_max=j + 10, peso=i + j, operador="between",
+            ))
+    for id_spot in range(1, n_spots + 1):
+        session.add(Spot(id=id_spot, codigo=f"S{id_spot}", nombre=f"Spot {id_spot}", lat=-38, lon=-57.5))
+        for d in range(n_dias):
+            for j in range(1, len(VARIABLES) + 1):
+                session.add(VariableMeteorologica(
+                    id_tipo_variable=j, id_proveedor=1, id_spot=id_spot,
+                    fecha=HOY + timedelta(days=d), valor=float(id_spot + d + j),
+                ))
+    session.commit()
+
+
+@pytest.mark.parametrize("n_spots, n_dias", [(2, 3), (12, 7)])
+def test_ponderacion_completa_cuesta_siete_consultas(engine, session, n_spots, n_dias):
+    _cargar(session, n_spots, n_dias)
+
+    with contar_consultas(engine) as sentencias:
+        escritas = ponderar_todos_los_deportes(session)
+
+    assert escritas == n_spots * n_dias * 3
+    # spots + fechas, contexto (deportes, tipos, reglas), valores y un upsert
+    assert len(sentencias) == 7, sentencias
+    assert session.query(DeporteSpot).count() == escritas
+
+
+@pytest.mark.parametrize("n_spots, n_dias", [(2, 3), (12, 7)])
+def test_ponderacion_incremental_no_depende_de_los_pares(engine, session, n_spots, n_dias):
+    _cargar(session, n_spots, n_dias)
+    pares = {(id_spot, HOY + timedelta(days=d)) for id_spot in range(1, n_spots + 1) for d in range(n_dias)}
+
+    with contar_consultas(engine) as sentencias:
+        ponderar_pares(session, pares)
+
+    # contexto (3), valores y un upsert
+    assert len(sentencias) == 5, sentencias
+
+
+def test_sports_weighting_cuesta_dos_consultas_por_spot_y_fecha(engine, session):
+    _cargar(session, n_spots=3, n_dias=2)
+    contexto = cargar_contexto_ponderacion(session)
+
+    with contar_consultas(engine) as sentencias:
+        for id_spot in (1, 2, 3):
+            for d in range(2):
+                sports_weighting(session, id_spot, HOY + timedelta(days=d), contexto)
+
+    # por (spot, fecha): los valores del día y un único upsert
+    assert len(sentencias) == 2 * 3 * 2, sentencias
@@ -0,0 +1,64 @@
+# tests/test_spatial_index.py
+# ----------------------------------------------------------
+# spot_index: atado a la versión global de datos
+# ----------------------------------------------------------
+import asyncio
+
+import pytest
+
+import app.core.versioning as versioning
+import app.services.SpatialIndex as spatial
+from app.models.models import Spot
+
+
+@pytest.fixture(autouse=True)
+def version(monkeypatch):
+    monkeypatch.setattr(versioning, "_data_version", 10)
+    monkeypatch.setattr(versioning, "_poller", object())
+
+
+@pytest.fixture
+def spots(session):
+    session.add(Spot(id=1, codigo="QUEQUEN", nombre="Quequén", lat=-38.57, lon=-58.70, activo=True))
+    session.commit()
+    return session
+
+
+def test_se_reconstruye_cuando_cambia_la_version(spots, monkeypatch):
+    index = spatial.SpotIndex()
+    version = versioning.data_version()
+    assert len(index.get(spots).items()) == 1
+    assert index._current(version) is not None
+
+    # Otro worker agrega un spot: este proceso sólo se entera por la versión
+    spots.add(Spot(id=2, codigo="MIRAMAR", nombre="Miramar", lat=-38.27, lon=-57.84, activo=True))
+    spots.flush()
+    monkeypatch.setattr(versioning, "_data_version", version + 1)
+    assert index._current(version + 1) is None
+    assert len(index.get(spots).items()) == 2
+
+
+def test_no_guarda_un_indice_armado_mientras_cambiaba_la_version(spots, monkeypatch):
+    index = spatial.SpotIndex()
+    version = versioning.data_version()
+    build = spatial.SpotIndex._build
+
+    def build_con_escritura(session):
+        resultado = build(session)
+        monkeypatch.setattr(versioning, "_data_version", version + 1)  # commit en medio de la construcción
+        return resultado
+
+    monkeypatch.setattr(index, "_build", build_con_escritura)
+    index.get(spots)
+    assert index._cached is None
+
+
+def test_nearest_async_construye_desde_el_primario(engine, spots, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+
+    monkeypatch.setattr(spatial, "SessionLocal", sessionmaker(bind=engine))
+    index = spatial.SpotIndex()
+
+    spot = asyncio.run(index.nearest_async(-38.5701, -58.7001))
+    assert spot["id"] == 1
+    assert asyncio.run(index.nearest_async(0.0, 0.0)) is None
@@ -0,0 +1,76 @@
+# tests/test_sports_scoring.py
+# ----------------------------------------------------------
+# El camino vectorizado (SportsScoring) tiene que dar exactamente
+# lo mismo que el de referencia (_ponderar_deporte) después de redondear
+# ----------------------------------------------------------
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.SportsScoring import build_rules_matrix, build_values_tensor, round_scores, score_batch
+from app.services.SportsWeighting import _ponderar_deporte
+
+VARIABLES = ["altura_ola", "periodo_ola", "temperatura", "velocidad_viento", "direccion_viento", "rafagas"]
+OPERADORES = ["min", "max", "between", "otro"]
+
+
+def _reglas_al_azar(rng: random.Random, deporte_ids, pesos_float: bool):
+    reglas = []
+    for id_deporte in deporte_ids:
+        for nombre in rng.sample(VARIABLES, rng.randint(1, len(VARIABLES))):
+            # Umbrales y valores con pocos decimales y en el mismo rango (como en la BD):
+            # los promedios caen seguido justo en la mitad de un centésimo, que es
+            # donde un orden de suma distinto cambia el redondeo
+            a, b = sorted(round(rng.uniform(0, 12), 1) for _ in range(2))
+            peso = rng.choice([None, 0, rng.randint(1, 10)])
+            if pesos_float and peso:
+                peso = round(rng.uniform(0.1, 10), 1)
+            reglas.append(SimpleNamespace(
+                id_deporte=id_deporte,
+                nombre_variable=nombre,
+                umbral_min=rng.choice([None, a]),
+                umbral_max=rng.choice([None, b]),
+                peso=peso,
+                operador=rng.choice(OPERADORES),
+            ))
+    rng.shuffle(reglas)  # el orden de la BD no está garantizado
+    return reglas
+
+
+@pytest.mark.parametrize("pesos_float", [False, True])
+def test_score_batch_coincide_con_referencia(pesos_float):
+    rng = random.Random(20240601 + pesos_float)
+    deporte_ids = [1, 2, 3, 4]
+    spot_ids = list(range(10))
+    fechas = list(range(7))
+
+    for _ in range(200):
+        reglas = _reglas_al_azar(rng, deporte_ids, pesos_float)
+        filas = [
+            (id_spot, fecha, nombre, rng.choice([None, round(rng.uniform(-2, 14), 2)]))
+            for id_spot in spot_ids
+            for fecha in fechas
+            for nombre in VARIABLES
+            if rng.random() < 0.8
+        ]
+
+        var_names = sorted({r.nombre_variable for r in reglas})
+        matriz = build_rules_matrix(reglas, deporte_ids, var_names)
+        valores, mascara = build_values_tensor(filas, spot_ids, fechas, var_names)
+        obtenido = round_scores(score_batch(matriz, valores, mascara))
+
+        por_deporte = {}
+        for regla in reglas:
+            por_deporte.setdefault(regla.id_deporte, []).append(regla)
+        por_dia = {}
+        for id_spot, fecha, nombre, valor in filas:
+            if valor is not None:
+                por_dia.setdefault((id_spot, fecha), {})[nombre] = valor
+
+        for i, id_spot in enumerate(spot_ids):
+            for d, fecha in enumerate(fechas):
+                dia = por_dia.get((id_spot, fecha), {})
+                for k, id_deporte in enumerate(deporte_ids):
+                    esperado = _ponderar_deporte(por_deporte.get(id_deporte, []), dia)
+                    assert obtenido[i][d][k] == esperado, (id_spot, fecha, id_deporte)